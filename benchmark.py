@@ -0,0 +1,386 @@
+import argparse  # Command-line options
+import csv  # CSV result export
+import fnmatch  # --filter patterns like "inventory.*"
+import gc  # Switched off while timing so collections do not land in random samples
+import json  # JSON result export and baselines
+import platform  # To record which Python produced the numbers
+import statistics  # mean / median / stdev of the samples
+import sys  # Exit code for regressions
+import time  # perf_counter_ns: a monotonic, high-resolution clock
+import tracemalloc  # Peak memory allocated by one call
+
+# --- Step 1: Statistics ---
+
+def percentile(sorted_samples, fraction):
+    """
+    Returns the value at 'fraction' (0.0 - 1.0) of an already sorted list,
+    interpolating linearly between the two nearest samples.
+    """
+    if not sorted_samples:
+        raise ValueError("percentile() needs at least one sample.")
+    position = (len(sorted_samples) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    weight = position - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def summarize(samples_ns):
+    """
+    Summarizes a list of timings.
+
+    Args:
+        samples_ns (list): Nanoseconds per operation, one entry per repetition.
+
+    Returns:
+        dict: count, mean, median, p95, p99, min, max and stdev (all in ns).
+    """
+    ordered = sorted(samples_ns)
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def per_item(stats, items):
+    """
+    Divides a summarize() dict by 'items', for cases whose function does
+    'items' operations per call (e.g. 1000 lookups). The count is kept.
+    """
+    return {key: value if key == "count" else value / items for key, value in stats.items()}
+
+
+# --- Step 2: Registering Benchmark Cases ---
+#
+# A case is a function to time plus an optional setup function. setup()
+# runs once, untimed, and its return value is passed to the function on
+# every call, so test data is built outside the measurement:
+#
+#   @benchmark("inventory.search", group="inventory", setup=make_table)
+#   def search(table):
+#       table.search("D101")
+
+class Case:
+    """One registered benchmark: a name, a group, a setup and the function to time."""
+
+    def __init__(self, name, function, setup=None, group="default", params=None):
+        self.name = name
+        self.function = function
+        self.setup = setup
+        self.group = group
+        self.params = params or {}
+
+    def __repr__(self):
+        return f"Case({self.name!r})"
+
+
+REGISTRY = {}  # name -> Case, in registration order
+
+
+def register(name, function, setup=None, group="default", params=None):
+    """Adds a case to REGISTRY (replacing any case with the same name) and returns it."""
+    case = Case(name, function, setup, group, params)
+    REGISTRY[name] = case
+    return case
+
+
+def benchmark(name, setup=None, group="default", params=None):
+    """Decorator form of register(). The decorated function is returned unchanged."""
+    def decorator(function):
+        register(name, function, setup, group, params)
+        return function
+    return decorator
+
+
+def select(pattern=None, registry=None):
+    """Returns the registered cases whose name or group matches a glob pattern (all if None)."""
+    cases = (registry if registry is not None else REGISTRY).values()
+    if pattern is None:
+        return list(cases)
+    return [case for case in cases
+            if fnmatch.fnmatch(case.name, pattern) or fnmatch.fnmatch(case.group, pattern)]
+
+
+# --- Step 3: Measuring ---
+
+def calibrate(call, min_sample_ns=2_000_000, max_number=1_000_000):
+    """
+    Finds how many calls to put in one timed sample so that a sample takes
+    at least 'min_sample_ns' (well above the clock's resolution and the
+    loop's own overhead).
+
+    Returns:
+        tuple: (calls per sample, ns taken by the last trial sample)
+    """
+    clock = time.perf_counter_ns
+    number = 1
+    while True:
+        start = clock()
+        for _ in range(number):
+            call()
+        elapsed = clock() - start
+        if elapsed >= min_sample_ns or number >= max_number:
+            return number, elapsed
+        # Jump close to the target instead of only doubling
+        number = min(max_number, max(number * 2, int(number * min_sample_ns / max(elapsed, 1)) + 1))
+
+
+def measure_memory(call):
+    """Returns the peak bytes allocated by one call, measured with tracemalloc."""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def run_case(case, samples=20, warmup=3, min_sample_ns=2_000_000, max_time_s=2.0,
+             disable_gc=True, track_memory=True):
+    """
+    Times one case.
+
+    Steps: setup (untimed), 'warmup' untimed calls, calibration of the
+    calls per sample, then up to 'samples' timed samples with the garbage
+    collector switched off. Memory is measured separately afterwards,
+    because tracemalloc slows every allocation down.
+
+    Args:
+        case (Case): The case to run.
+        samples (int): Timed samples wanted (fewer if max_time_s runs out; at least 3).
+        warmup (int): Untimed calls first.
+        min_sample_ns (int): Shortest acceptable sample (see calibrate()).
+        max_time_s (float): Rough time budget for the timed samples, or None to
+            always take 'samples' samples however long they run.
+        disable_gc (bool): Switch off the garbage collector while timing.
+        track_memory (bool): Also record the peak memory of one call.
+
+    Returns:
+        dict: name, group, params, number (calls per sample), stats (ns per
+              call, see summarize()) and memory_peak_bytes (or None).
+    """
+    state = case.setup() if case.setup is not None else None
+    function = case.function
+
+    def call():
+        return function(state)
+
+    for _ in range(warmup):
+        call()
+
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    if disable_gc:
+        gc.disable()
+    try:
+        number, trial_ns = calibrate(call, min_sample_ns)
+        if max_time_s is None:
+            sample_count = max(3, samples)
+        else:
+            affordable = int(max_time_s * 1e9 / max(trial_ns, 1))
+            sample_count = max(3, min(samples, affordable))
+        clock = time.perf_counter_ns
+        timings = []
+        for _ in range(sample_count):
+            start = clock()
+            for _ in range(number):
+                call()
+            timings.append((clock() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "name": case.name,
+        "group": case.group,
+        "params": case.params,
+        "number": number,
+        "stats": summarize(timings),
+        "memory_peak_bytes": measure_memory(call) if track_memory else None,
+    }
+
+
+def run_named(name, **options):
+    """
+    Runs one registered case by name (options as for run_case()), loading
+    benchmark_cases first so every module's cases are registered. This is
+    how the demo menus in inventory.py and concurrency_test.py time things.
+    """
+    import benchmark_cases  # noqa: F401  (registers the cases for every module)
+
+    if name not in REGISTRY:
+        raise ValueError(f"No benchmark case named {name!r}.")
+    return run_case(REGISTRY[name], **options)
+
+
+def environment():
+    """Describes the interpreter and machine, stored alongside the results."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def run(cases, verbose=True, **options):
+    """
+    Runs several cases (options as for run_case()).
+
+    Returns:
+        dict: "environment" and "results" (a list of run_case() dicts).
+    """
+    results = []
+    for case in cases:
+        result = run_case(case, **options)
+        results.append(result)
+        if verbose:
+            print(format_result(result))
+    return {"environment": environment(), "results": results}
+
+
+def format_result(result):
+    """One line of text for a run_case() result."""
+    stats = result["stats"]
+    memory = result["memory_peak_bytes"]
+    memory_text = "" if memory is None else f"{memory / 1024:>10.1f} KiB"
+    return (f"{result['name']:<40} {_format_ns(stats['median']):>10} {_format_ns(stats['p95']):>10} "
+            f"{_format_ns(stats['p99']):>10} {stats['count']:>4} x{result['number']:<7}{memory_text}")
+
+
+def _format_ns(ns):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+# --- Step 4: Export and Regression Checks ---
+
+CSV_COLUMNS = ("name", "group", "number", "count", "mean", "median", "p95", "p99",
+               "min", "max", "stdev", "memory_peak_bytes")
+
+
+def write_json(report, path):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def read_json(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def write_csv(report, path):
+    """Writes one row per case: its counters and the summary statistics (ns per call)."""
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_COLUMNS)
+        for result in report["results"]:
+            row = {"name": result["name"], "group": result["group"], "number": result["number"],
+                   "memory_peak_bytes": result["memory_peak_bytes"], **result["stats"]}
+            writer.writerow([row[column] for column in CSV_COLUMNS])
+
+
+def compare(report, baseline, threshold=0.10, statistic="median"):
+    """
+    Compares a report with a saved baseline report, case by case.
+
+    A case has "regressed" if it got slower by more than 'threshold' (a
+    fraction, e.g. 0.10 = 10%), "improved" if it got faster by more than
+    that, and is "same" otherwise. Cases missing from the baseline are "new".
+
+    Returns:
+        list: One dict per case: name, baseline, current, change (fraction), status.
+    """
+    previous = {result["name"]: result["stats"][statistic] for result in baseline["results"]}
+    rows = []
+    for result in report["results"]:
+        current = result["stats"][statistic]
+        before = previous.get(result["name"])
+        if before is None:
+            rows.append({"name": result["name"], "baseline": None, "current": current,
+                         "change": None, "status": "new"})
+            continue
+        change = (current - before) / before if before else 0.0
+        if change > threshold:
+            status = "regressed"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = "same"
+        rows.append({"name": result["name"], "baseline": before, "current": current,
+                     "change": change, "status": status})
+    return rows
+
+
+def print_comparison(rows):
+    print(f"\n{'case':<40} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    for row in rows:
+        baseline = "-" if row["baseline"] is None else _format_ns(row["baseline"])
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        print(f"{row['name']:<40} {baseline:>10} {_format_ns(row['current']):>10} {change:>8}  {row['status']}")
+
+
+def main(argv=None):
+    """
+    Runs the registered cases from the command line. Exits with status 1
+    if --baseline is given and any case regressed.
+    """
+    import benchmark_cases  # noqa: F401  (registers the cases for every module)
+
+    parser = argparse.ArgumentParser(description="Run the registered micro-benchmarks.")
+    parser.add_argument("--filter", metavar="PATTERN", help="Only run cases whose name or group matches, e.g. 'social.*'.")
+    parser.add_argument("--list", action="store_true", help="List the registered cases and exit.")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--max-time", type=float, default=2.0, help="Seconds of timed samples per case.")
+    parser.add_argument("--keep-gc", action="store_true", help="Leave the garbage collector on while timing.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc measurement.")
+    parser.add_argument("--json", metavar="PATH", help="Write the results to this JSON file.")
+    parser.add_argument("--csv", metavar="PATH", help="Write the results to this CSV file.")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare with a JSON file from an earlier run.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown counted as a regression (0.10 = 10%%).")
+    args = parser.parse_args(argv)
+
+    cases = select(args.filter)
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<40} {case.group}")
+        return 0
+
+    print(f"{'case':<40} {'median':>10} {'p95':>10} {'p99':>10} {'n':>4} {'calls':<8} {'peak mem':>10}")
+    report = run(cases, samples=args.samples, warmup=args.warmup, max_time_s=args.max_time,
+                 disable_gc=not args.keep_gc, track_memory=not args.no_memory)
+
+    if args.json:
+        write_json(report, args.json)
+        print(f"\nResults written to {args.json}")
+    if args.csv:
+        write_csv(report, args.csv)
+        print(f"Results written to {args.csv}")
+    if args.baseline:
+        rows = compare(report, read_json(args.baseline), args.threshold)
+        print_comparison(rows)
+        if any(row["status"] == "regressed" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    # benchmark_cases registers into the importable 'benchmark' module, not
+    # into this __main__ copy, so run main() from there
+    from benchmark import main as benchmark_main
+    sys.exit(benchmark_main())
@@ -0,0 +1,175 @@
+import random  # Repeatable test data
+
+from benchmark import register
+
+# --- Step 1: Inventory Cases ---
+#
+# Each case's setup builds its data once; the registered function is what
+# gets timed. Names are "<module>.<structure>.<operation>" so a whole
+# module can be picked with --filter "inventory.*".
+
+CATALOG_SIZE = 10000
+LOOKUPS = 1000
+
+
+def _inventory_data():
+    from inventory_benchmark import make_catalog, make_lookup_keys
+    rng = random.Random(42)
+    catalog = make_catalog(CATALOG_SIZE, rng)
+    return catalog, make_lookup_keys(catalog, LOOKUPS, 0.9, rng)
+
+
+def inventory_catalog():
+    """The products the inventory cases use (inventory.run_performance_test shows their stats)."""
+    return _inventory_data()[0]
+
+
+def _register_inventory_cases():
+    from inventory import BACKENDS, ProductTable, search_array
+
+    for backend_name, table_class in BACKENDS.items():
+        def build_setup(table_class=table_class):
+            catalog, _ = _inventory_data()
+            return table_class, [(product.product_id, product) for product in catalog]
+
+        def build(state):
+            table_class, items = state
+            table = table_class(100, verbose=False)
+            for key, value in items:
+                table.insert(key, value)
+
+        def search_setup(table_class=table_class):
+            catalog, keys = _inventory_data()
+            table = table_class(100, verbose=False)
+            table.insert_many((product.product_id, product) for product in catalog)
+            return table, keys
+
+        def search(state):
+            table, keys = state
+            search_one = table.search
+            for key in keys:
+                search_one(key)
+
+        # "operations" is how many inserts / lookups one call does, for per_item()
+        register(f"inventory.{backend_name}.build", build, build_setup, "inventory",
+                 {"catalog_size": CATALOG_SIZE, "operations": CATALOG_SIZE})
+        register(f"inventory.{backend_name}.search_x{LOOKUPS}", search, search_setup, "inventory",
+                 {"catalog_size": CATALOG_SIZE, "operations": LOOKUPS})
+
+    def array_setup():
+        catalog, keys = _inventory_data()
+        return catalog, keys[:10]
+
+    def array_search(state):
+        catalog, keys = state
+        for key in keys:
+            search_array(catalog, key)
+
+    def product_table_setup():
+        catalog, _ = _inventory_data()
+        table = ProductTable()
+        for product in catalog:
+            table.add_product(product)
+        return table
+
+    register("inventory.array.search_x10", array_search, array_setup, "inventory",
+             {"catalog_size": CATALOG_SIZE, "operations": 10})
+    register("inventory.product_table.total_stock_value", lambda table: table.total_stock_value(),
+             product_table_setup, "inventory", {"catalog_size": CATALOG_SIZE})
+
+
+# --- Step 2: Social Graph Cases ---
+
+USERS = 20000
+FOLLOWS_PER_USER = 10
+
+
+def _social_graph():
+    from social_media import Graph, Person
+    rng = random.Random(7)
+    people = [Person(f"user{i}", "", "", "private" if rng.random() < 0.2 else "public")
+              for i in range(USERS)]
+    graph = Graph()
+    graph.add_vertices(people)
+    # A few accounts are much more popular than the rest
+    graph.add_edges((person, people[int(USERS * rng.random() ** 3)])
+                    for person in people for _ in range(FOLLOWS_PER_USER))
+    return graph, people, rng
+
+
+def _register_social_cases():
+    import graph_queries
+    import graph_traversal
+
+    params = {"users": USERS, "follows_per_user": FOLLOWS_PER_USER}
+
+    def edges_setup():
+        graph, people, rng = _social_graph()
+        return people, [(edge_from, people[int(USERS * rng.random() ** 3)])
+                        for edge_from in people for _ in range(FOLLOWS_PER_USER)]
+
+    def build_graph(state):
+        from social_media import Graph
+        people, edges = state
+        graph = Graph()
+        graph.add_vertices(people)
+        graph.add_edges(edges)
+
+    def traversal_setup():
+        graph, people, rng = _social_graph()
+        return graph, [(rng.choice(people), rng.choice(people)) for _ in range(20)]
+
+    def shortest_paths(state):
+        graph, pairs = state
+        for source, target in pairs:
+            graph_traversal.shortest_path(graph, source, target)
+
+    def suggestions(state):
+        graph, pairs = state
+        for user, _ in pairs:
+            graph_traversal.suggest_follows(graph, user, k=10)
+
+    def followers_page(state):
+        graph, people = state
+        # people[0] is the most followed account
+        graph_queries.followers(graph, people[0], viewer=people[1], page_size=50)
+
+    def followers_setup():
+        graph, people, _ = _social_graph()
+        people[0].privacy = "public"
+        return graph, people
+
+    register("social.graph.build", build_graph, edges_setup, "social", params)
+    register("social.graph.freeze", lambda state: state[0].freeze(), traversal_setup, "social", params)
+    register("social.traversal.shortest_path_x20", shortest_paths, traversal_setup, "social", params)
+    register("social.traversal.suggest_follows_x20", suggestions, traversal_setup, "social", params)
+    register("social.queries.followers_page", followers_page, followers_setup, "social", params)
+
+
+# --- Step 3: Concurrency / Factorial Cases ---
+
+def _register_concurrency_cases():
+    from concurrency_test import (Q3_NUMBERS, calculate_factorial, factorials_in_sequence,
+                                  factorials_in_threads)
+    from factorial_engine import binary_split_factorial, prime_swing_factorial
+
+    # One call = one round of the Q3 comparison: 50!, 100! and 200!
+    params = {"numbers": Q3_NUMBERS}
+    register("concurrency.q3.multithreaded", lambda _: factorials_in_threads(Q3_NUMBERS),
+             group="concurrency", params=params)
+    register("concurrency.q3.sequential", lambda _: factorials_in_sequence(Q3_NUMBERS),
+             group="concurrency", params=params)
+
+    for n in (200, 5000, 20000):
+        params = {"n": n}
+        register(f"concurrency.factorial.iterative_{n}", lambda _, n=n: calculate_factorial(n),
+                 group="concurrency", params=params)
+        register(f"concurrency.factorial.binary_split_{n}", lambda _, n=n: binary_split_factorial(n),
+                 group="concurrency", params=params)
+        register(f"concurrency.factorial.prime_swing_{n}", lambda _, n=n: prime_swing_factorial(n),
+                 group="concurrency", params=params)
+
+
+_register_inventory_cases()
+_register_social_cases()
+_register_concurrency_cases()
@@ -1,6 +1,7 @@
 import time     # We'll need this for all our timing tests
 import threading # We'll need this for the multithreading part
 import math     # Using math.factorial to check our work (optional)
+import sys      # To make threads switch often in the stress test
 
 # --- Step 1: Factorial Function (Q3.2) ---
 
@@ -18,81 +19,290 @@ def calculate_factorial(n):
 
 
 # --- Step 2: Multithreaded Program (Q3.3) ---
+#
+# Both tests are timed by benchmark.py (cases "concurrency.q3.*" in
+# benchmark_cases.py), so they get a warmup, enough calls per sample to be
+# well above the clock's resolution, and the same statistics as every
+# other benchmark in the project.
 
-def run_multithreaded_test():
+Q3_NUMBERS = [50, 100, 200]
+
+
+def factorials_in_threads(numbers):
+    """Calculates each factorial in its own thread and waits for all of them."""
+    threads = []
+    for num in numbers:
+        # We must pass 'num' as an argument in a tuple
+        thread = threading.Thread(target=calculate_factorial, args=(num,))
+        threads.append(thread)
+        thread.start()  # Start the thread
+
+    # Wait for all threads to complete their execution
+    for thread in threads:
+        thread.join()
+
+
+def _print_q3_result(label, result):
+    stats = result["stats"]
+    print(f"{stats['count']} samples of {result['number']} rounds each")
+    print(f"Median: {stats['median']:.0f} ns   p95: {stats['p95']:.0f} ns   "
+          f"p99: {stats['p99']:.0f} ns   stdev: {stats['stdev']:.0f} ns")
+    print(f"\n{label} Average Time: {stats['mean']:.0f} ns")
+    return stats["mean"]
+
+
+def run_multithreaded_test(samples=10):
+    """
+    Runs the factorial calculations (50, 100, 200) using 3 separate threads
+    per round, timed by the shared benchmark runner.
+
+    Returns:
+        float: The mean time of one round in ns.
+    """
+    from benchmark import run_named
+
+    print(f"--- Starting Multithreaded Test ({samples} samples) ---")
+    result = run_named("concurrency.q3.multithreaded", samples=samples, track_memory=False)
+    return _print_q3_result("Multithreaded", result)
+
+
+# --- Step 3: Sequential Program (Q3.4) ---
+
+def factorials_in_sequence(numbers):
+    """Calculates the factorials one after another in the calling thread."""
+    for num in numbers:
+        calculate_factorial(num)
+
+
+def run_sequential_test(samples=10):
+    """
+    Runs the factorial calculations (50, 100, 200) sequentially, timed by
+    the shared benchmark runner.
+
+    Returns:
+        float: The mean time of one round in ns.
     """
-    Runs the factorial calculations (50, 100, 200) using 3 separate threads.
-    Repeats this 10 times and calculates the average time.
+    from benchmark import run_named
+
+    print(f"\n--- Starting Sequential Test ({samples} samples) ---")
+    result = run_named("concurrency.q3.sequential", samples=samples, track_memory=False)
+    return _print_q3_result("Sequential", result)
+
+
+# --- Step 3b: Concurrent Inventory Stress Test ---
+
+def run_inventory_stress_test(thread_counts=(1, 2, 4, 8), ops_per_thread=20000, num_products=1000):
     """
-    print("--- Starting Multithreaded Test (10 rounds) ---")
-    numbers_to_test = [50, 100, 200]
-    total_times = []
+    Hammers a ConcurrentHashTable from several threads at once.
 
-    for i in range(10):  # Perform testing in 10 rounds
-        threads = []
+    Each thread randomly restocks products (update_quantity) or sells them
+    (decrement_if_available) and keeps its own tally of what it changed.
+    At the end the total stock must equal the starting stock plus all
+    restocks minus all successful sales; any difference is a lost update.
 
-        # Get the start time of the *first* thread to be created
-        start_time = time.time_ns()
+    Then the same number of threads insert new products into a small table,
+    so it has to resize several times while they run, and a reader thread
+    keeps searching (without locks) for products that were already
+    inserted. No search may miss, and at the end every product must be in
+    the table exactly once.
 
-        # Create 3 separate threads, one for each number
-        for num in numbers_to_test:
-            # We must pass 'num' as an argument in a tuple
-            thread = threading.Thread(target=calculate_factorial, args=(num,))
-            threads.append(thread)
-            thread.start()  # Start the thread
+    Args:
+        thread_counts (tuple): The thread counts to try.
+        ops_per_thread (int): Operations performed by each thread.
+        num_products (int): Number of products in the table.
 
-        # Wait for all 3 threads to complete their execution
+    Returns:
+        dict: thread count -> operations per second.
+    """
+    # Imported here so the factorial tests do not depend on the inventory module
+    import random
+    from inventory import ConcurrentHashTable, Product
+
+    print("\n--- Starting Concurrent Inventory Stress Test ---")
+    product_ids = [f"SKU-{i}" for i in range(num_products)]
+    results = {}
+
+    for num_threads in thread_counts:
+        table = ConcurrentHashTable(size=num_products)
+        for product_id in product_ids:
+            table.insert(product_id, Product(product_id, "Stress Product", 1.0, 50))
+        start_stock = 50 * num_products
+        tallies = [0] * num_threads  # Net stock change made by each thread
+
+        def worker(thread_index):
+            rng = random.Random(thread_index)
+            net_change = 0
+            for _ in range(ops_per_thread):
+                product_id = rng.choice(product_ids)
+                if rng.random() < 0.5:
+                    table.update_quantity(product_id, 1)
+                    net_change += 1
+                elif table.decrement_if_available(product_id):
+                    net_change -= 1
+            tallies[thread_index] = net_change
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+        start_time = time.perf_counter_ns()
+        for thread in threads:
+            thread.start()
         for thread in threads:
             thread.join()
+        elapsed_ns = time.perf_counter_ns() - start_time
 
-        # Get the end time *after* the *last* thread has finished
-        end_time = time.time_ns()
+        # Check that no update was lost and no stock went negative
+        final_stock = sum(product.quantity for _, product in table.items())
+        expected_stock = start_stock + sum(tallies)
+        if final_stock != expected_stock:
+            raise AssertionError(f"Lost updates with {num_threads} threads: "
+                                 f"stock is {final_stock}, expected {expected_stock}")
+        if any(product.quantity < 0 for _, product in table.items()):
+            raise AssertionError(f"Stock went negative with {num_threads} threads")
 
-        # Calculate the total time elapsed for this round
-        time_elapsed = end_time - start_time
-        total_times.append(time_elapsed)
+        total_ops = num_threads * ops_per_thread
+        ops_per_second = total_ops / (elapsed_ns / 1e9)
+        results[num_threads] = ops_per_second
+        print(f"{num_threads} thread(s): {total_ops} ops in {elapsed_ns / 1e6:.1f} ms "
+              f"-> {ops_per_second:,.0f} ops/s (no lost updates)")
 
-        print(f"Round {i + 1}: {time_elapsed} ns")
+        _stress_inserts_during_resize(num_threads, num_products)
 
-    # Calculate and print the average time
-    average_time = sum(total_times) / len(total_times)
-    print(f"\nMultithreaded Average Time: {average_time:.0f} ns")
-    return average_time
+    return results
 
 
-# --- Step 3: Sequential Program (Q3.4) ---
+def _stress_inserts_during_resize(num_threads, keys_per_thread):
+    """
+    Inserts from several threads into a table that starts small, while one
+    reader searches for keys that are already in. Raises AssertionError if
+    a search misses or a key is lost.
+    """
+    import random
+    from inventory import ConcurrentHashTable, Product
+
+    table = ConcurrentHashTable(size=16, num_stripes=4)
+    # published[i] lists the keys thread i has finished inserting, in order
+    published = [[] for _ in range(num_threads)]
+    writers_done = threading.Event()
+    missed = []
+    searches = [0]
 
-def run_sequential_test():
+    def writer(thread_index):
+        keys = published[thread_index]
+        for i in range(keys_per_thread):
+            key = f"NEW-{thread_index}-{i}"
+            table.insert(key, Product(key, "Stress Product", 1.0, 1))
+            keys.append(key)  # Only after insert() has returned
+            if i % 64 == 0:
+                time.sleep(0)  # Let the reader in
+
+    def reader():
+        rng = random.Random(0)
+        while not writers_done.is_set():
+            for keys in published:
+                count = len(keys)
+                if count == 0:
+                    continue
+                # The newest key and a random older one
+                for key in (keys[count - 1], keys[rng.randrange(count)]):
+                    searches[0] += 1
+                    if table.search(key) is None:
+                        missed.append(key)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(num_threads)]
+    reader_thread = threading.Thread(target=reader)
+    # Switch threads far more often than usual so the reader really does run
+    # in the middle of inserts and resizes
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        reader_thread.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        writers_done.set()
+        reader_thread.join()
+        sys.setswitchinterval(switch_interval)
+
+    if missed:
+        raise AssertionError(f"Lock-free search missed {len(missed)} inserted key(s) "
+                             f"with {num_threads} threads, e.g. {missed[0]!r}")
+    expected = {key for keys in published for key in keys}
+    found = [key for key, _ in table.items()]
+    if len(table) != len(expected) or len(found) != len(expected) or set(found) != expected:
+        raise AssertionError(f"Lost inserts with {num_threads} threads: table holds "
+                             f"{len(table)} entries ({len(found)} reachable), expected {len(expected)}")
+    if table.resize_count == 0:
+        raise AssertionError("The table never resized; the test did not exercise resizing")
+    print(f"{num_threads} thread(s): {len(expected)} inserts across {table.resize_count} resizes, "
+          f"{searches[0]} lock-free searches, nothing missed")
+
+
+# --- Step 3c: Comparing Execution Backends ---
+
+def factorial_bit_length(n):
     """
-    Runs the factorial calculations (50, 100, 200) sequentially.
-    Repeats this 10 times and calculates the average time.
+    Worker task for the backend comparison: computes n! and returns only its
+    bit length, so sending the answer back from a process stays cheap.
     """
-    print("\n--- Starting Sequential Test (10 rounds) ---")
-    numbers_to_test = [50, 100, 200]
-    total_times = []
+    return calculate_factorial(n).bit_length()
 
-    for i in range(10):  # Perform testing in 10 rounds
 
-        # Get the start time
-        start_time = time.time_ns()
+def run_backend_comparison(numbers=None, backend_names=None, worker_counts=None, rounds=3):
+    """
+    Runs the same batch of factorials on each execution backend (see
+    executors.py) and worker count, and reports the speedup over the
+    sequential loop.
+
+    Every pool is started and warmed up once before timing, so the
+    numbers measure the calculations rather than starting threads or
+    processes. Each backend's answers are checked against the sequential ones.
 
-        # Run the calculations one after another in the main thread
-        for num in numbers_to_test:
-            calculate_factorial(num)
+    Args:
+        numbers (list): The factorials to compute in each round. Defaults
+                        to 16 tasks from 2,000! to 20,000!.
+        backend_names (list): Backends to compare. Defaults to all that this Python supports.
+        worker_counts (list): Pool sizes to try. Defaults to 1, 2, 4 and the CPU count.
+        rounds (int): Timed rounds per backend / worker count.
 
-        # Get the end time
-        end_time = time.time_ns()
+    Returns:
+        dict: (backend name, workers) -> average ns per round.
+    """
+    # Imported here so the Q3 tests above only need the standard library basics
+    from executors import available_backends, default_workers, make_backend
 
-        # Calculate the total time elapsed for this round
-        time_elapsed = end_time - start_time
-        total_times.append(time_elapsed)
+    if numbers is None:
+        numbers = [2000, 5000, 10000, 20000] * 4
+    if backend_names is None:
+        backend_names = available_backends()
+    if worker_counts is None:
+        worker_counts = sorted({1, 2, 4, default_workers()})
 
-        print(f"Round {i + 1}: {time_elapsed} ns")
+    print(f"\n--- Comparing Execution Backends ({len(numbers)} factorials up to "
+          f"{max(numbers)}!, {default_workers()} CPU(s)) ---")
+    expected = [factorial_bit_length(n) for n in numbers]
+    results = {}
+    sequential_ns = None
 
-    # Calculate and print the average time
-    average_time = sum(total_times) / len(total_times)
-    print(f"\nSequential Average Time: {average_time:.0f} ns")
-    return average_time
+    for name in ["sequential"] + [name for name in backend_names if name != "sequential"]:
+        for workers in ([1] if name == "sequential" else worker_counts):
+            with make_backend(name, workers) as backend:
+                backend.map(factorial_bit_length, numbers[:workers])  # Start the workers
+                total_ns = 0
+                for _ in range(rounds):
+                    start_time = time.perf_counter_ns()
+                    answers = backend.map(factorial_bit_length, numbers)
+                    total_ns += time.perf_counter_ns() - start_time
+                    if answers != expected:
+                        raise AssertionError(f"{backend!r} returned wrong answers")
+            average_ns = total_ns / rounds
+            results[(backend.name, workers)] = average_ns
+            if sequential_ns is None:
+                sequential_ns = average_ns
+            print(f"{backend.name:<14} {workers:>3} worker(s): {average_ns / 1e6:9.1f} ms per round "
+                  f"-> {sequential_ns / average_ns:4.2f}x sequential")
+
+    return results
 
 
 # --- Step 4: Run Both Tests and Analyze ---
@@ -111,3 +321,6 @@ if __name__ == "__main__":
     else:
         print("\nConclusion: Sequential was FASTER.")
         print(f"It was {mt_avg / seq_avg:.2f} times faster.")
+
+    run_inventory_stress_test()
+    run_backend_comparison()
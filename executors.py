@@ -0,0 +1,175 @@
+import math  # ceil() for chunk sizes
+import os  # cpu_count() for the default number of workers
+import sys  # To find out whether this Python runs without the GIL
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor  # Python 3.14+
+except ImportError:
+    InterpreterPoolExecutor = None
+
+# --- Step 1: One Interface for Every Backend ---
+#
+# Every backend has the same small interface:
+#
+#   backend.map(function, items)   -> list of function(item), in input order
+#   backend.close()                   (or use the backend in a 'with' block)
+#
+# The pool behind a backend is created once and reused for every map()
+# call, so timing a backend measures the work, not starting threads or
+# processes. For process and interpreter pools 'function' must be a
+# module-level function, because it is sent to the workers by name.
+
+
+def gil_enabled():
+    """Returns False on a free-threaded Python build running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def default_workers():
+    """The number of CPUs this process may use."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class Backend:
+    """Base class: runs map() in the calling thread, one item after another."""
+
+    name = "sequential"
+
+    def __init__(self, workers=1):
+        self.workers = workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"{self.name} x{self.workers}"
+
+    def map(self, function, items):
+        """Returns [function(item) for item in items]."""
+        return [function(item) for item in items]
+
+    def close(self):
+        """Shuts down the backend's pool (nothing to do for the sequential backend)."""
+
+
+class SequentialBackend(Backend):
+    """A plain loop in the calling thread; the baseline the others are compared with."""
+
+
+class _PoolBackend(Backend):
+    """Shared code for backends built on a concurrent.futures executor."""
+
+    def __init__(self, workers=None, chunks_per_worker=4):
+        super().__init__(workers or default_workers())
+        self.chunks_per_worker = chunks_per_worker
+        self._executor = self._make_executor()
+
+    def _make_executor(self):
+        raise NotImplementedError
+
+    def chunk_size(self, item_count):
+        """
+        How many items to send to a worker at a time: about
+        'chunks_per_worker' chunks per worker, so the per-task overhead is
+        paid a few times per worker rather than once per item, while
+        uneven items can still be balanced between workers.
+        """
+        return max(1, math.ceil(item_count / (self.workers * self.chunks_per_worker)))
+
+    def map(self, function, items):
+        items = list(items)
+        return list(self._executor.map(function, items, chunksize=self.chunk_size(len(items))))
+
+    def close(self):
+        self._executor.shutdown()
+
+
+class ThreadPoolBackend(_PoolBackend):
+    """
+    A reused ThreadPoolExecutor. Under the GIL only one thread runs Python
+    code at a time, so CPU-bound work gets no faster; on a free-threaded
+    build the threads really run in parallel.
+    """
+
+    name = "threads"
+
+    def __init__(self, workers=None, chunks_per_worker=4):
+        super().__init__(workers, chunks_per_worker)
+        if not gil_enabled():
+            self.name = "free-threaded"
+
+    def _make_executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def chunk_size(self, item_count):
+        # Threads share memory, so chunking saves nothing; ThreadPoolExecutor ignores it anyway
+        return 1
+
+
+class ProcessPoolBackend(_PoolBackend):
+    """
+    A reused ProcessPoolExecutor. Each worker is a separate Python process
+    with its own GIL, so CPU-bound work runs in parallel. Items are sent in
+    chunks (see chunk_size()) to cut the cost of pickling each task.
+    """
+
+    name = "processes"
+
+    def _make_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+
+class InterpreterPoolBackend(_PoolBackend):
+    """
+    A reused InterpreterPoolExecutor (Python 3.14+): subinterpreters in one
+    process, each with its own GIL.
+    """
+
+    name = "interpreters"
+
+    def _make_executor(self):
+        if InterpreterPoolExecutor is None:
+            raise RuntimeError("Subinterpreter pools need Python 3.14 or newer.")
+        return InterpreterPoolExecutor(max_workers=self.workers)
+
+
+# --- Step 2: Choosing Backends ---
+
+BACKENDS = {
+    "sequential": SequentialBackend,
+    "threads": ThreadPoolBackend,
+    "processes": ProcessPoolBackend,
+    "interpreters": InterpreterPoolBackend,
+}
+
+
+def available_backends():
+    """
+    Returns the names of the backends this Python can run. "interpreters"
+    is left out before Python 3.14. (On a free-threaded build the
+    "threads" backend reports itself as "free-threaded".)
+    """
+    return [name for name in BACKENDS
+            if name != "interpreters" or InterpreterPoolExecutor is not None]
+
+
+def make_backend(name, workers=None):
+    """
+    Creates a backend by name.
+
+    Args:
+        name (str): A key of BACKENDS.
+        workers (int): Pool size (ignored by "sequential"). Defaults to the CPU count.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    if name == "sequential":
+        return SequentialBackend()
+    return BACKENDS[name](workers)
@@ -0,0 +1,302 @@
+import math  # math.factorial to check our answers, isqrt for the prime sieve
+import time  # perf_counter_ns for the benchmark
+from bisect import bisect_right, insort  # Find the nearest cached checkpoint
+from collections import OrderedDict  # Least-recently-used order for the checkpoint cache
+
+# --- Step 1: Binary Splitting (Product Tree) ---
+#
+# Multiplying 1 * 2 * 3 * ... * n one step at a time always multiplies a
+# huge number by a small one, so the running product is rewritten n times.
+# Splitting the range in half, multiplying each half and then multiplying
+# the two results keeps both sides of every multiplication about the same
+# size. Python's big-int multiplication (Karatsuba) is much faster on
+# balanced operands, which is where the speedup comes from.
+
+SMALL_RANGE = 32  # Below this many numbers a plain loop is faster than splitting
+
+
+def _check_n(n):
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+
+
+def product_range(low, high):
+    """
+    Returns low * (low + 1) * ... * (high - 1) by binary splitting
+    (1 for an empty range).
+    """
+    if high - low <= SMALL_RANGE:
+        result = 1
+        for i in range(low, high):
+            result *= i
+        return result
+    middle = (low + high) // 2
+    return product_range(low, middle) * product_range(middle, high)
+
+
+def product_of(numbers):
+    """Multiplies a list of integers as a balanced product tree."""
+    if not numbers:
+        return 1
+    while len(numbers) > 1:
+        paired = [numbers[i] * numbers[i + 1] for i in range(0, len(numbers) - 1, 2)]
+        if len(numbers) % 2:
+            paired.append(numbers[-1])
+        numbers = paired
+    return numbers[0]
+
+
+def binary_split_factorial(n):
+    """Returns n! using binary splitting."""
+    _check_n(n)
+    return product_range(2, n + 1)
+
+
+# --- Step 2: Prime Swing ---
+#
+# The "swing" of n is n! / ((n // 2)!)^2. Its prime factorization can be
+# written down directly: the exponent of each prime p is the number of odd
+# values among n // p, n // p^2, n // p^3, ... So
+#
+#   n! = ((n // 2)!)^2 * swing(n)
+#
+# and each swing is a product of prime powers, multiplied as a product
+# tree. Squaring is cheaper than a general multiplication, so this needs
+# less work than multiplying all n numbers.
+
+def primes_up_to(n):
+    """Returns every prime <= n (sieve of Eratosthenes)."""
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, math.isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [p for p in range(2, n + 1) if sieve[p]]
+
+
+def _swing(n, primes):
+    """Returns n! / ((n // 2)!)^2 from the primes <= n."""
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        exponent = 0
+        q = n
+        while q >= p:
+            q //= p
+            exponent += q & 1
+        if exponent:
+            factors.append(p ** exponent if exponent > 1 else p)
+    return product_of(factors)
+
+
+def prime_swing_factorial(n):
+    """Returns n! using the prime swing algorithm."""
+    _check_n(n)
+    primes = primes_up_to(n)
+
+    def factorial_of(m):
+        if m < 2:
+            return 1
+        return factorial_of(m // 2) ** 2 * _swing(m, primes)
+
+    return factorial_of(n)
+
+
+ALGORITHMS = {
+    "binary_split": binary_split_factorial,
+    "prime_swing": prime_swing_factorial,
+}
+
+
+# --- Step 3: The Engine: Checkpoint Cache and Batches ---
+
+class FactorialEngine:
+    """
+    Computes factorials and remembers some of them as checkpoints.
+
+    A request for n! starts from the largest cached k! with k <= n and only
+    multiplies in (k + 1) * ... * n, so asking for nearby values, or for
+    growing values, reuses earlier work. The cache holds at most
+    'max_checkpoints' values and drops the least recently used one when full.
+
+    Attributes:
+        hits (int): Requests answered straight from the cache.
+        extensions (int): Requests that extended a smaller cached checkpoint.
+        misses (int): Requests computed from scratch.
+    """
+
+    def __init__(self, algorithm="binary_split", max_checkpoints=64):
+        """
+        Args:
+            algorithm (str): "binary_split" or "prime_swing", used when no
+                             checkpoint below n is cached.
+            max_checkpoints (int): The most factorials kept in the cache (0 = no cache).
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}'. Choose from: {', '.join(ALGORITHMS)}")
+        self.algorithm = algorithm
+        self._compute = ALGORITHMS[algorithm]
+        self.max_checkpoints = max_checkpoints
+        self._checkpoints = OrderedDict()  # k -> k!, least recently used first
+        self._sorted_keys = []  # the same k values, sorted, for bisect
+        self.hits = 0
+        self.extensions = 0
+        self.misses = 0
+
+    def _nearest_checkpoint(self, n):
+        """Returns (k, k!) for the largest cached k <= n, or (None, None)."""
+        position = bisect_right(self._sorted_keys, n)
+        if position == 0:
+            return None, None
+        k = self._sorted_keys[position - 1]
+        self._checkpoints.move_to_end(k)
+        return k, self._checkpoints[k]
+
+    def _remember(self, n, value):
+        if self.max_checkpoints <= 0 or n in self._checkpoints:
+            return
+        if len(self._checkpoints) >= self.max_checkpoints:
+            oldest, _ = self._checkpoints.popitem(last=False)
+            del self._sorted_keys[bisect_right(self._sorted_keys, oldest) - 1]
+        self._checkpoints[n] = value
+        insort(self._sorted_keys, n)
+
+    def factorial(self, n):
+        """Returns n!, using and updating the checkpoint cache."""
+        _check_n(n)
+        k, k_factorial = self._nearest_checkpoint(n)
+        if k == n:
+            self.hits += 1
+            return k_factorial
+        if k is None:
+            self.misses += 1
+            result = self._compute(n)
+        else:
+            self.extensions += 1
+            result = k_factorial * product_range(k + 1, n + 1)
+        self._remember(n, result)
+        return result
+
+    def factorials(self, values):
+        """
+        Computes the factorial of every number in 'values' in one pass.
+
+        The numbers are sorted, and each factorial is the previous one times
+        the product (by binary splitting) of the numbers in between, so the
+        shared prefix 1 * 2 * ... is only multiplied once.
+
+        Returns:
+            dict: n -> n! for each distinct n.
+        """
+        ordered = sorted(set(values))
+        if ordered and ordered[0] < 0:
+            _check_n(ordered[0])
+        results = {}
+        previous_n, previous = None, None
+        for n in ordered:
+            if previous is None:
+                previous = self.factorial(n)
+            else:
+                previous = previous * product_range(previous_n + 1, n + 1)
+                self._remember(n, previous)
+            previous_n = n
+            results[n] = previous
+        return results
+
+    def clear(self):
+        """Empties the checkpoint cache."""
+        self._checkpoints.clear()
+        self._sorted_keys.clear()
+
+    def stats(self):
+        """Returns the cache counters and size as a dict."""
+        return {"checkpoints": len(self._checkpoints), "max_checkpoints": self.max_checkpoints,
+                "hits": self.hits, "extensions": self.extensions, "misses": self.misses}
+
+
+# --- Step 4: Checking and Benchmarking ---
+
+def verify(values=None):
+    """
+    Checks every algorithm, a cached engine and the batch API against
+    math.factorial. Raises AssertionError on the first wrong answer.
+
+    Returns:
+        int: The number of values checked.
+    """
+    if values is None:
+        values = list(range(0, 300)) + [997, 1000, 1024, 4095, 10000, 25000]
+    for name, algorithm in ALGORITHMS.items():
+        for n in values:
+            if algorithm(n) != math.factorial(n):
+                raise AssertionError(f"{name} gave the wrong answer for {n}!")
+    engine = FactorialEngine(max_checkpoints=8)
+    for n in values:
+        if engine.factorial(n) != math.factorial(n):
+            raise AssertionError(f"The cached engine gave the wrong answer for {n}!")
+    for n, value in FactorialEngine().factorials(values).items():
+        if value != math.factorial(n):
+            raise AssertionError(f"factorials() gave the wrong answer for {n}!")
+    return len(values)
+
+
+def _time_ns(function, n, repetitions):
+    """Returns the fastest of 'repetitions' timings of function(n), in ns."""
+    best = None
+    for _ in range(repetitions):
+        start = time.perf_counter_ns()
+        function(n)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(values=(1000, 10000, 30000, 100000), repetitions=3, iterative_limit=100000):
+    """
+    Times each algorithm against the iterative loop from concurrency_test and
+    against math.factorial, then times a batch request.
+
+    Args:
+        values (tuple): The n values to time.
+        repetitions (int): Timings per value; the fastest is reported.
+        iterative_limit (int): Skip the slow iterative loop above this n.
+
+    Returns:
+        dict: algorithm name -> {n: ns}.
+    """
+    from concurrency_test import calculate_factorial
+
+    contenders = {"iterative": calculate_factorial, **ALGORITHMS, "math.factorial": math.factorial}
+    results = {name: {} for name in contenders}
+
+    print(f"\n{'n':>8} " + " ".join(f"{name:>15}" for name in contenders) + "   (ms)")
+    for n in values:
+        row = []
+        for name, function in contenders.items():
+            if name == "iterative" and n > iterative_limit:
+                row.append(f"{'-':>15}")
+                continue
+            elapsed = _time_ns(function, n, 1 if name == "iterative" else repetitions)
+            results[name][n] = elapsed
+            row.append(f"{elapsed / 1e6:>15.2f}")
+        print(f"{n:>8} " + " ".join(row))
+
+    batch = list(range(max(values) // 10, max(values) + 1, max(values) // 10))
+    start = time.perf_counter_ns()
+    FactorialEngine(max_checkpoints=0).factorials(batch)
+    batch_ns = time.perf_counter_ns() - start
+    start = time.perf_counter_ns()
+    for n in batch:
+        binary_split_factorial(n)
+    separate_ns = time.perf_counter_ns() - start
+    print(f"\nBatch of {len(batch)} factorials up to {max(batch)}!: {batch_ns / 1e6:.1f} ms with "
+          f"factorials(), {separate_ns / 1e6:.1f} ms computed one by one")
+    return results
+
+
+if __name__ == "__main__":
+    print(f"Checked {verify()} values against math.factorial.")
+    run_benchmark()
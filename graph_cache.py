@@ -0,0 +1,226 @@
+import time  # monotonic() clock for entry expiry
+from collections import OrderedDict  # Keeps entries in least-recently-used order
+
+import graph_traversal  # mutual_follows / suggest_follows are what we cache
+
+# --- Step 1: A Bounded LRU Cache with TTL ---
+
+class LRUCache:
+    """
+    A bounded least-recently-used cache whose entries also expire after a
+    time-to-live.
+
+    Every entry can be tagged with the things it was computed from
+    (here: vertex ids). invalidate_tag() then drops exactly the entries
+    built from that thing, and nothing else.
+
+    Attributes:
+        hits, misses (int): Lookups that did / did not find a live entry.
+        evictions (int): Entries dropped because the cache was full.
+        expirations (int): Entries dropped because they were too old.
+        invalidations (int): Entries dropped by invalidate() / invalidate_tag().
+    """
+
+    def __init__(self, max_entries=10000, ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            max_entries (int): The most entries kept at once.
+            ttl (float): Seconds an entry stays valid (None = no expiry).
+            clock: A function returning the current time in seconds.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, expiry time, tags)
+        self._tagged = {}  # tag -> set of keys tagged with it
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or 'default' if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry[1] is not None and entry[1] <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, tags=()):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            tags: What the value was computed from (see invalidate_tag()).
+        """
+        if key in self._entries:
+            self._remove(key)
+        elif len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        tags = frozenset(tags)
+        self._entries[key] = (value, expires, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+
+    def invalidate(self, key):
+        """Drops one entry. Returns True if it was cached."""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        self.invalidations += 1
+        return True
+
+    def invalidate_tag(self, tag):
+        """Drops every entry tagged with 'tag'. Returns how many were dropped."""
+        keys = self._tagged.get(tag)
+        if not keys:
+            return 0
+        count = 0
+        for key in list(keys):
+            self._remove(key)
+            count += 1
+        self.invalidations += count
+        return count
+
+    def clear(self):
+        """Drops every entry (the counters are kept)."""
+        self._entries.clear()
+        self._tagged.clear()
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+
+    def stats(self):
+        """Returns the counters, the current size and the hit ratio as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# --- Step 2: Cached Graph Queries ---
+#
+# Each cached result is tagged with the ids of the vertices whose edges it
+# was computed from:
+#
+#   followers(v), following(v), mutuals(v)   ->  v
+#   suggestions(v)                           ->  v and everyone v follows
+#
+# An edge a -> b only changes the neighbour sets of a and b, so the graph's
+# edge listener invalidates the tags a and b. That drops exactly the results
+# that could have changed (e.g. the suggestions of everyone who follows a)
+# and leaves every other account's results cached.
+
+class CachedGraphQueries:
+    """
+    Serves derived queries on a Graph from an LRUCache, invalidating
+    results as soon as an edge they depend on is added or removed.
+
+    Results are returned as tuples so callers cannot change the cached copy.
+    Call close() to stop listening to the graph.
+    """
+
+    def __init__(self, graph, max_entries=10000, ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            graph (Graph): The graph to query.
+            max_entries (int): Size of the LRU cache.
+            ttl (float): Seconds before a result is recomputed anyway (None = never).
+            clock: The cache's time source (handy for tests).
+        """
+        self.graph = graph
+        self.cache = LRUCache(max_entries, ttl, clock)
+        graph.add_edge_listener(self._edge_changed)
+        self._listening = True
+
+    def close(self):
+        """Detaches from the graph and empties the cache. Calling it again does nothing."""
+        if self._listening:
+            self.graph.remove_edge_listener(self._edge_changed)
+            self._listening = False
+        self.cache.clear()
+
+    def _edge_changed(self, id_from, id_to):
+        self.cache.invalidate_tag(id_from)
+        self.cache.invalidate_tag(id_to)
+
+    def _cached(self, key, compute, tags):
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            self.cache.put(key, result, tags)
+        return result
+
+    def follower_count(self, user):
+        """Returns how many users follow 'user'. Already O(1), so not cached."""
+        return self.graph.in_degree(user)
+
+    def following_count(self, user):
+        """Returns how many users 'user' follows. Already O(1), so not cached."""
+        return self.graph.out_degree(user)
+
+    def followers(self, user):
+        """Returns the users who follow 'user' as a tuple."""
+        user_id = self.graph.id_of(user)
+        return self._cached(("followers", user_id),
+                            lambda: tuple(self.graph.iter_incoming(user)), (user_id,))
+
+    def following(self, user):
+        """Returns the users 'user' follows as a tuple."""
+        user_id = self.graph.id_of(user)
+        return self._cached(("following", user_id),
+                            lambda: tuple(self.graph.iter_outgoing(user)), (user_id,))
+
+    def mutuals(self, user):
+        """Returns graph_traversal.mutual_follows() as a tuple."""
+        user_id = self.graph.id_of(user)
+        return self._cached(("mutuals", user_id),
+                            lambda: tuple(graph_traversal.mutual_follows(self.graph, user)), (user_id,))
+
+    def suggestions(self, user, k=10):
+        """Returns graph_traversal.suggest_follows(graph, user, k) as a tuple."""
+        graph = self.graph
+        user_id = graph.id_of(user)
+        key = ("suggestions", user_id, k)
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = tuple(graph_traversal.suggest_follows(graph, user, k))
+            # The suggestions also depend on who each followed account follows
+            self.cache.put(key, result, (user_id, *graph.successors(user_id)))
+        return result
+
+    def stats(self):
+        """Returns the cache's hit/miss counters (see LRUCache.stats())."""
+        return self.cache.stats()
+
+
+_MISSING = object()  # Marks a cache miss (None can be a real cached value)
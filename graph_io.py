@@ -0,0 +1,294 @@
+from array import array  # Per-string lengths in the binary format
+import csv  # Streaming CSV reader / writer
+import json  # One JSON object per line (JSONL)
+import mmap  # To map a saved graph instead of reading it into memory
+import struct  # Fixed-width binary header and person records
+from itertools import accumulate, islice  # String positions; cutting a stream into batches
+
+from social_media import CSRGraph, Graph, Person
+
+# --- Step 1: Streaming Text Import ---
+#
+# Every reader is a generator: it yields one record at a time, so a file of
+# any size is read with constant memory. import_graph() then feeds the
+# records to the Graph in fixed-size batches.
+
+PERSON_FIELDS = ("name", "gender", "biography", "privacy")
+EDGE_FIELDS = ("from", "to")
+
+
+def _person_from_record(record):
+    """Builds a Person from a dict with the PERSON_FIELDS keys (only 'name' is required)."""
+    return Person(record["name"], record.get("gender", ""), record.get("biography", ""),
+                  record.get("privacy") or "public")
+
+
+def read_people_csv(path):
+    """Yields a Person for each row of a CSV file with a name,gender,biography,privacy header."""
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            yield _person_from_record(row)
+
+
+def read_people_jsonl(path):
+    """Yields a Person for each line of a JSONL file like {"name": "Alice", "gender": ...}."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield _person_from_record(json.loads(line))
+
+
+def read_edges_csv(path):
+    """Yields (follower name, followed name) for each row of a CSV file with a from,to header."""
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            yield row["from"], row["to"]
+
+
+def read_edges_jsonl(path):
+    """Yields (follower name, followed name) for each line of a JSONL file like {"from": "Alice", "to": "Bob"}."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield record["from"], record["to"]
+
+
+def read_people(path):
+    """Picks read_people_csv or read_people_jsonl from the file extension."""
+    return read_people_jsonl(path) if path.endswith((".jsonl", ".ndjson")) else read_people_csv(path)
+
+
+def read_edges(path):
+    """Picks read_edges_csv or read_edges_jsonl from the file extension."""
+    return read_edges_jsonl(path) if path.endswith((".jsonl", ".ndjson")) else read_edges_csv(path)
+
+
+def batched(iterable, size):
+    """Yields lists of up to 'size' items from 'iterable'."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_graph(people, edges, graph=None, batch_size=10000):
+    """
+    Builds a graph from streams of people and follow edges.
+
+    Args:
+        people: An iterable of Person objects (e.g. read_people(path)).
+        edges: An iterable of (follower name, followed name) pairs (e.g. read_edges(path)).
+               If several people share a name, its edges go to the first of them.
+        graph (Graph): The graph to add to. A new Graph if not given.
+        batch_size (int): Records handed to add_vertices / add_edges at a time.
+
+    Returns:
+        Graph: The filled graph.
+    """
+    if graph is None:
+        graph = Graph()
+    # Edges refer to people by name; the graph's registry finds them in O(1)
+    by_name = graph.registry.by_name
+
+    for batch in batched(people, batch_size):
+        graph.add_vertices(batch)
+
+    unknown_names = 0
+    for batch in batched(edges, batch_size):
+        resolved = []
+        for from_name, to_name in batch:
+            vertex_from = by_name(from_name)
+            vertex_to = by_name(to_name)
+            if vertex_from is None or vertex_to is None:
+                unknown_names += 1
+            else:
+                resolved.append((vertex_from, vertex_to))
+        graph.add_edges(resolved)
+    if unknown_names:
+        print(f"Error: {unknown_names} edge(s) skipped because a user name was not found.")
+
+    return graph
+
+
+# --- Step 2: Streaming Text Export ---
+
+def export_people_csv(graph, path):
+    """Writes every Person in the graph to a CSV file readable by read_people_csv()."""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(PERSON_FIELDS)
+        for person in graph.registry:
+            writer.writerow((person.name, person.gender, person.biography, person.privacy))
+
+
+def export_people_jsonl(graph, path):
+    """Writes every Person in the graph to a JSONL file readable by read_people_jsonl()."""
+    with open(path, "w", encoding="utf-8") as file:
+        for person in graph.registry:
+            record = dict(zip(PERSON_FIELDS, (person.name, person.gender, person.biography, person.privacy)))
+            file.write(json.dumps(record) + "\n")
+
+
+def _edge_names(graph):
+    """Yields (follower name, followed name) for every edge in the graph."""
+    for person in graph.registry:
+        for followed in graph.iter_outgoing(person):
+            yield person.name, followed.name
+
+
+def export_edges_csv(graph, path):
+    """Writes every follow edge to a CSV file readable by read_edges_csv()."""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(EDGE_FIELDS)
+        writer.writerows(_edge_names(graph))
+
+
+def export_edges_jsonl(graph, path):
+    """Writes every follow edge to a JSONL file readable by read_edges_jsonl()."""
+    with open(path, "w", encoding="utf-8") as file:
+        for from_name, to_name in _edge_names(graph):
+            file.write(json.dumps({"from": from_name, "to": to_name}) + "\n")
+
+
+# --- Step 3: Binary Graph Format ---
+#
+# A saved graph is a CSR snapshot (see Graph.freeze()) written to disk:
+#
+#   Header        magic, version, vertex count, edge count and the file
+#                 offset of each section below
+#   Strings       every Person's name, gender, biography and privacy, in
+#                 vertex id order, as one UTF-8 block
+#   Lengths       4-byte character count of each of those strings
+#   4 arrays      out offsets, out neighbours, in offsets, in neighbours,
+#                 each of 8-byte integers
+#
+# Every section after the strings starts on an 8-byte boundary.
+# open_graph() maps the file and uses the four arrays in place, so the
+# edges are never copied into Python objects. The strings are decoded in
+# one go and cut up using the lengths.
+
+MAGIC = b"SLOWGRPH"
+VERSION = 1
+# magic, version, (reserved), vertices, edges, strings offset, strings size,
+# lengths offset, then the offsets of the 4 arrays
+HEADER = struct.Struct("<8sIIQQQQQQQQQ")
+
+
+def _pad_to_8(file):
+    """Writes zero bytes until the file position is a multiple of 8."""
+    remainder = file.tell() % 8
+    if remainder:
+        file.write(bytes(8 - remainder))
+
+
+def save_graph(graph, path):
+    """
+    Writes a graph of Person vertices to a binary file.
+
+    Args:
+        graph: A Graph or a CSRGraph snapshot.
+        path (str): The file to write.
+
+    Returns:
+        tuple: (vertex count, edge count)
+    """
+    csr = graph.freeze() if isinstance(graph, Graph) else graph
+    lengths = array('I')
+
+    with open(path, "wb") as file:
+        file.write(bytes(HEADER.size))  # Filled in at the end
+
+        strings_offset = file.tell()
+        for person in csr.vertices:
+            if not isinstance(person, Person):
+                raise TypeError("save_graph() can only save graphs of Person vertices.")
+            for value in (person.name, person.gender, person.biography, person.privacy):
+                value = str(value)
+                lengths.append(len(value))
+                file.write(value.encode("utf-8"))
+        strings_size = file.tell() - strings_offset
+
+        section_offsets = []
+        for arr in (lengths, csr.offsets, csr.neighbours, csr.in_offsets, csr.in_neighbours):
+            _pad_to_8(file)
+            section_offsets.append(file.tell())
+            file.write(memoryview(arr).cast("B"))
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, 0, csr.vertex_count, csr.edge_count,
+                               strings_offset, strings_size, *section_offsets))
+
+    return csr.vertex_count, csr.edge_count
+
+
+class MappedCSRGraph(CSRGraph):
+    """
+    A CSRGraph whose four integer arrays are views straight into a
+    memory-mapped graph file. Only the Person records are decoded.
+
+    Close it (or use it in a 'with' block) when done.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, _, vertex_count, edge_count, strings_offset, strings_size,
+             lengths_offset, *section_offsets) = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"'{path}' is not a version {VERSION} graph file.")
+
+            # Decode all the strings at once, then slice them apart
+            text = str(self._map[strings_offset:strings_offset + strings_size], "utf-8")
+            lengths = array('I', self._map[lengths_offset:lengths_offset + 16 * vertex_count])
+            ends = list(accumulate(lengths, initial=0))
+            fields = list(map(text.__getitem__, map(slice, ends, ends[1:])))
+            vertices = list(map(Person, fields[0::4], fields[1::4], fields[2::4], fields[3::4]))
+
+            whole_file = memoryview(self._map)
+            counts = (vertex_count + 1, edge_count, vertex_count + 1, edge_count)
+            arrays = [whole_file[start:start + 8 * count].cast("q")
+                      for start, count in zip(section_offsets, counts)]
+            whole_file.release()
+        except Exception:
+            self._map.close()
+            self._file.close()
+            raise
+        super().__init__(vertices, *arrays)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releases the array views and unmaps the file."""
+        if self._map is None:
+            return
+        for view in (self.offsets, self.neighbours, self.in_offsets, self.in_neighbours):
+            view.release()
+        self._map.close()
+        self._file.close()
+        self._map = None
+
+
+def open_graph(path):
+    """Memory-maps a file written by save_graph() and returns it as a MappedCSRGraph."""
+    return MappedCSRGraph(path)
+
+
+def load_graph(path):
+    """
+    Loads a file written by save_graph() into a new, mutable Graph.
+
+    The file's vertex ids become the Graph's ids, so Graph.from_csr() builds
+    each neighbour set straight from the mapped arrays, without making an
+    edge list first.
+    """
+    with open_graph(path) as csr:
+        return Graph.from_csr(csr)
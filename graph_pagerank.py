@@ -0,0 +1,323 @@
+import os  # cpu_count() for the default number of worker processes
+import time  # perf_counter_ns to time each iteration
+from array import array  # Compact float arrays for the ranks
+from concurrent.futures import ProcessPoolExecutor  # Spread the vertex range over processes
+from multiprocessing import shared_memory  # Let every worker read the same graph arrays
+
+try:
+    import numpy  # Optional: vectorized sparse iterations
+except ImportError:
+    numpy = None
+
+# --- Step 1: The PageRank Kernel ---
+#
+# We use the "pull" form of PageRank over the incoming-edge CSR arrays of a
+# CSRGraph snapshot (see Graph.freeze()):
+#
+#   new_rank[v] = base + damping * sum(rank[u] / out_degree[u] for u in followers(v))
+#
+# where base = (1 - damping) / n plus an equal share of the rank held by
+# vertices that follow nobody ("dangling" vertices). Each vertex only writes
+# its own entry, so a range of vertices can be computed independently of
+# the others, which is what lets us split the work across processes.
+
+
+def _rank_range_python(in_offsets, in_neighbours, inv_out_degree, src, dst,
+                       start, end, base, damping):
+    """
+    Computes new ranks for vertices start..end-1 into 'dst' (pure Python).
+
+    Returns:
+        tuple: (sum of |new - old| over the range, total new rank of dangling vertices in the range)
+    """
+    difference = 0.0
+    dangling = 0.0
+    for v in range(start, end):
+        total = 0.0
+        for index in range(in_offsets[v], in_offsets[v + 1]):
+            u = in_neighbours[index]
+            total += src[u] * inv_out_degree[u]
+        new_rank = base + damping * total
+        dst[v] = new_rank
+        difference += abs(new_rank - src[v])
+        if inv_out_degree[v] == 0.0:
+            dangling += new_rank
+    return difference, dangling
+
+
+def _rank_range_numpy(in_offsets, in_neighbours, in_targets, inv_out_degree, src, dst,
+                      start, end, base, damping):
+    """The same as _rank_range_python, vectorized with NumPy over the range's edges."""
+    first, last = in_offsets[start], in_offsets[end]
+    sources = in_neighbours[first:last]
+    contributions = src[sources] * inv_out_degree[sources]
+    sums = numpy.bincount(in_targets[first:last] - start, weights=contributions,
+                          minlength=end - start)
+    new_ranks = base + damping * sums
+    dst[start:end] = new_ranks
+    difference = float(numpy.abs(new_ranks - src[start:end]).sum())
+    dangling = float(new_ranks[inv_out_degree[start:end] == 0.0].sum())
+    return difference, dangling
+
+
+class _Arrays:
+    """The arrays one process works on: the graph, the two rank buffers and a kernel."""
+
+    def __init__(self, in_offsets, in_neighbours, inv_out_degree, ranks_a, ranks_b, use_numpy):
+        self.use_numpy = use_numpy
+        if use_numpy:
+            in_offsets = numpy.asarray(in_offsets, dtype=numpy.int64)
+            in_neighbours = numpy.asarray(in_neighbours, dtype=numpy.int64)
+            inv_out_degree = numpy.asarray(inv_out_degree, dtype=numpy.float64)
+            ranks_a = numpy.asarray(ranks_a, dtype=numpy.float64)
+            ranks_b = numpy.asarray(ranks_b, dtype=numpy.float64)
+            # in_targets[i] is the vertex that incoming edge i points to
+            self.in_targets = numpy.repeat(numpy.arange(len(in_offsets) - 1), numpy.diff(in_offsets))
+        self.in_offsets = in_offsets
+        self.in_neighbours = in_neighbours
+        self.inv_out_degree = inv_out_degree
+        self.ranks = (ranks_a, ranks_b)
+
+    def rank_range(self, src_index, start, end, base, damping):
+        """Reads ranks[src_index], writes ranks[1 - src_index] for vertices start..end-1."""
+        src, dst = self.ranks[src_index], self.ranks[1 - src_index]
+        if self.use_numpy:
+            return _rank_range_numpy(self.in_offsets, self.in_neighbours, self.in_targets,
+                                     self.inv_out_degree, src, dst, start, end, base, damping)
+        return _rank_range_python(self.in_offsets, self.in_neighbours, self.inv_out_degree,
+                                  src, dst, start, end, base, damping)
+
+
+# --- Step 2: Shared Memory for Worker Processes ---
+
+# Set in each worker process by _attach_worker()
+_worker_arrays = None
+_worker_blocks = []
+
+
+def _open_block(name):
+    """Attaches to an existing shared memory block without registering it for cleanup in this process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach_worker(layout, use_numpy):
+    """
+    Process pool initializer: maps the shared blocks described by 'layout'
+    ([(block name, format, item size, length), ...]) into typed views.
+    """
+    global _worker_arrays
+    views = []
+    for name, item_format, itemsize, length in layout:
+        block = _open_block(name)
+        _worker_blocks.append(block)
+        views.append(block.buf[:length * itemsize].cast(item_format))
+    _worker_arrays = _Arrays(*views, use_numpy=use_numpy)
+
+
+def _worker_rank_range(src_index, start, end, base, damping):
+    """Runs in a worker process: one range of one iteration."""
+    return _worker_arrays.rank_range(src_index, start, end, base, damping)
+
+
+def _share(arr):
+    """
+    Copies an array('q') / array('d'), or a memoryview of one (like the
+    arrays of a MappedCSRGraph from graph_io.open_graph), into a new shared
+    memory block.
+
+    Returns:
+        tuple: (the block, its layout entry for _attach_worker())
+    """
+    view = memoryview(arr)
+    size = view.nbytes
+    block = shared_memory.SharedMemory(create=True, size=max(8, size))
+    block.buf[:size] = view.cast('B')
+    return block, (block.name, view.format, view.itemsize, len(view))
+
+
+# --- Step 3: PageRank ---
+
+class PageRankResult:
+    """
+    The outcome of pagerank().
+
+    Attributes:
+        scores (dict): vertex -> PageRank score (the scores add up to 1).
+        iterations (int): Number of iterations run.
+        converged (bool): Whether the change fell below the tolerance.
+        iteration_times_ns (list): Wall-clock time of each iteration in nanoseconds.
+    """
+
+    def __init__(self, scores, iterations, converged, iteration_times_ns):
+        self.scores = scores
+        self.iterations = iterations
+        self.converged = converged
+        self.iteration_times_ns = iteration_times_ns
+
+    def mean_iteration_ms(self):
+        """Average time per iteration in milliseconds."""
+        if not self.iteration_times_ns:
+            return 0.0
+        return sum(self.iteration_times_ns) / len(self.iteration_times_ns) / 1e6
+
+    def top(self, k=10):
+        """Returns the k highest-scoring (vertex, score) pairs."""
+        return sorted(self.scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def pagerank(graph, damping=0.85, tolerance=1e-6, max_iterations=100, workers=1, use_numpy=None):
+    """
+    Scores how influential each vertex is with PageRank.
+
+    Args:
+        graph: A social_media.Graph, or a CSRGraph from Graph.freeze().
+        damping (float): The probability of following an edge rather than jumping anywhere.
+        tolerance (float): Stop once the total change in rank (L1) is below this.
+        max_iterations (int): Stop after this many iterations regardless.
+        workers (int): Number of processes. 1 runs in this process; more
+                       splits the vertex range over a ProcessPoolExecutor
+                       that shares the graph through shared memory.
+        use_numpy (bool): Use the vectorized NumPy kernel. Defaults to True
+                          when NumPy is installed.
+
+    Returns:
+        PageRankResult: The scores and how the iteration went.
+    """
+    csr = graph.freeze() if hasattr(graph, "freeze") else graph
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise RuntimeError("NumPy is not installed.")
+
+    n = csr.vertex_count
+    if n == 0:
+        return PageRankResult({}, 0, True, [])
+
+    # 1 / out-degree for each vertex, or 0.0 for vertices that follow nobody
+    inv_out_degree = array('d', (1.0 / degree if degree else 0.0 for degree in csr.out_degrees()))
+    ranks_a = array('d', [1.0 / n]) * n
+    ranks_b = array('d', bytes(8 * n))
+    dangling = sum(ranks_a[v] for v in range(n) if inv_out_degree[v] == 0.0)
+
+    # Split the vertex range into roughly equal chunks of edges, a few per worker
+    chunks = _partition(csr.in_offsets, workers * 4 if workers > 1 else 1)
+
+    blocks = []
+    executor = None
+    try:
+        if workers > 1:
+            arrays_to_share = (csr.in_offsets, csr.in_neighbours, inv_out_degree, ranks_a, ranks_b)
+            layout = []
+            for arr in arrays_to_share:
+                block, entry = _share(arr)
+                blocks.append(block)  # Added at once so the finally below frees it
+                layout.append(entry)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                           initargs=(layout, use_numpy))
+
+            def run_chunk(*args):
+                return executor.submit(_worker_rank_range, *args)
+        else:
+            local = _Arrays(csr.in_offsets, csr.in_neighbours, inv_out_degree,
+                            ranks_a, ranks_b, use_numpy)
+
+            def run_chunk(*args):
+                return _Done(local.rank_range(*args))
+
+        src_index = 0
+        iteration_times = []
+        converged = False
+        for _ in range(max_iterations):
+            start_time = time.perf_counter_ns()
+            base = (1.0 - damping) / n + damping * dangling / n
+            futures = [run_chunk(src_index, start, end, base, damping) for start, end in chunks]
+            results = [future.result() for future in futures]
+            difference = sum(result[0] for result in results)
+            dangling = sum(result[1] for result in results)
+            src_index = 1 - src_index
+            iteration_times.append(time.perf_counter_ns() - start_time)
+            if difference < tolerance:
+                converged = True
+                break
+
+        # The latest ranks are in buffer src_index
+        if workers > 1:
+            final_block = blocks[3 + src_index]
+            final = array('d', bytes(final_block.buf[:ranks_a.itemsize * n]))
+        else:
+            final = local.ranks[src_index]
+        scores = {csr.vertices[v]: float(final[v]) for v in range(n)}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return PageRankResult(scores, len(iteration_times), converged, iteration_times)
+
+
+class _Done:
+    """Wraps a result computed in this process so it looks like a finished Future."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+def _partition(offsets, chunk_count):
+    """
+    Splits vertices 0..n-1 into up to 'chunk_count' contiguous ranges with
+    about the same number of edges each.
+
+    Returns:
+        list: (start, end) pairs covering every vertex.
+    """
+    n = len(offsets) - 1
+    total_edges = offsets[n]
+    chunks = []
+    start = 0
+    for chunk in range(1, chunk_count + 1):
+        if start >= n:
+            break
+        if chunk == chunk_count:
+            end = n
+        else:
+            target = total_edges * chunk // chunk_count
+            end = start + 1
+            while end < n and offsets[end] < target:
+                end += 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+# --- Step 4: Demo / Benchmark ---
+
+if __name__ == "__main__":
+    import random
+    from social_media import Graph
+
+    # A random follow graph where a few accounts are much more popular
+    NUM_USERS = 20000
+    FOLLOWS_PER_USER = 10
+    rng = random.Random(1)
+    demo_graph = Graph()
+    for user_id in range(NUM_USERS):
+        demo_graph.add_vertex(user_id)
+    for user_id in range(NUM_USERS):
+        for _ in range(FOLLOWS_PER_USER):
+            demo_graph.add_edge(user_id, int(NUM_USERS * rng.random() ** 3))
+    snapshot = demo_graph.freeze()
+    print(f"Graph: {snapshot.vertex_count} users, {snapshot.edge_count} follows")
+
+    for worker_count in sorted({1, 2, os.cpu_count() or 1}):
+        result = pagerank(snapshot, workers=worker_count)
+        print(f"{worker_count} worker(s): {result.iterations} iterations, "
+              f"{result.mean_iteration_ms():.1f} ms per iteration, converged={result.converged}")
+    print("Top 5 accounts:", [(user, round(score, 5)) for user, score in result.top(5)])
@@ -0,0 +1,274 @@
+# --- Step 1: Privacy Rules ---
+#
+# A "public" profile can be seen by everyone. A "private" profile can only
+# be seen by the user themselves and by the users who follow them.
+#
+# This applies twice when listing someone's followers / following:
+#   1. The viewer must be allowed to see the owner of the list, otherwise
+#      PermissionError is raised.
+#   2. Each private user in the list only shows up for viewers allowed to
+#      see them. This is checked as the list is walked, so hidden users
+#      never take up a place on a page.
+#
+# Everything works on the graph's integer ids (see Graph.successors /
+# Graph.predecessors) and only turns the users on the page into objects.
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# A page stops after looking at this many entries per requested item, even
+# if it is not full, so a viewer who can see very few of the users in a big
+# list still gets a quick answer (with a cursor to carry on from).
+SCAN_LIMIT_FACTOR = 10
+
+
+def _can_view_id(graph, viewer_id, person_id):
+    """The privacy rule above, on ids. viewer_id is None for a logged-out viewer."""
+    if graph.vertex(person_id).privacy != "private":
+        return True
+    if viewer_id is None:
+        return False
+    return viewer_id == person_id or viewer_id in graph.predecessors(person_id)
+
+
+def _id_set(neighbour_ids):
+    """
+    Returns something with O(1) membership tests for a neighbour list: a
+    Graph's NeighbourIds already is one, a CSRGraph's memoryview row is
+    copied into a set.
+    """
+    if isinstance(neighbour_ids, memoryview):
+        return set(neighbour_ids)
+    return neighbour_ids
+
+
+def _viewer_check(graph, viewer_id):
+    """
+    Returns a function person_id -> bool applying the privacy rule for one
+    viewer. Instead of looking for the viewer among each private user's
+    followers, it looks for each private user among the people the viewer
+    follows, so that list is read (once, when first needed) rather than a
+    new list per user.
+    """
+    followed = None
+
+    def check(person_id):
+        nonlocal followed
+        if graph.vertex(person_id).privacy != "private":
+            return True
+        if viewer_id is None:
+            return False
+        if viewer_id == person_id:
+            return True
+        if followed is None:
+            followed = _id_set(graph.successors(viewer_id))
+        return person_id in followed
+
+    return check
+
+
+def can_view(graph, viewer, person):
+    """
+    Checks whether 'viewer' may see the profile of 'person'.
+
+    Args:
+        graph (Graph): The social graph.
+        viewer (Person): The user looking, or None if nobody is logged in.
+        person (Person): The profile being looked at.
+
+    Returns:
+        bool: True if the profile is public, or viewer is person or one of their followers.
+    """
+    viewer_id = None if viewer is None else graph.id_of(viewer)
+    return _can_view_id(graph, viewer_id, graph.id_of(person))
+
+
+# --- Step 2: Cursors and Pages ---
+#
+# A cursor remembers where the previous page stopped: the position in the
+# (insertion-ordered) neighbour list and the id found there, written as an
+# opaque "position:id" string. New followers are added at the end of the
+# list, and removed ones leave a hole, so the position stays valid and the
+# next page starts right there. The id tells us whether the list was packed
+# in the meantime: then the id's new slot (from the list's id -> slot
+# index) is used instead.
+
+class Page:
+    """
+    One page of results.
+
+    Attributes:
+        items (list): The users on this page (at most the page size).
+        next_cursor (str): Pass this back to get the next page, or None if
+                           this is the last page.
+        scanned (int): How many list entries were looked at to fill the page.
+    """
+
+    __slots__ = ("items", "next_cursor", "scanned")
+
+    def __init__(self, items, next_cursor, scanned=0):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.scanned = scanned
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode_cursor(position, vertex_id):
+    return f"{position}:{vertex_id}"
+
+
+def _decode_cursor(cursor):
+    """Returns (position, vertex id) from a cursor string (ValueError if it is malformed)."""
+    try:
+        position, vertex_id = (int(part) for part in cursor.split(":"))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if position < 1:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return position, vertex_id
+
+
+def _resume(neighbour_ids, cursor):
+    """
+    Returns (iterator of (position, id) pairs after the cursor, end position).
+
+    Resuming costs O(1) whatever the page number: a Graph's NeighbourIds
+    is read from a slot directly, and a CSRGraph's arrays are sliced.
+    """
+    if hasattr(neighbour_ids, "iter_from"):
+        # A Graph: positions are slots in the NeighbourIds
+        if cursor is None:
+            start = 0
+        else:
+            position, last_id = _decode_cursor(cursor)
+            slot = neighbour_ids.slot_of(last_id)
+            if slot is not None and slot < position - 1:
+                # Still there but at an earlier slot: the list was packed
+                start = slot + 1
+            else:
+                # Slots never move otherwise, so carry on from the position,
+                # whether the id is still there, was removed, or was removed
+                # and added again at the end (which must not skip the ids
+                # in between). Only a packing together with the id's
+                # removal can make this skip or repeat entries.
+                start = min(position, neighbour_ids.slot_limit)
+        return neighbour_ids.iter_from(start), neighbour_ids.slot_limit
+
+    # A CSRGraph snapshot never changes, so the position is always exact
+    start = 0
+    if cursor is not None:
+        start, last_id = _decode_cursor(cursor)
+        if start > len(neighbour_ids) or neighbour_ids[start - 1] != last_id:
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+    return enumerate(neighbour_ids[start:], start), len(neighbour_ids)
+
+
+def _check_page_size(page_size):
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}.")
+
+
+def _page(graph, neighbour_ids, viewer_id, cursor, page_size, keep=None):
+    """
+    Builds one page from a view of neighbour ids.
+
+    Args:
+        keep: Optional extra test on each id (used for mutuals).
+    """
+    _check_page_size(page_size)
+    remaining, end = _resume(neighbour_ids, cursor)
+    can_view_id = _viewer_check(graph, viewer_id)
+    scan_limit = page_size * SCAN_LIMIT_FACTOR
+    items = []
+    scanned = 0
+    last_id = None
+    position = 0
+
+    for slot, vertex_id in remaining:
+        position = slot + 1
+        scanned += 1
+        last_id = vertex_id
+        if (keep is None or keep(vertex_id)) and can_view_id(vertex_id):
+            items.append(graph.vertex(vertex_id))
+            if len(items) == page_size:
+                break
+        if scanned >= scan_limit:
+            break
+
+    if last_id is None or position >= end:
+        return Page(items, None, scanned)
+    return Page(items, _encode_cursor(position, last_id), scanned)
+
+
+def _owner_and_viewer_ids(graph, user, viewer):
+    """Looks up both ids and checks the viewer may see the user's lists."""
+    user_id = graph.id_of(user)
+    viewer_id = None if viewer is None else graph.id_of(viewer)
+    if not _can_view_id(graph, viewer_id, user_id):
+        raise PermissionError(f"{user.get_name()}'s profile is private.")
+    return user_id, viewer_id
+
+
+# --- Step 3: The Query API ---
+
+def followers(graph, user, viewer=None, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Returns one page of the users who follow 'user', oldest follower first.
+
+    Args:
+        graph (Graph): The social graph.
+        user (Person): Whose followers to list.
+        viewer (Person): Who is asking (None = logged out). Private users
+                         they cannot see are left out.
+        cursor (str): The next_cursor of the previous page, or None for the first page.
+        page_size (int): At most this many users (1 - MAX_PAGE_SIZE).
+
+    Returns:
+        Page: The users and the cursor for the next page.
+
+    Raises:
+        PermissionError: If 'user' is private and the viewer cannot see them.
+    """
+    user_id, viewer_id = _owner_and_viewer_ids(graph, user, viewer)
+    return _page(graph, graph.predecessors(user_id), viewer_id, cursor, page_size)
+
+
+def following(graph, user, viewer=None, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Returns one page of the users 'user' follows. Arguments as for followers()."""
+    user_id, viewer_id = _owner_and_viewer_ids(graph, user, viewer)
+    return _page(graph, graph.successors(user_id), viewer_id, cursor, page_size)
+
+
+def mutuals(graph, user, viewer=None, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Returns one page of the users who follow 'user' and are followed back,
+    in the order 'user' followed them. Arguments as for followers().
+    """
+    user_id, viewer_id = _owner_and_viewer_ids(graph, user, viewer)
+    user_followers = _id_set(graph.predecessors(user_id))
+    return _page(graph, graph.successors(user_id), viewer_id, cursor, page_size,
+                 keep=user_followers.__contains__)
+
+
+def paginate(query, graph, user, viewer=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yields every result of a query (followers, following or mutuals), one
+    page at a time. Only the current page is held in memory, and nothing
+    past it is fetched until the caller asks for more.
+
+    Example:
+        for person in paginate(followers, graph, alice, viewer=bob):
+            print(person.get_name())
+    """
+    cursor = None
+    while True:
+        page = query(graph, user, viewer=viewer, cursor=cursor, page_size=page_size)
+        yield from page.items
+        cursor = page.next_cursor
+        if cursor is None:
+            return
@@ -0,0 +1,254 @@
+from collections import deque  # O(1) queue for breadth-first search
+import heapq  # Top-k selection for follow suggestions
+
+# --- Step 1: Basic Traversals ---
+#
+# All functions take vertex objects but walk the graph by integer id, using
+# id_of() / vertex() and the successors() / predecessors() views. Graph and
+# its CSRGraph snapshot (Graph.freeze()) both provide these, so every
+# function here works on either, and nothing is copied per vertex.
+
+def _id_or_none(graph, vertex):
+    """Returns the vertex's id in 'graph', or None if it is not in the graph."""
+    try:
+        return graph.id_of(vertex)
+    except KeyError:
+        return None
+
+
+def _neighbours_function(graph, direction):
+    """Returns graph.successors for direction "out" or graph.predecessors for "in"."""
+    if direction == "out":
+        return graph.successors
+    if direction == "in":
+        return graph.predecessors
+    raise ValueError("direction must be 'out' or 'in'.")
+
+
+def bfs(graph, start, max_depth=None, direction="out"):
+    """
+    Breadth-first search from 'start'.
+
+    Yields vertices in order of distance, so the caller can stop as soon as
+    it has what it needs (the rest of the graph is never visited).
+
+    Args:
+        graph: The Graph (or CSRGraph) to walk.
+        start: The vertex to start from.
+        max_depth (int): Do not go further than this many edges (None = no limit).
+        direction (str): "out" follows edges forwards (who a user follows),
+                         "in" follows them backwards (who follows a user).
+
+    Yields:
+        tuple: (vertex, depth), starting with (start, 0).
+    """
+    neighbours = _neighbours_function(graph, direction)
+    start_id = _id_or_none(graph, start)
+    if start_id is None:
+        yield start, 0
+        return
+    vertex_at = graph.vertex
+    visited = {start_id}
+    queue = deque([(start_id, 0)])
+    while queue:
+        vertex_id, depth = queue.popleft()
+        yield vertex_at(vertex_id), depth
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for neighbour in neighbours(vertex_id):
+            if neighbour not in visited:
+                visited.add(neighbour)
+                queue.append((neighbour, depth + 1))
+
+
+def dfs(graph, start, max_depth=None, direction="out"):
+    """
+    Iterative depth-first search from 'start' (no recursion limit problems).
+
+    Args:
+        graph: The Graph (or CSRGraph) to walk.
+        start: The vertex to start from.
+        max_depth (int): Do not go further than this many edges (None = no limit).
+        direction (str): "out" or "in", as for bfs().
+
+    Yields:
+        tuple: (vertex, depth) in pre-order, starting with (start, 0).
+    """
+    neighbours = _neighbours_function(graph, direction)
+    start_id = _id_or_none(graph, start)
+    if start_id is None:
+        yield start, 0
+        return
+    vertex_at = graph.vertex
+    visited = set()
+    stack = [(start_id, 0)]
+    while stack:
+        vertex_id, depth = stack.pop()
+        if vertex_id in visited:
+            continue
+        visited.add(vertex_id)
+        yield vertex_at(vertex_id), depth
+        if max_depth is not None and depth >= max_depth:
+            continue
+        # Push in reverse so neighbours are visited in the order they were added
+        for neighbour in reversed(list(neighbours(vertex_id))):
+            if neighbour not in visited:
+                stack.append((neighbour, depth + 1))
+
+
+# --- Step 2: Degrees of Separation ---
+
+def shortest_path(graph, source, target, max_depth=None):
+    """
+    Finds a shortest follow path source -> ... -> target with bidirectional BFS.
+
+    One search goes forwards from 'source' along outgoing edges while the
+    other goes backwards from 'target' along incoming edges. Each round
+    expands the smaller frontier, and the search stops as soon as the two
+    meet, so it visits far fewer vertices than a single BFS.
+
+    Args:
+        graph (Graph): The graph to search.
+        source: The starting vertex.
+        target: The vertex to reach.
+        max_depth (int): Give up on paths longer than this (None = no limit).
+
+    Returns:
+        list: The vertices on the path (including source and target), or None
+              if there is no path within max_depth.
+    """
+    if source == target:
+        return [source]
+    source_id = _id_or_none(graph, source)
+    target_id = _id_or_none(graph, target)
+    if source_id is None or target_id is None:
+        return None
+
+    # parent links for each side: vertex id -> previous vertex id on the path
+    forward_parents = {source_id: None}
+    backward_parents = {target_id: None}
+    forward_frontier = [source_id]
+    backward_frontier = [target_id]
+    path_length = 0
+
+    while forward_frontier and backward_frontier:
+        if max_depth is not None and path_length >= max_depth:
+            return None
+        path_length += 1
+
+        # Expand whichever side has fewer vertices to look at
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, other_parents = forward_frontier, forward_parents, backward_parents
+            neighbours = graph.successors
+        else:
+            frontier, parents, other_parents = backward_frontier, backward_parents, forward_parents
+            neighbours = graph.predecessors
+
+        next_frontier = []
+        for vertex in frontier:
+            for neighbour in neighbours(vertex):
+                if neighbour in parents:
+                    continue
+                parents[neighbour] = vertex
+                if neighbour in other_parents:
+                    path = _join_paths(neighbour, forward_parents, backward_parents)
+                    return [graph.vertex(vertex_id) for vertex_id in path]
+                next_frontier.append(neighbour)
+
+        if parents is forward_parents:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    return None
+
+
+def _join_paths(meeting_vertex, forward_parents, backward_parents):
+    """Builds the full path of ids through the vertex where the two searches met."""
+    path = []
+    vertex = meeting_vertex
+    while vertex is not None:
+        path.append(vertex)
+        vertex = forward_parents[vertex]
+    path.reverse()
+    vertex = backward_parents[meeting_vertex]
+    while vertex is not None:
+        path.append(vertex)
+        vertex = backward_parents[vertex]
+    return path
+
+
+def degrees_of_separation(graph, source, target, max_depth=None):
+    """
+    Returns the number of follow steps from source to target, or None if
+    target cannot be reached within max_depth.
+    """
+    path = shortest_path(graph, source, target, max_depth)
+    if path is None:
+        return None
+    return len(path) - 1
+
+
+# --- Step 3: Mutual Follows and Suggestions ---
+
+def is_mutual(graph, a, b):
+    """Returns True if a follows b and b follows a."""
+    a_id = _id_or_none(graph, a)
+    b_id = _id_or_none(graph, b)
+    if a_id is None or b_id is None:
+        return False
+    return b_id in graph.successors(a_id) and a_id in graph.successors(b_id)
+
+
+def mutual_follows(graph, vertex):
+    """
+    Lists the vertices that 'vertex' follows and that follow it back.
+
+    Returns:
+        list: The mutual follows, in the order 'vertex' followed them.
+    """
+    vertex_id = _id_or_none(graph, vertex)
+    if vertex_id is None:
+        return []
+    followers = set(graph.predecessors(vertex_id))
+    return [graph.vertex(other) for other in graph.successors(vertex_id) if other in followers]
+
+
+def suggest_follows(graph, vertex, k=10, max_edges_scanned=None):
+    """
+    "People you may know": ranks friends-of-friends by how many of the
+    people 'vertex' follows also follow them.
+
+    Args:
+        graph: The Graph (or CSRGraph).
+        vertex: The user to make suggestions for.
+        k (int): How many suggestions to return.
+        max_edges_scanned (int): Stop counting after this many 2-hop edges,
+                                 to bound the work for very popular accounts
+                                 (None = no limit).
+
+    Returns:
+        list: Up to k (vertex, count) pairs, highest count first. Ties keep
+              the order in which the candidates were first seen.
+    """
+    vertex_id = _id_or_none(graph, vertex)
+    if vertex_id is None:
+        return []
+    following = graph.successors(vertex_id)
+    already_followed = set(following)
+    counts = {}
+    scanned = 0
+
+    for friend in following:
+        for candidate in graph.successors(friend):
+            scanned += 1
+            if candidate != vertex_id and candidate not in already_followed:
+                counts[candidate] = counts.get(candidate, 0) + 1
+            if max_edges_scanned is not None and scanned >= max_edges_scanned:
+                break
+        else:
+            continue
+        break  # The inner loop hit max_edges_scanned
+
+    top = heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+    return [(graph.vertex(candidate), count) for candidate, count in top]
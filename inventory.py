@@ -13,6 +13,9 @@ class Product:
         quantity (int): The current stock level.
     """
 
+    # No per-instance __dict__: with millions of products this saves a lot of memory
+    __slots__ = ("product_id", "name", "price", "quantity")
+
     def __init__(self, product_id, name, price, quantity):
         self.product_id = product_id  # str: Using string for flexibility (e.g., 'SKU-1001')
         self.name = name  # str: Product name
@@ -32,12 +35,151 @@ class Node:
     Each node stores a key-value pair and a pointer to the next node.
     """
 
+    __slots__ = ("key", "value", "next")
+
     def __init__(self, key, value):
         self.key = key  # The product_id
         self.value = value  # The entire Product object
         self.next = None  # The pointer to the next Node in the chain (or None)
 
 
+# --- Step 1b: Sorted Secondary Index on product_id ---
+
+import bisect  # Binary search over the sorted key list
+
+
+class SortedKeyIndex:
+    """
+    Keeps every product_id in a sorted Python list so we can answer range
+    and prefix queries (e.g. "all D1xx diapers") with binary search.
+
+    The hash table answers exact lookups; this index answers ordered ones.
+    Keys must be comparable with each other (e.g. all strings).
+    """
+
+    def __init__(self):
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key):
+        """Adds a key (assumed not already present) in sorted position."""
+        bisect.insort(self.keys, key)
+
+    def add_many(self, keys):
+        """Adds many new keys at once with a single merge-sort instead of one insort each."""
+        self.keys.extend(keys)
+        self.keys.sort()
+
+    def discard(self, key):
+        """Removes a key if it is present."""
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+
+    def range(self, low=None, high=None):
+        """
+        Yields the keys with low <= key < high, in sorted order.
+        Either bound can be None to leave that side open.
+        """
+        keys = self.keys
+        start = 0 if low is None else bisect.bisect_left(keys, low)
+        end = len(keys) if high is None else bisect.bisect_left(keys, high)
+        for index in range(start, end):
+            yield keys[index]
+
+    def prefix(self, prefix):
+        """Yields the keys that start with 'prefix', in sorted order."""
+        keys = self.keys
+        index = bisect.bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix):
+            yield keys[index]
+            index += 1
+
+
+# --- Step 1c: Pluggable Hash Functions ---
+
+import hashlib  # blake2b, a fast cryptographic hash with a small digest
+import zlib  # crc32, implemented in C
+
+try:
+    import xxhash  # Optional: very fast non-cryptographic hash (pip install xxhash)
+except ImportError:
+    xxhash = None
+
+_FNV_OFFSET_BASIS = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _key_bytes(key):
+    """The bytes that the deterministic hash functions hash: the key as UTF-8 text."""
+    return str(key).encode("utf-8")
+
+
+def fnv1a_hash(key):
+    """64-bit FNV-1a. Simple and well spread for short keys like "D101", but pure Python."""
+    hash_value = _FNV_OFFSET_BASIS
+    for byte in _key_bytes(key):
+        hash_value = ((hash_value ^ byte) * _FNV_PRIME) & _MASK_64
+    return hash_value
+
+
+def blake2b_hash(key):
+    """The first 8 bytes of a BLAKE2b digest, as an integer."""
+    return int.from_bytes(hashlib.blake2b(_key_bytes(key), digest_size=8).digest(), "little")
+
+
+def crc32_hash(key):
+    """32-bit CRC from zlib. Very fast, good enough spread for table indexing."""
+    return zlib.crc32(_key_bytes(key))
+
+
+# Name -> hash function. Every function except "builtin" gives the same
+# value in every process, so it can be used for data written to disk.
+# Python's built-in hash() of a string is randomized per process.
+HASH_FUNCTIONS = {
+    "builtin": hash,
+    "fnv1a": fnv1a_hash,
+    "blake2b": blake2b_hash,
+    "crc32": crc32_hash,
+}
+
+if xxhash is not None:
+    def xxhash_hash(key):
+        """64-bit xxHash from the optional xxhash package."""
+        return xxhash.xxh64_intdigest(_key_bytes(key))
+
+    HASH_FUNCTIONS["xxhash"] = xxhash_hash
+
+
+def get_hash_function(hash_function):
+    """
+    Looks up a hash function.
+
+    Args:
+        hash_function: A name from HASH_FUNCTIONS, or any callable key -> int.
+
+    Returns:
+        tuple: (name, function)
+    """
+    if callable(hash_function):
+        return getattr(hash_function, "__name__", "custom"), hash_function
+    if hash_function not in HASH_FUNCTIONS:
+        raise ValueError(f"Unknown hash function '{hash_function}'. "
+                         f"Choose from: {', '.join(HASH_FUNCTIONS)}.")
+    return hash_function, HASH_FUNCTIONS[hash_function]
+
+
+def _round_up_power_of_two(size):
+    """Rounds 'size' up to the next power of two."""
+    capacity = 1
+    while capacity < size:
+        capacity *= 2
+    return capacity
+
+
 # --- Step 2: Implement the Hash Table Class ---
 
 # --- THIS CLASS IS NOW UN-INDENTED ---
@@ -45,38 +187,155 @@ class HashTable:
     """
     Implements a Hash Table using Separate Chaining for collision resolution.
     It will store Product objects, using the product_id as the key.
+
+    The table grows by itself. Once (entries / buckets) goes past
+    max_load_factor, a table with twice as many buckets is created and the
+    old buckets are moved across a few at a time on every insert
+    (incremental rehashing), so no single insert has to rehash everything.
     """
 
-    def __init__(self, size):
+    # How many old buckets are moved into the new table per insert while a resize is running
+    REHASH_STEP = 4
+
+    def __init__(self, size, max_load_factor=0.75, verbose=True, sorted_index=False,
+                 hash_function="builtin", power_of_two=False):
         """
         Initializes the hash table.
 
         Args:
-            size (int): The number of buckets in the hash table.
+            size (int): The initial number of buckets in the hash table.
+            max_load_factor (float): The load factor above which the table doubles in size.
+            verbose (bool): Print a message when the table is created.
+            sorted_index (bool): Also keep a SortedKeyIndex of the keys, kept up
+                                 to date on every insert and delete, for fast
+                                 range() and prefix() queries.
+            hash_function: A name from HASH_FUNCTIONS or a callable key -> int.
+            power_of_two (bool): Round the bucket count up to a power of two and
+                                 pick buckets with a bit mask instead of modulo.
         """
+        if size < 1:
+            raise ValueError("Hash table size must be at least 1.")
+        if max_load_factor <= 0:
+            raise ValueError("max_load_factor must be greater than 0.")
+
+        self.hash_name, self.hash_function = get_hash_function(hash_function)
+        self.power_of_two = power_of_two
+        if power_of_two:
+            size = _round_up_power_of_two(size)
+
         self.size = size
+        self.max_load_factor = max_load_factor
         # Create an empty list (our buckets) of the given size
         # Each bucket is initialized to None
 
         self.buckets = [None] * self.size
-        print(f"Hash Table created with {self.size} buckets.")
+        self.count = 0  # Number of key-value pairs stored
+        self.resize_count = 0  # How many times the table has grown
+
+        # While a resize is in progress, these hold the previous bucket list.
+        # Every old bucket below _rehash_index has already been moved across.
+        self._old_buckets = None
+        self._old_size = 0
+        self._rehash_index = 0
+
+        # Optional ordered index of the keys (None when not enabled)
+        self.key_index = SortedKeyIndex() if sorted_index else None
+
+        if verbose:
+            print(f"Hash Table created with {self.size} buckets.")
+
+    def __len__(self):
+        """Returns the number of products stored in the table."""
+        return self.count
+
+    def __iter__(self):
+        """Yields every key in the table, one at a time (in no particular order)."""
+        for key, _ in self.items():
+            yield key
+
+    @property
+    def load_factor(self):
+        """The average number of entries per bucket (count / size)."""
+        return self.count / self.size
 
-    def _hash(self, key):
+    def _hash(self, key, size=None):
         """
         A private helper method to calculate the bucket index for a given key.
 
         Args:
             key: The key to hash (e.g., "P101").
+            size (int): The bucket count to hash into (defaults to self.size).
 
         Returns:
-            int: The calculated bucket index (from 0 to self.size - 1).
+            int: The calculated bucket index (from 0 to size - 1).
         """
-        # Use Python's built-in hash() function
-        hash_value = hash(key)
-        # Use the modulo operator to get an index within our bucket list size
-        index = hash_value % self.size
+        if size is None:
+            size = self.size
+        # Use the table's hash function (Python's built-in hash() by default)
+        hash_value = self.hash_function(key)
+        # Use a bit mask (power-of-two sizes) or the modulo operator
+        # to get an index within our bucket list size
+        if self.power_of_two:
+            return hash_value & (size - 1)
+        index = hash_value % size
         return index
 
+    def _old_bucket_index(self, key):
+        """
+        Returns the index of the old bucket still holding 'key' during a resize,
+        or None if there is no resize running or that bucket was already moved.
+        """
+        if self._old_buckets is None:
+            return None
+        old_index = self._hash(key, self._old_size)
+        if old_index >= self._rehash_index:
+            return old_index
+        return None
+
+    def _start_resize(self, new_size):
+        """Swaps in an empty bucket list of 'new_size' and starts moving the old entries across."""
+        # Never run two resizes at once
+        self._finish_rehash()
+
+        self._old_buckets = self.buckets
+        self._old_size = self.size
+        self._rehash_index = 0
+        self.buckets = [None] * new_size
+        self.size = new_size
+        self.resize_count += 1
+
+    def _rehash_step(self, steps=None):
+        """Moves the next 'steps' old buckets (default REHASH_STEP) into the new table."""
+        if self._old_buckets is None:
+            return
+        if steps is None:
+            steps = self.REHASH_STEP
+
+        old_buckets = self._old_buckets
+        end = min(self._rehash_index + steps, self._old_size)
+        for i in range(self._rehash_index, end):
+            current = old_buckets[i]
+            while current:
+                next_node = current.next
+                # Re-use the Node object: push it onto the front of its new chain
+                index = self._hash(current.key)
+                current.next = self.buckets[index]
+                self.buckets[index] = current
+                current = next_node
+            old_buckets[i] = None
+        self._rehash_index = end
+
+        # Every old bucket has been moved, so the resize is finished
+        if end == self._old_size:
+            self._old_buckets = None
+            self._old_size = 0
+            self._rehash_index = 0
+
+    def _finish_rehash(self):
+        """Moves all remaining old buckets across in one go."""
+        if self._old_buckets is not None:
+            self._rehash_step(self._old_size)
+
     def insert(self, key, value):
         """
         Inserts a key-value pair into the hash table.
@@ -85,22 +344,36 @@ class HashTable:
         Args:
             key: The key (product_id).
             value: The value (the entire Product object).
+
+        Returns:
+            int: The key's position in its chain (1 = first), i.e. how many
+                 nodes a search for it looks at (used by metrics.py).
         """
-        # 1. Find the bucket index
-        index = self._hash(key)
+        # 0. If a resize is running, move a few more old buckets across.
+        self._rehash_step()
+
+        # 1. Find the bucket index. While a resize is running, a key whose old
+        #    bucket has not been moved yet belongs in that old bucket; it is
+        #    carried across with the rest of the bucket later.
+        old_index = self._old_bucket_index(key)
+        if old_index is not None:
+            buckets, index = self._old_buckets, old_index
+        else:
+            buckets, index = self.buckets, self._hash(key)
 
         # 2. Create the new node to store the key and value
         # Now this will correctly find the 'Node' class
         new_node = Node(key, value)
 
         # 3. Check if the bucket at this index is empty
-        if self.buckets[index] is None:
+        probes = 1
+        if buckets[index] is None:
             # If empty, place the new node here
-            self.buckets[index] = new_node
+            buckets[index] = new_node
             # print(f"Inserted {key} at index {index} (empty bucket)")
         else:
             # 4. If not empty (a collision!), traverse the linked list
-            current = self.buckets[index]
+            current = buckets[index]
 
             # Check for duplicate keys. If found, update the existing entry.
             while current:
@@ -108,7 +381,7 @@ class HashTable:
                     # Found a duplicate key, update its value
                     current.value = value
                     # print(f"Updated {key} at index {index}")
-                    return  # Exit the function
+                    return probes  # Exit the function
 
                 # If we are at the end of the list, prepare to append
                 if current.next is None:
@@ -116,12 +389,22 @@ class HashTable:
 
                 # Move to the next node
                 current = current.next
+                probes += 1
 
             # 5. We reached the end of the list (current.next is None)
             # Add the new node to the end of the chain
             current.next = new_node
+            probes += 1
             # print(f"Inserted {key} at index {index} (collision)")
 
+        # 6. A new entry was added, so grow the table if it is now too full
+        self.count += 1
+        if self.key_index is not None:
+            self.key_index.add(key)
+        if self.count > self.max_load_factor * self.size:
+            self._start_resize(self.size * 2)
+        return probes
+
     def search(self, key):
         """
         Searches for a value in the hash table using its key.
@@ -132,11 +415,14 @@ class HashTable:
         Returns:
             Product: The Product object if found, otherwise None.
         """
-        # 1. Find the bucket index
-        index = self._hash(key)
-
-        # 2. Get the head of the chain (if any) at that bucket
-        current = self.buckets[index]
+        # 1. Find the head of the chain that holds the key. During a resize
+        #    the key may still be in a bucket of the old table.
+        old_index = self._old_bucket_index(key)
+        if old_index is not None:
+            current = self._old_buckets[old_index]
+        else:
+            # 2. Get the head of the chain (if any) at that bucket
+            current = self.buckets[self._hash(key)]
 
         # 3. Traverse the linked list in the bucket
         while current:
@@ -151,12 +437,893 @@ class HashTable:
         # 4. If the loop finishes (current is None), the key was not found
         return None
 
+    def search_with_probes(self, key):
+        """
+        Searches like search(), also counting the chain nodes looked at.
+        The instrumentation in metrics.py uses it in place of search().
+
+        Returns:
+            tuple: (the stored value or None, number of nodes looked at)
+        """
+        old_index = self._old_bucket_index(key)
+        if old_index is not None:
+            current = self._old_buckets[old_index]
+        else:
+            current = self.buckets[self._hash(key)]
+        probes = 0
+        while current:
+            probes += 1
+            if current.key == key:
+                return current.value, probes
+            current = current.next
+        return None, probes
+
+    def delete(self, key):
+        """
+        Removes a key-value pair from the hash table.
+
+        Args:
+            key: The key (product_id) to remove.
+
+        Returns:
+            bool: True if the key was found and removed, otherwise False.
+        """
+        # 1. Find the bucket list and index that hold the key
+        old_index = self._old_bucket_index(key)
+        if old_index is not None:
+            buckets, index = self._old_buckets, old_index
+        else:
+            buckets, index = self.buckets, self._hash(key)
+
+        # 2. Walk the chain, remembering the node before the current one
+        previous = None
+        current = buckets[index]
+        while current:
+            if current.key == key:
+                # 3. Unlink the node from the chain
+                if previous is None:
+                    buckets[index] = current.next
+                else:
+                    previous.next = current.next
+                self.count -= 1
+                if self.key_index is not None:
+                    self.key_index.discard(key)
+                return True
+            previous = current
+            current = current.next
+
+        # 4. The key was not in the table
+        return False
+
+    def reserve(self, expected_count):
+        """
+        Grows the table up front so 'expected_count' entries fit without
+        going over max_load_factor. Used before a bulk load.
+
+        Args:
+            expected_count (int): The total number of entries expected.
+        """
+        needed_size = int(expected_count / self.max_load_factor) + 1
+        if self.power_of_two:
+            needed_size = _round_up_power_of_two(needed_size)
+        if needed_size > self.size:
+            # We are about to fill the table anyway, so rehash in one go
+            self._start_resize(needed_size)
+            self._finish_rehash()
+
+    def insert_many(self, items, unique=False):
+        """
+        Inserts many key-value pairs in one call.
+
+        If 'items' has a length, the table is sized for all of them first so it
+        does not have to grow step by step while loading.
+
+        Args:
+            items: An iterable of (key, value) pairs.
+            unique (bool): Set to True only if the keys are known to be distinct
+                           and not already in the table. The duplicate check
+                           is then skipped and each node goes straight to the
+                           front of its chain.
+        """
+        if hasattr(items, "__len__"):
+            self.reserve(self.count + len(items))
+
+        if not unique:
+            for key, value in items:
+                self.insert(key, value)
+            return
+
+        # Fast path: no resize may be half-done while we write straight into the buckets
+        self._finish_rehash()
+        buckets = self.buckets
+        new_keys = []
+        for key, value in items:
+            new_keys.append(key)
+            index = self._hash(key)
+            new_node = Node(key, value)
+            new_node.next = buckets[index]
+            buckets[index] = new_node
+
+            self.count += 1
+            if self.count > self.max_load_factor * self.size:
+                self._start_resize(self.size * 2)
+                self._finish_rehash()
+                buckets = self.buckets
+
+        if self.key_index is not None:
+            self.key_index.add_many(new_keys)
+
+    def search_many(self, keys):
+        """
+        Looks up many keys in one call.
+
+        Args:
+            keys: An iterable of keys (product_ids).
+
+        Returns:
+            list: The value for each key (or None if missing), in the same order as 'keys'.
+        """
+        search = self.search
+        return [search(key) for key in keys]
+
+    def items(self):
+        """
+        Yields every (key, value) pair in the table, one at a time.
+        The table must not be changed while this generator is running.
+        """
+        for bucket_list in (self.buckets, self._old_buckets or []):
+            for head in bucket_list:
+                current = head
+                while current:
+                    yield current.key, current.value
+                    current = current.next
+
+    def _with_values(self, keys):
+        """Yields (key, value) pairs for keys that come from the sorted index."""
+        for key in keys:
+            yield key, self.search(key)
+
+    def range(self, low=None, high=None):
+        """
+        Yields (key, value) pairs with low <= key < high, sorted by key.
+
+        Uses the sorted index if the table was created with sorted_index=True,
+        otherwise falls back to scanning and sorting every key.
+        """
+        if self.key_index is not None:
+            return self._with_values(self.key_index.range(low, high))
+        keys = sorted(key for key in self
+                      if (low is None or key >= low) and (high is None or key < high))
+        return self._with_values(keys)
+
+    def prefix(self, prefix):
+        """
+        Yields (key, value) pairs whose key starts with 'prefix', sorted by key.
+
+        Uses the sorted index if the table was created with sorted_index=True,
+        otherwise falls back to scanning and sorting every key.
+        """
+        if self.key_index is not None:
+            return self._with_values(self.key_index.prefix(prefix))
+        return self._with_values(sorted(key for key in self if key.startswith(prefix)))
+
+    def chain_lengths(self):
+        """Yields the length of every chain (including empty ones) in the current bucket list."""
+        self._finish_rehash()
+        for head in self.buckets:
+            length = 0
+            current = head
+            while current:
+                length += 1
+                current = current.next
+            yield length
+
+    def diagnostics(self):
+        """Returns chain_length_report() for this table: chain-length histogram and collisions."""
+        report = chain_length_report(self.chain_lengths())
+        report["hash_function"] = self.hash_name
+        return report
+
+    def stats(self):
+        """
+        Reports how full the table is and how long its chains are.
+
+        Returns:
+            dict: count, bucket count, load factor, longest chain, number of
+                  resizes so far and whether a resize is still in progress.
+        """
+        longest_chain = 0
+        for bucket_list in (self.buckets, self._old_buckets or []):
+            for head in bucket_list:
+                length = 0
+                current = head
+                while current:
+                    length += 1
+                    current = current.next
+                longest_chain = max(longest_chain, length)
+
+        return {
+            "count": self.count,
+            "buckets": self.size,
+            "load_factor": self.load_factor,
+            "longest_chain": longest_chain,
+            "resize_count": self.resize_count,
+            "rehashing": self._old_buckets is not None,
+        }
+
+
+# --- Step 2b: Open-Addressing Hash Table (alternative storage engine) ---
+
+from array import array  # Compact, typed storage for the cached hash values
+
+# Markers stored in the keys list of OpenAddressingHashTable
+_EMPTY = object()  # The slot has never been used
+_TOMBSTONE = object()  # The slot held a key that was deleted
+
+
+class OpenAddressingHashTable:
+    """
+    An alternative to HashTable that uses open addressing with linear probing.
+
+    Instead of one Node object per entry, the entries live in three parallel
+    arrays (hashes, keys and values). On a collision we simply try the next
+    slot. Deleted entries are marked with a tombstone so later probes keep
+    walking past them. It offers the same insert/search API as HashTable.
+    """
+
+    def __init__(self, size, max_load_factor=0.6, verbose=True, hash_function="builtin"):
+        """
+        Initializes the hash table.
+
+        Args:
+            size (int): The minimum initial number of slots (rounded up to a power of two).
+            max_load_factor (float): Fraction of used slots (including tombstones)
+                                     above which the table is rebuilt. Must be below 1.
+            verbose (bool): Print a message when the table is created.
+            hash_function: A name from HASH_FUNCTIONS or a callable key -> int.
+        """
+        if size < 1:
+            raise ValueError("Hash table size must be at least 1.")
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1.")
+
+        self.hash_name, self.hash_function = get_hash_function(hash_function)
+
+        self.max_load_factor = max_load_factor
+        self.count = 0  # Number of live key-value pairs
+        self.resize_count = 0  # How many times the table has been rebuilt
+        self._allocate(self._round_up(size))
+
+        if verbose:
+            print(f"Open Addressing Hash Table created with {self.size} slots.")
+
+    @staticmethod
+    def _round_up(size):
+        """Rounds 'size' up to the next power of two so we can mask instead of using modulo."""
+        return _round_up_power_of_two(size)
+
+    def _hash_of(self, key):
+        """The key's hash as an unsigned 64-bit value, so it fits the 'Q' hashes array."""
+        return self.hash_function(key) & _MASK_64
+
+    def _allocate(self, capacity):
+        """Replaces the storage arrays with empty ones of the given capacity."""
+        self.size = capacity
+        self._mask = capacity - 1
+        self.hashes = array('Q', bytes(8 * capacity))  # The full hash of each key
+        self.keys = [_EMPTY] * capacity
+        self.values = [None] * capacity
+        self.tombstones = 0  # Number of slots holding _TOMBSTONE
+
+    def __len__(self):
+        """Returns the number of products stored in the table."""
+        return self.count
+
+    def __iter__(self):
+        """Yields every key in the table, one at a time (in no particular order)."""
+        for key, _ in self.items():
+            yield key
+
+    @property
+    def load_factor(self):
+        """The fraction of slots holding a live entry (count / size)."""
+        return self.count / self.size
+
+    def _find_slot(self, key, hash_value):
+        """
+        Walks the probe sequence for 'key'.
+
+        Returns:
+            tuple: (index, found). If found is True, index is the slot holding
+                   the key. Otherwise it is the slot where the key should be
+                   inserted (the first tombstone seen, or the empty slot).
+        """
+        keys = self.keys
+        hashes = self.hashes
+        mask = self._mask
+        index = hash_value & mask
+        first_tombstone = -1
+
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                # End of the probe sequence: the key is not in the table
+                if first_tombstone >= 0:
+                    return first_tombstone, False
+                return index, False
+            if slot_key is _TOMBSTONE:
+                if first_tombstone < 0:
+                    first_tombstone = index
+            elif hashes[index] == hash_value and (slot_key is key or slot_key == key):
+                return index, True
+            # Linear probing: try the next slot (wrapping around)
+            index = (index + 1) & mask
+
+    def _rebuild(self, new_capacity):
+        """Re-inserts every live entry into fresh arrays, dropping all tombstones."""
+        old_hashes, old_keys, old_values = self.hashes, self.keys, self.values
+        self._allocate(new_capacity)
+        keys, hashes, values, mask = self.keys, self.hashes, self.values, self._mask
+
+        for i, key in enumerate(old_keys):
+            if key is _EMPTY or key is _TOMBSTONE:
+                continue
+            hash_value = old_hashes[i]
+            index = hash_value & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            hashes[index] = hash_value
+            values[index] = old_values[i]
+        self.resize_count += 1
+
+    def insert(self, key, value):
+        """
+        Inserts a key-value pair, or updates the value if the key already exists.
+
+        Args:
+            key: The key (product_id).
+            value: The value (the entire Product object).
+
+        Returns:
+            int: The key's probe length: how many slots from its home slot
+                 to the one it is stored in (used by metrics.py).
+        """
+        hash_value = self._hash_of(key)
+        index, found = self._find_slot(key, hash_value)
+        # Linear probing walks slot by slot, so the distance from the home slot is the probe count
+        probes = ((index - hash_value) & self._mask) + 1
+        if found:
+            self.values[index] = value
+            return probes
+
+        if self.keys[index] is _TOMBSTONE:
+            self.tombstones -= 1
+        self.keys[index] = key
+        self.hashes[index] = hash_value
+        self.values[index] = value
+        self.count += 1
+
+        # Keep at least some empty slots so probe sequences stay short.
+        # Grow if live entries fill the table, otherwise just clear the tombstones.
+        if self.count + self.tombstones > self.max_load_factor * self.size:
+            if self.count > self.max_load_factor * self.size / 2:
+                self._rebuild(self.size * 2)
+            else:
+                self._rebuild(self.size)
+        return probes
+
+    def search(self, key):
+        """
+        Searches for a value in the hash table using its key.
+
+        Args:
+            key: The key (product_id) to search for.
+
+        Returns:
+            Product: The Product object if found, otherwise None.
+        """
+        index, found = self._find_slot(key, self._hash_of(key))
+        if found:
+            return self.values[index]
+        return None
+
+    def search_with_probes(self, key):
+        """
+        Searches like search(), also counting the slots looked at (up to and
+        including the one holding the key, or the empty slot ending a miss).
+        The instrumentation in metrics.py uses it in place of search().
+
+        Returns:
+            tuple: (the stored value or None, number of slots looked at)
+        """
+        keys = self.keys
+        hashes = self.hashes
+        mask = self._mask
+        hash_value = self._hash_of(key)
+        index = hash_value & mask
+        probes = 1
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return None, probes
+            if slot_key is not _TOMBSTONE and hashes[index] == hash_value and (slot_key is key or slot_key == key):
+                return self.values[index], probes
+            index = (index + 1) & mask
+            probes += 1
+
+    def delete(self, key):
+        """
+        Removes a key from the table by replacing it with a tombstone.
+
+        Args:
+            key: The key (product_id) to remove.
+
+        Returns:
+            bool: True if the key was found and removed, otherwise False.
+        """
+        index, found = self._find_slot(key, self._hash_of(key))
+        if not found:
+            return False
+        self.keys[index] = _TOMBSTONE
+        self.values[index] = None
+        self.count -= 1
+        self.tombstones += 1
+        return True
+
+    def reserve(self, expected_count):
+        """
+        Grows the table up front so 'expected_count' entries fit without
+        going over max_load_factor. Used before a bulk load.
+
+        Args:
+            expected_count (int): The total number of entries expected.
+        """
+        needed_size = self._round_up(int(expected_count / self.max_load_factor) + 1)
+        if needed_size > self.size:
+            self._rebuild(needed_size)
+
+    def insert_many(self, items, unique=False):
+        """
+        Inserts many key-value pairs in one call.
+
+        If 'items' has a length, the table is sized for all of them first so it
+        does not have to be rebuilt while loading.
+
+        Args:
+            items: An iterable of (key, value) pairs.
+            unique (bool): Set to True only if the keys are known to be distinct
+                           and not already in the table. Each key then goes
+                           into the first free slot without comparing keys.
+        """
+        if hasattr(items, "__len__"):
+            self.reserve(self.count + len(items))
+
+        if not unique:
+            for key, value in items:
+                self.insert(key, value)
+            return
+
+        for key, value in items:
+            hash_value = self._hash_of(key)
+            keys = self.keys
+            mask = self._mask
+            index = hash_value & mask
+            # Any empty slot or tombstone will do, since the key cannot be present
+            while keys[index] is not _EMPTY and keys[index] is not _TOMBSTONE:
+                index = (index + 1) & mask
+
+            if keys[index] is _TOMBSTONE:
+                self.tombstones -= 1
+            keys[index] = key
+            self.hashes[index] = hash_value
+            self.values[index] = value
+            self.count += 1
+
+            if self.count + self.tombstones > self.max_load_factor * self.size:
+                self._rebuild(self.size * 2)
+
+    def search_many(self, keys):
+        """
+        Looks up many keys in one call.
+
+        Args:
+            keys: An iterable of keys (product_ids).
+
+        Returns:
+            list: The value for each key (or None if missing), in the same order as 'keys'.
+        """
+        search = self.search
+        return [search(key) for key in keys]
+
+    def items(self):
+        """
+        Yields every (key, value) pair in the table, one at a time.
+        The table must not be changed while this generator is running.
+        """
+        values = self.values
+        for index, key in enumerate(self.keys):
+            if key is not _EMPTY and key is not _TOMBSTONE:
+                yield key, values[index]
+
+    def stats(self):
+        """
+        Reports how full the table is and how long its probe sequences are.
+
+        Returns:
+            dict: count, slot count, load factor, tombstones, longest probe
+                  sequence and number of rebuilds so far.
+        """
+        longest_probe = 0
+        mask = self._mask
+        for index, key in enumerate(self.keys):
+            if key is _EMPTY or key is _TOMBSTONE:
+                continue
+            # Distance from the slot the key hashed to, plus the slot itself
+            probe_length = ((index - self.hashes[index]) & mask) + 1
+            longest_probe = max(longest_probe, probe_length)
+
+        return {
+            "count": self.count,
+            "buckets": self.size,
+            "load_factor": self.load_factor,
+            "tombstones": self.tombstones,
+            "longest_probe": longest_probe,
+            "resize_count": self.resize_count,
+        }
+
+
+# The storage engines that can sit behind the insert/search API
+BACKENDS = {
+    "chaining": HashTable,
+    "open_addressing": OpenAddressingHashTable,
+}
+
+
+# --- Step 2c: Columnar Product Storage ---
+
+import operator  # operator.mul lets sum() multiply the columns without a Python loop
+
+
+class ProductTable:
+    """
+    A compact, column-oriented store for many products.
+
+    Instead of one Product object per SKU, each field is kept in its own
+    column: prices in an array('d') and quantities in an array('q'), with
+    product_ids and names in plain lists. Row i of every column belongs to
+    the same product. A hash table maps each product_id to its row index.
+
+    Whole-inventory questions (total stock value, what needs reordering)
+    then run over contiguous typed arrays.
+    """
+
+    def __init__(self, index_class=HashTable):
+        """
+        Initializes an empty product table.
+
+        Args:
+            index_class: The hash table class used for the product_id -> row index.
+        """
+        self.product_ids = []
+        self.names = []
+        self.prices = array('d')
+        self.quantities = array('q')
+        self.index = index_class(8, verbose=False)
+
+    def __len__(self):
+        """Returns the number of products stored."""
+        return len(self.product_ids)
+
+    def add(self, product_id, name, price, quantity):
+        """
+        Adds a product, or overwrites its fields if the product_id already exists.
+
+        Returns:
+            int: The row index of the product.
+        """
+        row = self.index.search(product_id)
+        if row is not None:
+            self.names[row] = name
+            self.prices[row] = price
+            self.quantities[row] = quantity
+            return row
+
+        row = len(self.product_ids)
+        self.product_ids.append(product_id)
+        self.names.append(name)
+        self.prices.append(price)
+        self.quantities.append(quantity)
+        self.index.insert(product_id, row)
+        return row
+
+    def add_product(self, product):
+        """Adds a Product object. Returns its row index."""
+        return self.add(product.product_id, product.name, product.price, product.quantity)
+
+    def row_of(self, product_id):
+        """Returns the row index of a product_id, or None if it is not stored."""
+        return self.index.search(product_id)
+
+    def search(self, product_id):
+        """
+        Searches for a product using its product_id.
+
+        Returns:
+            Product: A Product built from the row if found, otherwise None.
+        """
+        row = self.index.search(product_id)
+        if row is None:
+            return None
+        return Product(self.product_ids[row], self.names[row],
+                       self.prices[row], self.quantities[row])
+
+    def set_quantity(self, product_id, quantity):
+        """
+        Sets the stock level of a product.
+
+        Returns:
+            bool: True if the product exists, otherwise False.
+        """
+        row = self.index.search(product_id)
+        if row is None:
+            return False
+        self.quantities[row] = quantity
+        return True
+
+    def total_stock_value(self):
+        """Returns the sum of price * quantity over every product."""
+        return sum(map(operator.mul, self.prices, self.quantities))
+
+    def below_reorder_level(self, threshold):
+        """
+        Finds the products that need reordering.
+
+        Args:
+            threshold (int): Products with quantity below this are returned.
+
+        Returns:
+            list: The product_ids with quantity < threshold, in row order.
+        """
+        product_ids = self.product_ids
+        return [product_ids[row] for row, quantity in enumerate(self.quantities)
+                if quantity < threshold]
+
+
+# --- Step 2d: Thread-Safe Hash Table with Striped Locks ---
+
+import threading  # Locks for the concurrent hash table
+
+
+class ConcurrentHashTable:
+    """
+    A separate-chaining hash table that many threads can use at once.
+
+    Writers use lock striping: key k is guarded by lock hash(k) % num_stripes,
+    so writers to different stripes do not block each other. The bucket
+    count is always a multiple of the stripe count, which means a bucket is
+    guarded by the same lock whatever size the table grows to.
+
+    search() takes no lock at all. New nodes are fully built before they are
+    linked in, and a resize builds a new bucket list from copied nodes before
+    swapping it in, so a reader always walks a consistent chain.
+
+    The values are expected to be Product objects for update_quantity() and
+    decrement_if_available().
+
+    It takes the same size / verbose / hash_function arguments as the other
+    tables, so it can be used wherever they are (e.g. ProductTable's index).
+    """
+
+    def __init__(self, size=64, num_stripes=16, max_load_factor=0.75, verbose=False,
+                 hash_function="builtin"):
+        """
+        Initializes the hash table.
+
+        Args:
+            size (int): The minimum initial number of buckets.
+            num_stripes (int): The number of locks (rounded up to a power of two).
+            max_load_factor (float): The load factor above which the table doubles in size.
+            verbose (bool): Accepted for compatibility with the other tables; nothing is printed.
+            hash_function: A name from HASH_FUNCTIONS or a callable key -> int.
+        """
+        self.hash_name, self.hash_function = get_hash_function(hash_function)
+        self.num_stripes = OpenAddressingHashTable._round_up(max(1, num_stripes))
+        self.max_load_factor = max_load_factor
+        self.locks = [threading.Lock() for _ in range(self.num_stripes)]
+        # Per-stripe entry counts, so inserts on different stripes never share a counter
+        self._counts = [0] * self.num_stripes
+        self.resize_count = 0
+
+        size = OpenAddressingHashTable._round_up(max(size, self.num_stripes))
+        self.buckets = [None] * size
+
+    def __len__(self):
+        """Returns the number of entries stored."""
+        return sum(self._counts)
+
+    @property
+    def size(self):
+        """The current number of buckets."""
+        return len(self.buckets)
+
+    def _find_node(self, buckets, key, hash_value):
+        """Returns the Node holding 'key' in 'buckets', or None."""
+        current = buckets[hash_value & (len(buckets) - 1)]
+        while current:
+            if current.key == key:
+                return current
+            current = current.next
+        return None
+
+    def search(self, key):
+        """
+        Searches for a value without taking any lock.
+
+        Args:
+            key: The key (product_id) to search for.
+
+        Returns:
+            The stored value if found, otherwise None.
+        """
+        node = self._find_node(self.buckets, key, self.hash_function(key))
+        if node is None:
+            return None
+        return node.value
+
+    def insert(self, key, value):
+        """
+        Inserts a key-value pair, or replaces the value if the key already exists.
+
+        Args:
+            key: The key (product_id).
+            value: The value (the entire Product object).
+        """
+        hash_value = self.hash_function(key)
+        stripe = hash_value & (self.num_stripes - 1)
+        with self.locks[stripe]:
+            # Read the bucket list only once we hold the lock: a resize needs every lock
+            buckets = self.buckets
+            node = self._find_node(buckets, key, hash_value)
+            if node is not None:
+                node.value = value
+                return
+            new_node = Node(key, value)
+            index = hash_value & (len(buckets) - 1)
+            new_node.next = buckets[index]
+            buckets[index] = new_node  # Publish the fully built node in one step
+            self._counts[stripe] += 1
+
+        if len(self) > self.max_load_factor * len(self.buckets):
+            self._resize()
+
+    def search_many(self, keys):
+        """Looks up many keys without locking. Returns their values (None if missing) in order."""
+        search = self.search
+        return [search(key) for key in keys]
+
+    def insert_many(self, items):
+        """Inserts many (key, value) pairs, taking each key's stripe lock in turn."""
+        insert = self.insert
+        for key, value in items:
+            insert(key, value)
+
+    def delete(self, key):
+        """
+        Removes a key from the table.
+
+        Returns:
+            bool: True if the key was found and removed, otherwise False.
+        """
+        hash_value = self.hash_function(key)
+        stripe = hash_value & (self.num_stripes - 1)
+        with self.locks[stripe]:
+            buckets = self.buckets
+            index = hash_value & (len(buckets) - 1)
+            previous = None
+            current = buckets[index]
+            while current:
+                if current.key == key:
+                    # Unlinking leaves current.next intact, so a reader standing
+                    # on the removed node can still finish walking the chain
+                    if previous is None:
+                        buckets[index] = current.next
+                    else:
+                        previous.next = current.next
+                    self._counts[stripe] -= 1
+                    return True
+                previous = current
+                current = current.next
+        return False
+
+    def update_quantity(self, key, delta):
+        """
+        Atomically adds 'delta' to a product's quantity.
+
+        Returns:
+            int: The new quantity, or None if the product does not exist.
+        """
+        hash_value = self.hash_function(key)
+        with self.locks[hash_value & (self.num_stripes - 1)]:
+            node = self._find_node(self.buckets, key, hash_value)
+            if node is None:
+                return None
+            node.value.quantity += delta
+            return node.value.quantity
+
+    def decrement_if_available(self, key, amount=1):
+        """
+        Atomically takes 'amount' units out of stock if that many are available.
+
+        Returns:
+            bool: True if the stock was reduced, False if the product is
+                  missing or there was not enough stock.
+        """
+        hash_value = self.hash_function(key)
+        with self.locks[hash_value & (self.num_stripes - 1)]:
+            node = self._find_node(self.buckets, key, hash_value)
+            if node is None or node.value.quantity < amount:
+                return False
+            node.value.quantity -= amount
+            return True
+
+    def _resize(self):
+        """Doubles the bucket count while holding every stripe lock."""
+        # Always take the locks in the same order so two resizes cannot deadlock
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            old_buckets = self.buckets
+            # Another thread may have resized while we waited for the locks
+            if sum(self._counts) <= self.max_load_factor * len(old_buckets):
+                return
+
+            new_buckets = [None] * (len(old_buckets) * 2)
+            mask = len(new_buckets) - 1
+            hash_function = self.hash_function
+            for head in old_buckets:
+                current = head
+                while current:
+                    # Copy the node: lock-free readers may still be walking the old chains
+                    new_node = Node(current.key, current.value)
+                    index = hash_function(current.key) & mask
+                    new_node.next = new_buckets[index]
+                    new_buckets[index] = new_node
+                    current = current.next
+            self.buckets = new_buckets
+            self.resize_count += 1
+        finally:
+            for lock in self.locks:
+                lock.release()
+
+    def items(self):
+        """Yields every (key, value) pair, walking the bucket list current at the start."""
+        for head in self.buckets:
+            current = head
+            while current:
+                yield current.key, current.value
+                current = current.next
+
+    def stats(self):
+        """
+        Reports the table's size and lock layout.
+
+        Returns:
+            dict: count, bucket count, load factor, stripe count and number of resizes.
+        """
+        count = len(self)
+        return {
+            "count": count,
+            "buckets": len(self.buckets),
+            "load_factor": count / len(self.buckets),
+            "stripes": self.num_stripes,
+            "resize_count": self.resize_count,
+        }
+
 
 # --- Step 4: Performance Comparison (Q1.4) ---
 
-import time  # To measure execution time in nanoseconds
-import random  # To generate random data
-import string  # To help create random strings
+import tracemalloc  # To measure how much memory each storage engine allocates
 
 
 def search_array(array, key):
@@ -170,102 +1337,225 @@ def search_array(array, key):
     return None
 
 
+def compare_backends(product_data, table_size):
+    """
+    Compares the storage engines in BACKENDS (chaining vs open addressing).
+
+    For each engine it measures the memory allocated while loading every
+    product, and the median time of a lookup over all product IDs (timed
+    by benchmark.run_case(), like every other benchmark).
+
+    Args:
+        product_data (list): The Product objects to load.
+        table_size (int): The starting size of each table.
+
+    Returns:
+        dict: backend name -> {"memory_bytes": int, "lookup_ns": float}
+    """
+    # Imported here because benchmark_cases imports this module
+    from benchmark import Case, per_item, run_case
+
+    results = {}
+    keys = [product.product_id for product in product_data]
+
+    def search_all(table):
+        search = table.search
+        for key in keys:
+            search(key)
+
+    for name, table_class in BACKENDS.items():
+        # Memory: count only what the table allocates, not the Products themselves
+        tracemalloc.start()
+        table = table_class(table_size, verbose=False)
+        for product in product_data:
+            table.insert(product.product_id, product)
+        memory_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # Latency: look every key up once per call
+        case = Case(f"inventory.{name}.search_all", search_all, lambda table=table: table, "inventory")
+        result = run_case(case, samples=10, warmup=1, max_time_s=0.5, track_memory=False)
+        lookup_ns = per_item(result["stats"], len(keys))["median"]
+
+        results[name] = {"memory_bytes": memory_bytes, "lookup_ns": lookup_ns}
+        print(f"  {name:<16} memory: {memory_bytes / 1024:8.1f} KiB   "
+              f"median lookup: {lookup_ns:7.1f} ns")
+
+    return results
+
+
+def chain_length_report(chain_lengths):
+    """
+    Summarizes how evenly keys are spread over buckets.
+
+    Args:
+        chain_lengths: The number of keys in each bucket (one entry per bucket).
+
+    Returns:
+        dict: keys, buckets, empty buckets, collisions (keys that did not get
+              a bucket to themselves), longest chain and a histogram
+              {chain length: number of buckets}.
+    """
+    histogram = {}
+    keys = 0
+    buckets = 0
+    for length in chain_lengths:
+        histogram[length] = histogram.get(length, 0) + 1
+        keys += length
+        buckets += 1
+    used_buckets = buckets - histogram.get(0, 0)
+    return {
+        "keys": keys,
+        "buckets": buckets,
+        "empty_buckets": histogram.get(0, 0),
+        "collisions": keys - used_buckets,
+        "longest_chain": max(histogram) if histogram else 0,
+        "histogram": dict(sorted(histogram.items())),
+    }
+
+
+def hash_distribution_report(keys, bucket_count, hash_names=None, power_of_two=False):
+    """
+    Compares how well each hash function spreads 'keys' over 'bucket_count' buckets.
+
+    Args:
+        keys (list): Sample keys, e.g. real product_ids.
+        bucket_count (int): Number of buckets to hash into.
+        hash_names (list): Names from HASH_FUNCTIONS (defaults to all of them).
+        power_of_two (bool): Round bucket_count up to a power of two and use masking.
+
+    Returns:
+        dict: hash name -> chain_length_report() of the resulting buckets.
+    """
+    if power_of_two:
+        bucket_count = _round_up_power_of_two(bucket_count)
+    report = {}
+    for name in hash_names or HASH_FUNCTIONS:
+        hash_function = HASH_FUNCTIONS[name]
+        counts = [0] * bucket_count
+        for key in keys:
+            hash_value = hash_function(key)
+            index = hash_value & (bucket_count - 1) if power_of_two else hash_value % bucket_count
+            counts[index] += 1
+        report[name] = chain_length_report(counts)
+    return report
+
+
+def print_hash_report(report):
+    """Prints the result of hash_distribution_report() as a table."""
+    print(f"{'hash':<10} {'buckets':>8} {'empty':>8} {'collisions':>11} {'longest':>8}  histogram")
+    for name, result in report.items():
+        histogram = ", ".join(f"{length}:{count}" for length, count in result["histogram"].items())
+        print(f"{name:<10} {result['buckets']:>8} {result['empty_buckets']:>8} "
+              f"{result['collisions']:>11} {result['longest_chain']:>8}  {histogram}")
+
+
 def run_performance_test():
     """
     Runs the performance comparison between HashTable and Array search.
     This function will be called from our main menu.
-    """
-    print("\n--- Running Performance Comparison ---")
-
-    NUM_PRODUCTS = 5000  # You can change this number (e.g., 1000, 5000)
-    TABLE_SIZE = 100  # Size of the hash table (to ensure collisions)
 
-    product_data = []  # To hold our generated product objects
+    The timings come from the shared benchmark suite (the "inventory.*"
+    cases in benchmark_cases.py, run by benchmark.py), so they match what
+    `python benchmark.py --filter "inventory.*"` reports.
+    """
+    # Imported here because benchmark_cases imports this module
+    from benchmark import per_item, run_named
+    from benchmark_cases import LOOKUPS, inventory_catalog
 
-    # 1. Generate a large set of test data
-    print(f"Generating {NUM_PRODUCTS} product records...")
-    for i in range(NUM_PRODUCTS):
-        # Create a random product ID (e.g., "P_aB1xY")
-        rand_id = "P_" + ''.join(random.choices(string.ascii_letters + string.digits, k=5))
+    print("\n--- Running Performance Comparison ---")
 
-        # Create the product
-        product = Product(
-            product_id=rand_id,
-            name="Test Product",
-            price=10.0,
-            quantity=1
-        )
-        product_data.append(product)
+    TABLE_SIZE = 100  # Starting size of the hash table (it grows as products are added)
 
-    # We will search for the VERY LAST item added.
-    # This is the "worst-case" scenario for the array search.
-    search_key = product_data[-1].product_id
-    print(f"Test complete. Will search for key: {search_key}\n")
+    # 1. The benchmark suite's test data: random product IDs like "P_aB1xY"
+    product_data = inventory_catalog()
+    print(f"Using {len(product_data)} product records; "
+          f"lookups are a mix of {LOOKUPS} existing and missing IDs.\n")
 
     # --- 2. Test Hash Table Performance ---
     print("Testing Hash Table...")
-    hash_table = HashTable(size=TABLE_SIZE)
+    hash_table = HashTable(size=TABLE_SIZE, verbose=False)
 
     # Populate the hash table
     for product in product_data:
         hash_table.insert(product.product_id, product)
 
-    # Time the search
-    ht_start_time = time.time_ns()
-    hash_table.search(search_key)
-    ht_end_time = time.time_ns()
+    stats = hash_table.stats()
+    print(f"Table grew to {stats['buckets']} buckets after {stats['resize_count']} resizes "
+          f"(load factor {stats['load_factor']:.2f}, longest chain {stats['longest_chain']}).")
 
-    ht_duration = ht_end_time - ht_start_time
-    print(f"Hash Table Search Time: {ht_duration} nanoseconds")
+    # Time the search: warmup, calibrated samples, high-resolution clock
+    ht_result = run_named(f"inventory.chaining.search_x{LOOKUPS}", samples=20, max_time_s=1.0,
+                          track_memory=False)
+    ht_stats = per_item(ht_result["stats"], ht_result["params"]["operations"])
+    ht_duration = ht_stats["median"]
+    print(f"Hash Table Search Time: {ht_duration:.1f} nanoseconds "
+          f"(median, p95 {ht_stats['p95']:.1f}, p99 {ht_stats['p99']:.1f})")
 
-    # --- 3. Test Array (List) Performance ---
-    print("\nTesting 1D Array (List)...")
-    array_storage = []
-
-    # Populate the array
-    for product in product_data:
-        array_storage.append(product)
+    # --- 2b. Compare the two hash table storage engines ---
+    print("\nComparing Hash Table storage engines (chaining vs open addressing)...")
+    compare_backends(product_data, TABLE_SIZE)
 
-    # Time the search
-    arr_start_time = time.time_ns()
-    search_array(array_storage, search_key)
-    arr_end_time = time.time_ns()
+    # --- 2c. How evenly does each hash function spread our product IDs? ---
+    # Use the bucket count the table grew to, which is what lookups actually see
+    bucket_count = hash_table.stats()["buckets"]
+    print(f"\nHash function distribution over {bucket_count} buckets:")
+    print_hash_report(hash_distribution_report([p.product_id for p in product_data], bucket_count))
 
-    arr_duration = arr_end_time - arr_start_time
-    print(f"Array Search Time: {arr_duration} nanoseconds")
+    # --- 3. Test Array (List) Performance ---
+    print("\nTesting 1D Array (List)...")
+    arr_result = run_named("inventory.array.search_x10", samples=10, max_time_s=1.0,
+                           track_memory=False)
+    arr_stats = per_item(arr_result["stats"], arr_result["params"]["operations"])
+    arr_duration = arr_stats["median"]
+    print(f"Array Search Time: {arr_duration:.1f} nanoseconds "
+          f"(median, p95 {arr_stats['p95']:.1f}, p99 {arr_stats['p99']:.1f})")
 
     # --- 4. Print Analysis ---
     print("\n--- Analysis ---")
-    print(f"Hash Table was {arr_duration / ht_duration:.2f} times faster.")
+    if ht_duration > 0:
+        print(f"Hash Table was {arr_duration / ht_duration:.2f} times faster.")
+    else:
+        print("Hash Table search was too fast to measure.")
+    print("For every registered benchmark, run: python benchmark.py --help")
 
 # --- Step 3: Build the Inventory System (Q1.2 & Q1.3) ---
 
-def main():
+def main(data_dir="inventory_data"):
     """
     The main function to run the Baby Shop Inventory System.
+
+    Args:
+        data_dir (str): Where changes are logged so they survive a restart
+                        (see inventory_wal.py).
     """
 
     # 1. Initialize the storage system
-    # We choose a size for the hash table. 10 is good for this example.
-    # Now this will correctly find the 'HashTable' class
-    inventory = HashTable(size=10)
-
-    # 2. Insert pre-defined records (as required by Q1.2)
-    print("\n--- Pre-populating inventory ---")
-
-    # Create some Product objects
-    p1 = Product(product_id="D101", name="Premium Diapers (Size 3)", price=29.99, quantity=100)
-    p2 = Product(product_id="F202", name="Organic Baby Formula", price=35.50, quantity=50)
-    p3 = Product(product_id="W303", name="Sensitive Baby Wipes (Pack of 5)", price=14.99, quantity=200)
-    p4 = Product(product_id="T404", name="Giraffe Teether Toy", price=8.99, quantity=75)
-
-    # Insert them into the hash table
-    inventory.insert(p1.product_id, p1)
-    inventory.insert(p2.product_id, p2)
-    inventory.insert(p3.product_id, p3)
-    inventory.insert(p4.product_id, p4)
-
-    print("Pre-population complete.\n")
+    # The table lives inside a DurableInventory, which writes every change to
+    # a write-ahead log in 'data_dir' and recovers the last state on startup.
+    # Imported here because inventory_wal imports this module
+    from inventory_wal import DurableInventory
+    store = DurableInventory(data_dir, HashTable(size=10, verbose=False, sorted_index=True))
+    inventory = store.table
+
+    # 2. Insert pre-defined records (as required by Q1.2), only on the first run
+    if len(store) == 0:
+        print("\n--- Pre-populating inventory ---")
+
+        # Create some Product objects
+        p1 = Product(product_id="D101", name="Premium Diapers (Size 3)", price=29.99, quantity=100)
+        p2 = Product(product_id="F202", name="Organic Baby Formula", price=35.50, quantity=50)
+        p3 = Product(product_id="W303", name="Sensitive Baby Wipes (Pack of 5)", price=14.99, quantity=200)
+        p4 = Product(product_id="T404", name="Giraffe Teether Toy", price=8.99, quantity=75)
+
+        # Insert them in one batch, so they share a single log sync
+        with store.batch():
+            for p in (p1, p2, p3, p4):
+                store.insert(p.product_id, p)
+
+        print("Pre-population complete.\n")
+    else:
+        print(f"\nRecovered {len(store)} products from '{data_dir}'.\n")
 
     # 3. Create the command-line menu (as required by Q1.3)
     while True:
@@ -275,8 +1565,12 @@ def main():
         print("1. Add New Product (Insert)")
         print("2. Search for Product")
         print("3. Run Performance Test (Q1.4)")
-        print("4. Exit")
-        choice = input("Enter your choice (1-4): ")
+        print("4. Save Inventory to File")
+        print("5. Load Inventory from File")
+        print("6. Delete Product")
+        print("7. List Products by ID Prefix")
+        print("8. Exit")
+        choice = input("Enter your choice (1-8): ")
 
         if choice == '1':
             # --- INSERT Function ---
@@ -291,8 +1585,8 @@ def main():
                 # Create the new product object
                 new_product = Product(p_id, p_name, p_price, p_quantity)
 
-                # Insert it into the hash table
-                inventory.insert(new_product.product_id, new_product)
+                # Insert it into the hash table (and the log)
+                store.insert(new_product.product_id, new_product)
 
                 print(f"\nSUCCESS: Product '{new_product.name}' added to inventory.")
 
@@ -320,12 +1614,60 @@ def main():
             run_performance_test()
 
         elif choice == '4':
-            # --- EXIT (changed to '4') ---
+            # --- SAVE Function ---
+            # Imported here because inventory_storage imports this module
+            from inventory_storage import save_inventory
+            path = input("Enter file name to save to: ")
+            try:
+                saved = save_inventory(inventory, path)
+                print(f"\nSUCCESS: Saved {saved} products to '{path}'.")
+            except OSError as e:
+                print(f"\nERROR: Could not save inventory: {e}")
+
+        elif choice == '5':
+            # --- LOAD Function ---
+            from inventory_storage import load_inventory
+            path = input("Enter file name to load from: ")
+            try:
+                loaded = load_inventory(path, HashTable(size=10, verbose=False))
+                # Replace the current products, logging every change in one batch
+                with store.batch():
+                    for key in [key for key, _ in inventory.items() if loaded.search(key) is None]:
+                        store.delete(key)
+                    for key, product in loaded.items():
+                        store.insert(key, product)
+                print(f"\nSUCCESS: Loaded {len(inventory)} products from '{path}'.")
+            except (OSError, ValueError) as e:
+                print(f"\nERROR: Could not load inventory: {e}")
+
+        elif choice == '6':
+            # --- DELETE Function ---
+            print("\n--- Delete Product ---")
+            key_to_delete = input("Enter the Product ID to delete: ")
+            if store.delete(key_to_delete):
+                print(f"\nSUCCESS: Product '{key_to_delete}' removed from inventory.")
+            else:
+                print(f"\nNo product with ID '{key_to_delete}' exists in the inventory.")
+
+        elif choice == '7':
+            # --- PREFIX LISTING (uses the sorted product_id index) ---
+            print("\n--- List Products by ID Prefix ---")
+            prefix = input("Enter the start of the Product ID (e.g. D1), or leave blank for all: ")
+            found_any = False
+            for _, product in inventory.prefix(prefix):
+                print(product)
+                found_any = True
+            if not found_any:
+                print(f"No product IDs start with '{prefix}'.")
+
+        elif choice == '8':
+            # --- EXIT (changed to '8') ---
+            store.close()
             print("\nExiting inventory system. Goodbye!")
             break
 
         else:
-            print("\nInvalid choice. Please enter 1, 2, or 3.")
+            print("\nInvalid choice. Please enter 1-8.")
 
         input("\nPress Enter to continue...")  # Pause screen
 
@@ -0,0 +1,178 @@
+import argparse  # Command-line options for the benchmark suite
+import json  # To save results so runs can be compared across versions
+import random  # To generate the test catalog and lookup keys
+import string  # Characters for random product IDs
+
+from benchmark import Case, environment, per_item, percentile, run_case, summarize  # noqa: F401
+from inventory import (BACKENDS, HASH_FUNCTIONS, Product, hash_distribution_report,
+                       print_hash_report, search_array)
+
+# --- Step 1: Timing and Statistics Helpers ---
+#
+# Timing is done by benchmark.py, the shared benchmark framework:
+# run_case() does the warmup, picks how many calls go in one sample and
+# summarizes the samples. percentile() and summarize() are imported above
+# so older callers keep working.
+
+# --- Step 2: Test Data ---
+
+def make_catalog(catalog_size, rng):
+    """Generates 'catalog_size' Products with unique random IDs like "P_aB1xY"."""
+    alphabet = string.ascii_letters + string.digits
+    seen = set()
+    catalog = []
+    while len(catalog) < catalog_size:
+        product_id = "P_" + "".join(rng.choices(alphabet, k=7))
+        if product_id in seen:
+            continue
+        seen.add(product_id)
+        catalog.append(Product(product_id, "Test Product", 10.0, 1))
+    return catalog
+
+
+def make_lookup_keys(catalog, count, hit_ratio, rng):
+    """
+    Builds a list of keys to look up, where about 'hit_ratio' of them exist
+    in the catalog and the rest are misses.
+    """
+    keys = []
+    for _ in range(count):
+        if rng.random() < hit_ratio:
+            keys.append(rng.choice(catalog).product_id)
+        else:
+            keys.append("MISS_" + "".join(rng.choices(string.digits, k=8)))
+    return keys
+
+
+# --- Step 3: The Benchmark Suite ---
+
+def run_benchmarks(catalog_size=10000, table_size=100, hit_ratio=0.9, repetitions=200,
+                   warmup=20, batch_size=1000, array_batch_size=10, seed=42,
+                   hash_function="builtin"):
+    """
+    Benchmarks insert and search for every hash table backend, and search
+    for the plain list (1D array) as a baseline.
+
+    Args:
+        catalog_size (int): Number of products in the catalog.
+        table_size (int): Starting size of each hash table.
+        hit_ratio (float): Fraction of lookups for keys that exist.
+        repetitions (int): Timed samples per search (builds take a twentieth of
+            that, at least 3). Every sample is taken, however long it runs.
+        warmup (int): Untimed calls per operation.
+        batch_size (int): Lookups per timed call for the hash tables.
+        array_batch_size (int): Lookups per timed call for the list (it is much slower).
+        seed (int): Random seed, so runs use the same data.
+        hash_function (str): The name of the hash function the tables use.
+
+    Returns:
+        dict: "params", "environment" and "results"
+              (structure name -> operation name -> summary in ns per op).
+    """
+    rng = random.Random(seed)
+    catalog = make_catalog(catalog_size, rng)
+    lookup_keys = make_lookup_keys(catalog, batch_size, hit_ratio, rng)
+    items = [(product.product_id, product) for product in catalog]
+    # The caller asked for a sample count, so run_case() must not cut it short
+    options = {"samples": repetitions, "warmup": warmup, "max_time_s": None, "track_memory": False}
+    results = {}
+
+    def search_all(state):
+        search, keys = state
+        for key in keys:
+            search(key)
+
+    for name, table_class in BACKENDS.items():
+        def new_table(table_class=table_class):
+            return table_class(table_size, verbose=False, hash_function=hash_function)
+
+        def build(_, new_table=new_table):
+            table = new_table()
+            for key, value in items:
+                table.insert(key, value)
+
+        def search_setup(new_table=new_table):
+            table = new_table()
+            for key, value in items:
+                table.insert(key, value)
+            return table.search, lookup_keys
+
+        # A full build is expensive, so it gets fewer samples and warmups than search
+        build_result = run_case(Case(f"inventory.{name}.build", build),
+                                **{**options, "samples": max(3, repetitions // 20), "warmup": 1})
+        search_result = run_case(Case(f"inventory.{name}.search", search_all, search_setup), **options)
+        results[name] = {
+            "insert": per_item(build_result["stats"], catalog_size),
+            "search": per_item(search_result["stats"], len(lookup_keys)),
+        }
+
+    array_keys = lookup_keys[:array_batch_size]
+    array_storage = list(catalog)
+    array_result = run_case(Case("inventory.array.search", search_all,
+                                 lambda: (lambda key: search_array(array_storage, key), array_keys)),
+                            **options)
+    results["array"] = {"search": per_item(array_result["stats"], len(array_keys))}
+
+    return {
+        "params": {
+            "catalog_size": catalog_size,
+            "table_size": table_size,
+            "hit_ratio": hit_ratio,
+            "repetitions": repetitions,
+            "warmup": warmup,
+            "batch_size": batch_size,
+            "array_batch_size": array_batch_size,
+            "seed": seed,
+            "hash_function": hash_function,
+        },
+        "environment": environment(),
+        "results": results,
+    }
+
+
+def print_report(report):
+    """Prints the results of run_benchmarks() as a table."""
+    print(f"\n{'structure':<16} {'operation':<10} {'mean':>10} {'median':>10} "
+          f"{'p95':>10} {'p99':>10}   (ns per op)")
+    for structure, operations in report["results"].items():
+        for operation, summary in operations.items():
+            print(f"{structure:<16} {operation:<10} {summary['mean']:>10.1f} {summary['median']:>10.1f} "
+                  f"{summary['p95']:>10.1f} {summary['p99']:>10.1f}")
+
+
+def main():
+    """Runs the suite from the command line and optionally saves the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the inventory data structures.")
+    parser.add_argument("--catalog-size", type=int, default=10000)
+    parser.add_argument("--table-size", type=int, default=100)
+    parser.add_argument("--hit-ratio", type=float, default=0.9)
+    parser.add_argument("--repetitions", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--hash", default="builtin", choices=list(HASH_FUNCTIONS),
+                        help="Hash function used by the hash tables.")
+    parser.add_argument("--hash-report", action="store_true",
+                        help="Also print how evenly each hash function spreads the catalog.")
+    parser.add_argument("--json", metavar="PATH", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    report = run_benchmarks(catalog_size=args.catalog_size, table_size=args.table_size,
+                            hit_ratio=args.hit_ratio, repetitions=args.repetitions,
+                            warmup=args.warmup, batch_size=args.batch_size, seed=args.seed,
+                            hash_function=args.hash)
+    print_report(report)
+
+    if args.hash_report:
+        catalog = make_catalog(args.catalog_size, random.Random(args.seed))
+        print(f"\nHash function distribution over {args.table_size} buckets:")
+        print_hash_report(hash_distribution_report([p.product_id for p in catalog], args.table_size))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import bisect  # Binary search over the sorted price list
+import heapq  # Min-heap for the low-stock index
+import re  # To split product names into search tokens
+
+from inventory import HashTable
+
+# --- Step 1: The Secondary Index Interface ---
+
+class SecondaryIndex:
+    """
+    Base class for an index kept next to the main product_id hash table.
+
+    IndexedInventory calls add() when a product is stored, remove() when it
+    is deleted or replaced, and quantity_changed() after its stock level
+    changes. Subclasses only override what they need.
+    """
+
+    def add(self, product):
+        """Called after 'product' has been stored."""
+
+    def remove(self, product):
+        """Called before 'product' is deleted or replaced."""
+
+    def quantity_changed(self, product, old_quantity):
+        """Called after product.quantity changed from 'old_quantity'."""
+
+
+# --- Step 2: The Index Types ---
+
+def tokenize(text):
+    """Splits text into lower-case words, e.g. "Baby Wipes (Pack of 5)" -> ['baby', 'wipes', 'pack', 'of', '5']."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class NameIndex(SecondaryIndex):
+    """
+    An inverted index from each word in Product.name to the product_ids
+    whose name contains it, for keyword search.
+    """
+
+    def __init__(self):
+        self.postings = {}  # token -> set of product_ids
+
+    def add(self, product):
+        for token in set(tokenize(product.name)):
+            self.postings.setdefault(token, set()).add(product.product_id)
+
+    def remove(self, product):
+        for token in set(tokenize(product.name)):
+            product_ids = self.postings.get(token)
+            if product_ids is not None:
+                product_ids.discard(product.product_id)
+                if not product_ids:
+                    del self.postings[token]
+
+    def matches(self, query):
+        """
+        Like search(), but for a one-word query returns the index's own set
+        without copying it. The caller must not modify the result.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return set()
+        # Intersect starting from the rarest word so the sets stay small
+        posting_sets = sorted((self.postings.get(token, set()) for token in set(tokens)), key=len)
+        if len(posting_sets) == 1:
+            return posting_sets[0]
+        return set.intersection(*posting_sets)
+
+    def search(self, query):
+        """
+        Finds the products whose name contains every word in 'query'.
+
+        Returns:
+            set: The matching product_ids.
+        """
+        return set(self.matches(query))
+
+
+class PriceIndex(SecondaryIndex):
+    """
+    A sorted list of (price, product_id) pairs for price-band queries and
+    "N cheapest" lookups.
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, product):
+        bisect.insort(self.entries, (product.price, product.product_id))
+
+    def remove(self, product):
+        entry = (product.price, product.product_id)
+        index = bisect.bisect_left(self.entries, entry)
+        if index < len(self.entries) and self.entries[index] == entry:
+            del self.entries[index]
+
+    def range(self, low, high):
+        """
+        Finds the products with low <= price <= high.
+
+        Returns:
+            list: (price, product_id) pairs, cheapest first.
+        """
+        start = bisect.bisect_left(self.entries, low, key=_price_of)
+        end = bisect.bisect_right(self.entries, high, key=_price_of)
+        return self.entries[start:end]
+
+    def cheapest(self, n):
+        """Returns the 'n' cheapest (price, product_id) pairs."""
+        return self.entries[:n]
+
+
+def _price_of(entry):
+    """Sort key used to binary-search the price index by price alone."""
+    return entry[0]
+
+
+class LowStockIndex(SecondaryIndex):
+    """
+    A min-heap of (quantity, product_id) so "what needs reordering" only
+    looks at the products that are actually low.
+
+    A heap cannot update an entry in place, so a quantity change pushes a new
+    entry and the old one becomes stale. Stale entries are skipped when
+    reading (their quantity no longer matches) and the heap is rebuilt once
+    they outnumber the live ones.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.quantities = {}  # product_id -> current quantity
+
+    def add(self, product):
+        self.quantities[product.product_id] = product.quantity
+        heapq.heappush(self.heap, (product.quantity, product.product_id))
+
+    def remove(self, product):
+        self.quantities.pop(product.product_id, None)
+        self._maybe_compact()
+
+    def quantity_changed(self, product, old_quantity):
+        self.add(product)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Rebuilds the heap from the live quantities once most entries are stale."""
+        if len(self.heap) > 2 * len(self.quantities) + 16:
+            self.heap = [(quantity, product_id) for product_id, quantity in self.quantities.items()]
+            heapq.heapify(self.heap)
+
+    def below(self, threshold):
+        """
+        Finds every product with quantity < threshold.
+
+        Walks the heap as a tree and stops going down a branch as soon as it
+        reaches a quantity >= threshold, so the work depends on how many
+        products are low rather than on the size of the catalog.
+
+        Returns:
+            list: (quantity, product_id) pairs, lowest stock first.
+        """
+        heap = self.heap
+        found = {}
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            quantity, product_id = heap[i]
+            if quantity >= threshold:
+                continue  # Every child is at least as large
+            if self.quantities.get(product_id) == quantity:
+                found[product_id] = quantity
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    stack.append(child)
+        return sorted((quantity, product_id) for product_id, quantity in found.items())
+
+
+# --- Step 3: The Indexed Inventory ---
+
+class IndexedInventory:
+    """
+    A product_id hash table plus any number of secondary indexes that are
+    kept up to date on every change.
+
+    Products must be changed through this class (insert, delete,
+    set_quantity, update_quantity) so the indexes see every change.
+    """
+
+    def __init__(self, table=None, indexes=None):
+        """
+        Initializes the inventory.
+
+        Args:
+            table: The product_id -> Product hash table. A new HashTable if not given.
+                   Any products already in it are added to the indexes.
+            indexes (dict): name -> SecondaryIndex. Defaults to a NameIndex
+                            ("name"), a PriceIndex ("price") and a
+                            LowStockIndex ("low_stock").
+        """
+        self.table = table if table is not None else HashTable(size=64, verbose=False)
+        if indexes is None:
+            indexes = {"name": NameIndex(), "price": PriceIndex(), "low_stock": LowStockIndex()}
+        self.indexes = {}
+        for name, index in indexes.items():
+            self.add_index(name, index)
+
+    def __len__(self):
+        return len(self.table)
+
+    def add_index(self, name, index):
+        """Registers a new index and fills it with the products already stored."""
+        for _, product in self.table.items():
+            index.add(product)
+        self.indexes[name] = index
+
+    def insert(self, product):
+        """Stores a product, replacing any existing product with the same product_id."""
+        old_product = self.table.search(product.product_id)
+        if old_product is not None:
+            for index in self.indexes.values():
+                index.remove(old_product)
+        self.table.insert(product.product_id, product)
+        for index in self.indexes.values():
+            index.add(product)
+
+    def search(self, product_id):
+        """Returns the Product with this product_id, or None."""
+        return self.table.search(product_id)
+
+    def delete(self, product_id):
+        """
+        Removes a product.
+
+        Returns:
+            bool: True if the product was found and removed, otherwise False.
+        """
+        product = self.table.search(product_id)
+        if product is None:
+            return False
+        for index in self.indexes.values():
+            index.remove(product)
+        return self.table.delete(product_id)
+
+    def set_quantity(self, product_id, quantity):
+        """
+        Sets a product's stock level.
+
+        Returns:
+            bool: True if the product exists, otherwise False.
+        """
+        product = self.table.search(product_id)
+        if product is None:
+            return False
+        old_quantity = product.quantity
+        product.quantity = quantity
+        for index in self.indexes.values():
+            index.quantity_changed(product, old_quantity)
+        return True
+
+    def update_quantity(self, product_id, delta):
+        """
+        Adds 'delta' to a product's stock level.
+
+        Returns:
+            int: The new quantity, or None if the product does not exist.
+        """
+        product = self.table.search(product_id)
+        if product is None:
+            return None
+        self.set_quantity(product_id, product.quantity + delta)
+        return product.quantity
+
+    # --- Queries ---
+
+    def find_by_name(self, query):
+        """Returns the Products whose name contains every word in 'query', sorted by product_id."""
+        product_ids = self.indexes["name"].matches(query)
+        return [self.table.search(product_id) for product_id in sorted(product_ids)]
+
+    def price_range(self, low, high):
+        """Returns the Products with low <= price <= high, cheapest first."""
+        return [self.table.search(product_id)
+                for _, product_id in self.indexes["price"].range(low, high)]
+
+    def cheapest(self, n, keyword=None):
+        """
+        Returns the 'n' cheapest Products, optionally only those whose name
+        matches 'keyword' (e.g. cheapest(5, "formula")).
+        """
+        if keyword is None:
+            return [self.table.search(product_id)
+                    for _, product_id in self.indexes["price"].cheapest(n)]
+        matches = self.indexes["name"].matches(keyword)
+        price_entries = self.indexes["price"].entries
+
+        # A common keyword: walking the price list from the cheapest end hits
+        # n matches quickly. A rare keyword: just sort its few matches.
+        if n * len(price_entries) < len(matches) ** 2:
+            cheapest_ids = []
+            for _, product_id in price_entries:
+                if product_id in matches:
+                    cheapest_ids.append(product_id)
+                    if len(cheapest_ids) == n:
+                        break
+            return [self.table.search(product_id) for product_id in cheapest_ids]
+
+        products = [self.table.search(product_id) for product_id in matches]
+        return heapq.nsmallest(n, products, key=lambda product: (product.price, product.product_id))
+
+    def needs_reorder(self, threshold):
+        """Returns the Products with quantity < threshold, lowest stock first."""
+        return [self.table.search(product_id)
+                for _, product_id in self.indexes["low_stock"].below(threshold)]
@@ -0,0 +1,224 @@
+import mmap  # To read the inventory file without loading it into memory
+import struct  # To pack numbers into fixed-width binary fields
+
+from inventory import HASH_FUNCTIONS, HashTable, Product
+
+# --- Step 1: The Binary File Layout ---
+#
+# An inventory file has three parts, all little-endian:
+#
+#   1. Header      magic, version, hash function id, bucket count, record count
+#   2. Directory   one 8-byte offset per bucket, pointing at the first
+#                  record in that bucket's chain (0 means empty)
+#   3. Records     packed one after another. Each record holds the offset
+#                  of the next record in the same bucket, then the price,
+#                  quantity and the UTF-8 product_id and name.
+#
+# Because the directory has a fixed width, a reader can jump straight to a
+# bucket and follow the chain inside the file, so a search only touches the
+# few records in one bucket.
+
+MAGIC = b"BABYINV1"
+VERSION = 1
+
+HEADER = struct.Struct("<8sIIQQ")  # magic, version, hash function id, bucket count, record count
+BUCKET = struct.Struct("<Q")  # offset of the first record in a bucket
+RECORD = struct.Struct("<QdqHH")  # next offset, price, quantity, id length, name length
+
+DIRECTORY_OFFSET = HEADER.size
+
+# The hash functions a file can be written with, by the id stored in the header.
+# Python's built-in hash() of a string changes between runs, so only
+# deterministic functions are allowed. Never reorder this tuple; "xxhash"
+# needs the optional xxhash package.
+FILE_HASH_FUNCTIONS = ("crc32", "fnv1a", "blake2b", "xxhash")
+
+
+# --- Step 2: Writing an Inventory File ---
+
+def save_inventory(table, path, bucket_count=None, hash_function="crc32"):
+    """
+    Writes every product in a hash table to a binary inventory file.
+
+    Records are streamed to disk one at a time; only the bucket directory
+    is kept in memory while writing.
+
+    Args:
+        table: A HashTable or OpenAddressingHashTable holding Product objects.
+        path (str): The file to write.
+        bucket_count (int): Number of buckets in the file. Defaults to about
+                            1.33 buckets per product.
+        hash_function (str): A name from FILE_HASH_FUNCTIONS used to pick buckets.
+
+    Returns:
+        int: The number of records written.
+    """
+    if hash_function not in FILE_HASH_FUNCTIONS or hash_function not in HASH_FUNCTIONS:
+        raise ValueError(f"Cannot write files with hash function '{hash_function}'.")
+    hash_id = FILE_HASH_FUNCTIONS.index(hash_function)
+    file_hash = HASH_FUNCTIONS[hash_function]
+
+    if bucket_count is None:
+        bucket_count = int(len(table) / 0.75) + 1
+
+    # heads[i] is the offset of the most recently written record in bucket i
+    heads = [0] * bucket_count
+    record_count = 0
+
+    with open(path, "wb") as file:
+        # Reserve space for the header and directory; they are filled in at the end
+        file.write(bytes(DIRECTORY_OFFSET + BUCKET.size * bucket_count))
+        offset = file.tell()
+
+        for key, product in table.items():
+            id_bytes = str(key).encode("utf-8")
+            name_bytes = product.name.encode("utf-8")
+            index = file_hash(key) % bucket_count
+
+            # Link the new record in front of the bucket's current chain
+            file.write(RECORD.pack(heads[index], product.price, product.quantity,
+                                   len(id_bytes), len(name_bytes)))
+            file.write(id_bytes)
+            file.write(name_bytes)
+            heads[index] = offset
+            offset += RECORD.size + len(id_bytes) + len(name_bytes)
+            record_count += 1
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, hash_id, bucket_count, record_count))
+        file.write(struct.pack(f"<{bucket_count}Q", *heads))
+
+    return record_count
+
+
+# --- Step 3: Reading an Inventory File with mmap ---
+
+class MappedInventory:
+    """
+    A read-only inventory backed by a memory-mapped inventory file.
+
+    Nothing is deserialized up front: search() hashes the key, reads one
+    directory entry and follows that bucket's chain inside the file. Many
+    processes can map the same file and share it through the page cache.
+    """
+
+    def __init__(self, path):
+        """
+        Opens and maps an inventory file written by save_inventory().
+
+        Args:
+            path (str): The file to open.
+        """
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, hash_id, self.bucket_count, self.count = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"'{path}' is not a version {VERSION} inventory file.")
+            if hash_id >= len(FILE_HASH_FUNCTIONS) or FILE_HASH_FUNCTIONS[hash_id] not in HASH_FUNCTIONS:
+                raise ValueError(f"'{path}' uses a hash function that is not available.")
+            self.hash_name = FILE_HASH_FUNCTIONS[hash_id]
+            self._hash = HASH_FUNCTIONS[self.hash_name]
+        except Exception:
+            self.close()
+            raise
+        self._records_offset = DIRECTORY_OFFSET + BUCKET.size * self.bucket_count
+
+    def __len__(self):
+        """Returns the number of products in the file."""
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the file."""
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_record(self, offset):
+        """
+        Decodes the record at 'offset'.
+
+        Returns:
+            tuple: (next offset, Product, offset just past this record)
+        """
+        mapped = self._map
+        next_offset, price, quantity, id_length, name_length = RECORD.unpack_from(mapped, offset)
+        start = offset + RECORD.size
+        product_id = mapped[start:start + id_length].decode("utf-8")
+        start += id_length
+        name = mapped[start:start + name_length].decode("utf-8")
+        product = Product(product_id, name, price, quantity)
+        return next_offset, product, start + name_length
+
+    def search(self, key):
+        """
+        Searches for a product in the file using its product_id.
+
+        Args:
+            key: The product_id to search for.
+
+        Returns:
+            Product: A new Product object if found, otherwise None.
+        """
+        mapped = self._map
+        id_bytes = str(key).encode("utf-8")
+        index = self._hash(key) % self.bucket_count
+        (offset,) = BUCKET.unpack_from(mapped, DIRECTORY_OFFSET + BUCKET.size * index)
+
+        while offset:
+            next_offset, _, _, id_length, _ = RECORD.unpack_from(mapped, offset)
+            start = offset + RECORD.size
+            # Compare the raw bytes first; only decode the record that matches
+            if mapped[start:start + id_length] == id_bytes:
+                return self._read_record(offset)[1]
+            offset = next_offset
+
+        return None
+
+    def search_many(self, keys):
+        """
+        Looks up many keys in one call.
+
+        Returns:
+            list: The Product for each key (or None if missing), in input order.
+        """
+        search = self.search
+        return [search(key) for key in keys]
+
+    def products(self):
+        """Yields every Product in the file, in the order they were written."""
+        offset = self._records_offset
+        end = len(self._map)
+        while offset < end:
+            _, product, offset = self._read_record(offset)
+            yield product
+
+
+def load_inventory(path, table=None):
+    """
+    Loads every product in an inventory file into an in-memory hash table.
+
+    Args:
+        path (str): The file written by save_inventory().
+        table: The table to fill. A new HashTable is created if not given.
+
+    Returns:
+        The filled hash table.
+    """
+    with MappedInventory(path) as inventory:
+        if table is None:
+            table = HashTable(size=max(1, len(inventory)), verbose=False)
+        table.reserve(len(table) + len(inventory))
+        # Keys in a saved file are unique, but the table may already hold some of them
+        table.insert_many(((p.product_id, p) for p in inventory.products()),
+                          unique=len(table) == 0)
+    return table
@@ -0,0 +1,499 @@
+import os  # fsync, atomic rename and the files in the data directory
+import re  # Parses the snapshot / log file names
+import struct  # Fixed-width fields of a log record
+import threading  # Group commit between writer threads and the background compactor
+import zlib  # crc32 checksums to spot torn or corrupt records
+
+from contextlib import contextmanager  # batch() groups many changes into one fsync
+
+from inventory import HashTable, Product
+from inventory_storage import load_inventory, save_inventory
+
+# --- Step 1: The Data Directory ---
+#
+# A durable inventory lives in one directory:
+#
+#   snapshot-000007.inv   The whole inventory (inventory_storage format) as
+#                         it was after every log numbered below 7.
+#   wal-000007.log        Changes made after that, in order.
+#   wal-000008.log        ...and after wal-000007 was closed.
+#
+# Every change is appended to the newest log before it is acknowledged, so
+# a write costs one sequential append (and a share of an fsync, see Step 3).
+# On startup the newest snapshot is loaded and every log with the same or a
+# higher number is replayed on top of it.
+#
+# Compaction starts a new log, writes a new snapshot of the table as it was
+# at that moment, and then deletes the older logs and snapshots. The logs
+# therefore never grow much beyond 'compact_bytes', which bounds how long a
+# restart has to spend replaying them.
+
+SNAPSHOT_NAME = "snapshot-{:06d}.inv"
+LOG_NAME = "wal-{:06d}.log"
+_FILE_PATTERN = re.compile(r"^(snapshot|wal)-(\d{6})\.(inv|log)$")
+
+# --- Step 2: The Log Format ---
+#
+# A log starts with LOG_MAGIC, followed by one frame per change:
+#
+#   FRAME   payload length, crc32 of the payload
+#   payload ENTRY (operation, price, quantity, id length, name length),
+#           then the UTF-8 product_id and name
+#
+# A crash can leave the last frame half written. Replay stops at the first
+# frame that is cut short or fails its checksum, and the log is truncated
+# there, so every acknowledged change survives and nothing half-written is
+# ever applied.
+
+LOG_MAGIC = b"BABYWAL1"
+FRAME = struct.Struct("<II")  # payload length, crc32 of the payload
+ENTRY = struct.Struct("<BdqHH")  # operation, price, quantity, id length, name length
+
+INSERT = 1
+UPDATE = 2
+DELETE = 3
+OPERATIONS = {INSERT: "insert", UPDATE: "update", DELETE: "delete"}
+
+
+def encode_entry(operation, product_id, name="", price=0.0, quantity=0):
+    """Returns one framed log record as bytes."""
+    id_bytes = product_id.encode("utf-8")
+    name_bytes = name.encode("utf-8")
+    payload = ENTRY.pack(operation, price, quantity, len(id_bytes), len(name_bytes)) + id_bytes + name_bytes
+    return FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_log(path):
+    """
+    Reads every complete record of a log file.
+
+    Returns:
+        tuple: (list of (operation, product_id, name, price, quantity),
+                offset just past the last good record)
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:len(LOG_MAGIC)] != LOG_MAGIC:
+        # Not even the magic made it to disk: the log holds nothing
+        return [], 0
+
+    entries = []
+    offset = len(LOG_MAGIC)
+    end = len(data)
+    while offset + FRAME.size <= end:
+        length, checksum = FRAME.unpack_from(data, offset)
+        start = offset + FRAME.size
+        payload = data[start:start + length]
+        if len(payload) < length or length < ENTRY.size or zlib.crc32(payload) != checksum:
+            break
+        operation, price, quantity, id_length, name_length = ENTRY.unpack_from(payload)
+        if operation not in OPERATIONS or ENTRY.size + id_length + name_length != length:
+            break
+        product_id = payload[ENTRY.size:ENTRY.size + id_length].decode("utf-8")
+        name = payload[ENTRY.size + id_length:].decode("utf-8")
+        entries.append((operation, product_id, name, price, quantity))
+        offset = start + length
+    return entries, offset
+
+
+def _fsync_directory(directory):
+    """Makes file creations, renames and deletions in 'directory' durable (POSIX only)."""
+    if os.name != "posix":
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class _SnapshotView:
+    """The len() and items() that save_inventory() needs, over a copied list of products."""
+
+    def __init__(self, items):
+        self._items = items
+
+    def __len__(self):
+        return len(self._items)
+
+    def items(self):
+        return iter(self._items)
+
+
+# --- Step 3: The Durable Inventory ---
+#
+# Group commit: fsync is by far the slowest part of a write, so writers
+# share it. A change is applied to the table and appended to an in-memory
+# buffer while holding the lock; then the writer waits until the log has
+# been synced up to its record. The first writer to wait becomes the
+# "leader": it takes everything buffered so far, writes and fsyncs it with
+# the lock released, and wakes every writer it covered. Writers that arrive
+# during that fsync pile up in the buffer and are covered together by the
+# next leader, so under load one fsync acknowledges many changes.
+
+class DurableInventory:
+    """
+    A hash table of Products whose changes are written to a write-ahead log,
+    so they survive the program exiting or crashing.
+
+    Reads go straight to the in-memory table. insert() and delete() return
+    once the change is on disk (unless the calling thread is inside batch(),
+    which syncs once at the end, or with synchronous=False, which leaves
+    syncing to sync(), close() and the buffer limit).
+
+    If writing the log ever fails, the inventory stops accepting changes
+    and every later write raises OSError: part of the failed write may have
+    reached the file, so retrying could leave a broken record in the middle
+    of the log. Reopen the directory to get back the state that is on disk.
+
+    Attributes:
+        table: The in-memory table (read it freely; change it only through this class).
+        directory (str): Where the snapshot and log files are kept.
+    """
+
+    def __init__(self, directory, table=None, synchronous=True, compact_bytes=8 << 20,
+                 buffer_bytes=1 << 20, background=True):
+        """
+        Opens (or creates) a durable inventory and recovers its contents.
+
+        Args:
+            directory (str): The data directory; created if missing.
+            table: An empty HashTable / OpenAddressingHashTable to recover into.
+                   A new HashTable is created if not given.
+            synchronous (bool): Wait for the fsync before insert() / delete() return.
+            compact_bytes (int): Compact once the logs hold this many bytes.
+            buffer_bytes (int): With synchronous=False, write and sync once
+                                this many bytes are buffered.
+            background (bool): Compact in a background thread. If False,
+                               compaction only happens when compact() is called.
+        """
+        if compact_bytes <= 0 or buffer_bytes <= 0:
+            raise ValueError("compact_bytes and buffer_bytes must be greater than 0.")
+        self.directory = directory
+        self.table = table if table is not None else HashTable(size=1024, verbose=False)
+        self.synchronous = synchronous
+        self.compact_bytes = compact_bytes
+        self.buffer_bytes = buffer_bytes
+
+        self._cond = threading.Condition()
+        self._buffer = bytearray()
+        self._appended = 0  # sequence number of the last record put in the buffer
+        self._synced = 0  # sequence number of the last record known to be on disk
+        self._syncing = False  # a leader is writing the buffer out right now
+        self._local = threading.local()  # per-thread batch() depth
+        self._failed = None  # the error that stopped the log, if any
+        self._log = None
+        self._log_number = 0
+        self._log_bytes = 0  # bytes in every log not yet folded into a snapshot
+        self._closed = False
+
+        self.records_written = 0
+        self.fsyncs = 0
+        self.compactions = 0
+        self.recovered_records = 0
+        self.compaction_error = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+        self._compact_lock = threading.Lock()
+        self._wake_compactor = threading.Event()
+        self._compactor = None
+        if background:
+            self._compactor = threading.Thread(target=self._run_compactor, name="inventory-compactor",
+                                               daemon=True)
+            self._compactor.start()
+            if self._log_bytes >= compact_bytes:
+                self._wake_compactor.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Reads (the table as it is in memory) ---
+
+    def __len__(self):
+        return len(self.table)
+
+    def search(self, key):
+        return self.table.search(key)
+
+    def search_many(self, keys):
+        return self.table.search_many(keys)
+
+    def items(self):
+        return self.table.items()
+
+    # --- Changes ---
+
+    def insert(self, key, product):
+        """
+        Inserts or replaces a product and logs the change.
+
+        Args:
+            key: The product_id (stored as a string).
+            product (Product): The product to store.
+        """
+        key = str(key)
+        with self._cond:
+            self._check_open()
+            operation = UPDATE if self.table.search(key) is not None else INSERT
+            record = encode_entry(operation, key, product.name, product.price, product.quantity)
+            self.table.insert(key, product)
+            sequence = self._append(record)
+        self._after_append(sequence)
+
+    def delete(self, key):
+        """
+        Deletes a product and logs the change.
+
+        Returns:
+            bool: True if the product existed (only then is anything logged).
+        """
+        key = str(key)
+        with self._cond:
+            self._check_open()
+            if not self.table.delete(key):
+                return False
+            sequence = self._append(encode_entry(DELETE, key))
+        self._after_append(sequence)
+        return True
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups the changes made inside a 'with' block: none of them waits for
+        its own fsync, and they are all synced together when the block ends.
+        """
+        # Only this thread's changes skip their fsync; other threads still wait for theirs
+        local = self._local
+        local.batch_depth = getattr(local, "batch_depth", 0) + 1
+        try:
+            yield self
+        finally:
+            local.batch_depth -= 1
+            if local.batch_depth == 0:
+                self.sync()
+
+    def sync(self):
+        """Writes and fsyncs everything logged so far."""
+        with self._cond:
+            sequence = self._appended
+        self._wait_for_sync(sequence)
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("The inventory has been closed.")
+        self._check_log()
+
+    def _check_log(self):
+        if self._failed is not None:
+            raise OSError(f"The write-ahead log could not be written ({self._failed}); "
+                          "reopen the inventory to recover.") from self._failed
+
+    def _append(self, record):
+        """Adds a record to the buffer (lock held) and returns its sequence number."""
+        self._buffer += record
+        self._appended += 1
+        self._log_bytes += len(record)
+        self.records_written += 1
+        return self._appended
+
+    def _after_append(self, sequence):
+        if self.synchronous and not getattr(self._local, "batch_depth", 0):
+            self._wait_for_sync(sequence)
+        elif len(self._buffer) >= self.buffer_bytes:
+            self.sync()
+        if self._log_bytes >= self.compact_bytes and self._compactor is not None:
+            self._wake_compactor.set()
+
+    def _wait_for_sync(self, sequence):
+        """Returns once every record up to 'sequence' is on disk (group commit, see above)."""
+        with self._cond:
+            while self._synced < sequence:
+                self._check_log()
+                if self._syncing:
+                    # Someone else is syncing; their fsync (or the next one) covers us
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                data, self._buffer = self._buffer, bytearray()
+                covered = self._appended
+                log = self._log
+                self._cond.release()
+                try:
+                    log.write(data)
+                    log.flush()
+                    os.fsync(log.fileno())
+                except BaseException as error:
+                    self._cond.acquire()
+                    self._syncing = False
+                    # The records in 'data' are not known to be on disk: never
+                    # count them as synced, and fail every waiter instead
+                    self._failed = error
+                    self._cond.notify_all()
+                    raise
+                self._cond.acquire()
+                self._syncing = False
+                self._synced = covered
+                self.fsyncs += 1
+                self._cond.notify_all()
+
+    # --- Step 4: Recovery ---
+
+    def _files(self):
+        """Returns ({number: snapshot path}, {number: log path}) for the data directory."""
+        snapshots, logs = {}, {}
+        for name in os.listdir(self.directory):
+            match = _FILE_PATTERN.match(name)
+            if match is None:
+                if name.endswith(".tmp"):
+                    # A snapshot that was still being written when the program stopped
+                    os.remove(os.path.join(self.directory, name))
+                continue
+            kind, number = match.group(1), int(match.group(2))
+            (snapshots if kind == "snapshot" else logs)[number] = os.path.join(self.directory, name)
+        return snapshots, logs
+
+    def _recover(self):
+        """Loads the newest snapshot, replays the logs after it and opens a new log."""
+        snapshots, logs = self._files()
+        base = max(snapshots, default=0)
+        if base:
+            load_inventory(snapshots[base], self.table)
+
+        table = self.table
+        good_end = 0
+        for number in sorted(logs):
+            if number < base:
+                continue  # already folded into the snapshot
+            entries, good_end = read_log(logs[number])
+            for operation, product_id, name, price, quantity in entries:
+                if operation == DELETE:
+                    table.delete(product_id)
+                else:
+                    table.insert(product_id, Product(product_id, name, price, quantity))
+            if good_end < os.path.getsize(logs[number]):
+                # Cut off the torn record at the end so it can never be replayed later
+                with open(logs[number], "r+b") as file:
+                    file.truncate(good_end)
+                    os.fsync(file.fileno())
+            self.recovered_records += len(entries)
+            self._log_bytes += good_end
+
+        newest = max(logs, default=0)
+        if newest >= base and good_end:
+            # Keep appending to the newest log, just after its last good record
+            log = open(logs[newest], "r+b")
+            log.seek(good_end)
+            self._log = log
+            self._log_number = newest
+        else:
+            self._open_log(max(base, newest + 1, 1))
+
+    def _open_log(self, number):
+        """Starts a new, empty log file (lock held or not yet shared)."""
+        path = os.path.join(self.directory, LOG_NAME.format(number))
+        log = open(path, "wb")
+        log.write(LOG_MAGIC)
+        log.flush()
+        os.fsync(log.fileno())
+        _fsync_directory(self.directory)
+        self._log = log
+        self._log_number = number
+
+    # --- Step 5: Compaction ---
+
+    def compact(self):
+        """
+        Folds the logs into a new snapshot and deletes the files it replaces.
+        Runs in the calling thread; writers are only paused while the table
+        is copied, not while the snapshot is written.
+
+        Returns:
+            int: The number of products in the new snapshot.
+        """
+        with self._compact_lock:
+            with self._cond:
+                self._check_open()
+                while self._syncing:
+                    self._cond.wait()
+                # Finish the current log and start the next one. The snapshot
+                # taken now holds exactly the changes in the logs before it.
+                try:
+                    self._log.write(self._buffer)
+                    self._log.flush()
+                    os.fsync(self._log.fileno())
+                except BaseException as error:
+                    self._failed = error
+                    self._cond.notify_all()
+                    raise
+                self._buffer = bytearray()
+                self._synced = self._appended
+                self._log.close()
+                self._open_log(self._log_number + 1)
+                number = self._log_number
+                self._log_bytes = 0
+                items = [(key, Product(product.product_id, product.name, product.price, product.quantity))
+                         for key, product in self.table.items()]
+                self._cond.notify_all()
+
+            # The slow part runs without the lock: write, fsync, then rename into place
+            path = os.path.join(self.directory, SNAPSHOT_NAME.format(number))
+            temporary = path + ".tmp"
+            save_inventory(_SnapshotView(items), temporary)
+            with open(temporary, "rb") as file:
+                os.fsync(file.fileno())
+            os.replace(temporary, path)
+            _fsync_directory(self.directory)
+
+            snapshots, logs = self._files()
+            for old_number, old_path in [*snapshots.items(), *logs.items()]:
+                if old_number < number:
+                    os.remove(old_path)
+            _fsync_directory(self.directory)
+            self.compactions += 1
+            return len(items)
+
+    def _run_compactor(self):
+        while True:
+            self._wake_compactor.wait()
+            self._wake_compactor.clear()
+            if self._closed:
+                return
+            try:
+                self.compact()
+            except ValueError:
+                return  # closed while compacting
+            except OSError as error:
+                # Keep serving writes; the logs are still complete, just longer
+                self.compaction_error = error
+
+    # --- Closing ---
+
+    def close(self):
+        """Syncs everything logged, stops the compactor and closes the log."""
+        if self._closed:
+            return
+        if self._failed is None:
+            self.sync()
+        if self._compactor is not None:
+            with self._compact_lock:
+                self._closed = True
+            self._wake_compactor.set()
+            self._compactor.join()
+        with self._cond:
+            self._closed = True
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def stats(self):
+        """Returns the log counters as a dict."""
+        with self._cond:
+            return {"products": len(self.table), "records_written": self.records_written,
+                    "fsyncs": self.fsyncs, "compactions": self.compactions,
+                    "recovered_records": self.recovered_records, "log_number": self._log_number,
+                    "log_bytes": self._log_bytes}
@@ -0,0 +1,438 @@
+import contextlib  # ContextDecorator: 'instrumented' works in a 'with' block and as a decorator
+import functools  # wraps() keeps the names and docstrings of the wrapped methods
+import threading  # One lock per metric so threads can record at the same time
+import time  # perf_counter_ns for operation latency
+from bisect import bisect_left  # Finds a histogram bucket
+
+# --- Step 1: Metric Types ---
+#
+# Three kinds of metric, each keyed by a tuple of label values:
+#
+#   Counter    a number that only goes up (operations run, lookups that missed)
+#   Histogram  how a measurement is spread over fixed buckets (latency, probe length)
+#   HotKeys    the most frequently used keys, found with the "space saving"
+#              algorithm, which only ever keeps 'capacity' keys in memory
+#
+# They are exported in the Prometheus text format (see to_prometheus()), so
+# any Prometheus-compatible scraper or a plain 'grep' can read them.
+
+# Upper bounds of the histogram buckets (a final "+Inf" bucket is implied)
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 0.1, 1.0)
+PROBE_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16, 32, 64)
+SCAN_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 1000, 10000, 100000)
+
+
+def _escape(value):
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """A count per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        """Adds 'amount' to the count for the label values 'labels' (a tuple)."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self._values.get(labels, 0)
+
+    def snapshot(self):
+        """Returns {label values: count}."""
+        with self._lock:
+            return dict(self._values)
+
+    def exposition(self):
+        """Returns the metric's lines in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Counts observations per bucket, plus their sum and number, for each
+    combination of label values.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._series = {}  # label values -> [bucket counts (last is +Inf), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        """Records one measurement for the label values 'labels' (a tuple)."""
+        # bisect_left puts a value equal to a bound in that bound's bucket ("le" = less or equal)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        """Returns {label values: {"buckets": {bound: cumulative count}, "sum", "count"}}."""
+        with self._lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+        result = {}
+        for labels, (counts, total, count) in series.items():
+            cumulative, running = {}, 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                cumulative[bound] = running
+            result[labels] = {"buckets": cumulative, "sum": total, "count": count}
+        return result
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, series in sorted(self.snapshot().items()):
+            for bound, count in series["buckets"].items():
+                label_text = _format_labels(self.labelnames, labels, [("le", _format_number(bound))])
+                lines.append(f"{self.name}_bucket{label_text} {count}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_number(series['sum'])}")
+            lines.append(f"{self.name}_count{label_text} {series['count']}")
+        return lines
+
+
+class HotKeys:
+    """
+    Approximate top-k of the keys seen ("space saving" algorithm).
+
+    At most 'capacity' keys are tracked. When a new key arrives and the
+    table is full, the key with the smallest count is replaced and the new
+    key starts at that count + 1, so a count can overestimate but a truly
+    frequent key is never dropped.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, capacity=100, export_top=10):
+        self.name = name
+        self.help = help_text
+        self.capacity = capacity
+        self.export_top = export_top
+        self._counts = {}  # key -> count
+        self._by_count = {}  # count -> set of keys with that count, so the smallest is found in O(1)
+        self._smallest = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, key, count):
+        """Removes 'key' from the set for 'count'; returns True if that set is now empty."""
+        keys = self._by_count[count]
+        keys.discard(key)
+        if keys:
+            return False
+        del self._by_count[count]
+        return True
+
+    def _place(self, key, count):
+        self._counts[key] = count
+        self._by_count.setdefault(count, set()).add(key)
+
+    def add(self, key):
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                # The key moves up one; if it was the last key at the smallest count, that rises too
+                if self._drop(key, count) and count == self._smallest:
+                    self._smallest = count + 1
+                self._place(key, count + 1)
+            elif len(self._counts) < self.capacity:
+                self._place(key, 1)
+                self._smallest = 1
+            else:
+                # Replace one of the least used keys; the newcomer starts at its count + 1
+                smallest = self._smallest
+                evicted = next(iter(self._by_count[smallest]))
+                del self._counts[evicted]
+                if self._drop(evicted, smallest):
+                    self._smallest = smallest + 1
+                self._place(key, smallest + 1)
+
+    def top(self, k=None):
+        """Returns [(key, count)] for the k most used keys, most used first."""
+        with self._lock:
+            ordered = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return ordered[:k or self.export_top]
+
+    def snapshot(self):
+        return dict(self.top())
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, count in self.top():
+            lines.append(f"{self.name}{_format_labels(('key',), (key,))} {count}")
+        return lines
+
+
+# --- Step 2: The Registry ---
+
+class MetricsRegistry:
+    """
+    Holds the metrics recorded while instrumentation is on.
+
+    Attributes:
+        inventory_operations, graph_operations (Counter)
+        inventory_lookups (Counter): Searches by result ("hit" / "miss").
+        inventory_latency, graph_latency (Histogram): Seconds per operation.
+        inventory_probe_length (Histogram): Chain nodes / table slots looked at per operation.
+        graph_edges_scanned (Histogram): Edges read per follower query.
+        hot_keys (HotKeys): The most searched inventory keys.
+    """
+
+    def __init__(self, hot_key_capacity=100):
+        self.inventory_operations = Counter(
+            "inventory_operations_total", "Hash table operations.", ("structure", "op"))
+        self.inventory_lookups = Counter(
+            "inventory_lookups_total", "Hash table searches by result.", ("structure", "result"))
+        self.inventory_latency = Histogram(
+            "inventory_operation_seconds", "Time per hash table operation.", LATENCY_BUCKETS, ("structure", "op"))
+        self.inventory_probe_length = Histogram(
+            "inventory_probe_length", "Chain nodes or table slots looked at per operation.",
+            PROBE_BUCKETS, ("structure", "op"))
+        self.graph_operations = Counter("graph_operations_total", "Social graph operations.", ("op",))
+        self.graph_latency = Histogram(
+            "graph_operation_seconds", "Time per social graph operation.", LATENCY_BUCKETS, ("op",))
+        self.graph_edges_scanned = Histogram(
+            "graph_edges_scanned", "Edges read per follower query.", SCAN_BUCKETS, ("op",))
+        self.hot_keys = HotKeys(
+            "inventory_hot_key_lookups", "Searches for the most searched inventory keys (approximate).",
+            hot_key_capacity)
+
+    def metrics(self):
+        """Every metric, in export order."""
+        return [self.inventory_operations, self.inventory_lookups, self.inventory_latency,
+                self.inventory_probe_length, self.hot_keys, self.graph_operations,
+                self.graph_latency, self.graph_edges_scanned]
+
+    def snapshot(self):
+        """Returns {metric name: that metric's snapshot()}."""
+        return {metric.name: metric.snapshot() for metric in self.metrics()}
+
+    def to_prometheus(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics():
+            lines.extend(metric.exposition())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        self.__init__(self.hot_keys.capacity)
+
+
+REGISTRY = MetricsRegistry()  # Used when instrumentation is turned on without a registry
+
+
+# --- Step 3: Switching Instrumentation On and Off ---
+#
+# Nothing in inventory.py or social_media.py knows about metrics. Turning
+# instrumentation on replaces the hot methods (HashTable.insert / search,
+# Graph.add_edge, find_followers, ...) with wrappers that time them and
+# record what they did; turning it off puts the original functions back.
+# So when it is off the hot paths are exactly the uninstrumented code and
+# cost nothing extra.
+#
+# The wrappers are installed on the classes and modules, so they apply to
+# every table and graph in the process (and every thread) while on.
+#
+# Module-level functions are only instrumented when they are looked up
+# through their module. Code that did `from graph_queries import followers`
+# (or `from social_media import find_followers`) before enable() holds the
+# original function and is not measured; call `graph_queries.followers(...)`
+# instead. Methods are fine either way, since they are looked up on the class.
+
+_state_lock = threading.Lock()
+_active_registry = None
+_depth = 0
+_originals = []  # (owner, attribute name, original value) to restore
+
+
+def _wrap_table(registry, structure, search, insert):
+    clock = time.perf_counter_ns
+    search_labels = (structure, "search")
+    insert_labels = (structure, "insert")
+    hit_labels, miss_labels = (structure, "hit"), (structure, "miss")
+
+    @functools.wraps(search)
+    def instrumented_search(self, key):
+        # search_with_probes is the same lookup as search, it just also says
+        # how many nodes / slots it looked at, so the key is only found once
+        start = clock()
+        result, probes = self.search_with_probes(key)
+        elapsed = clock() - start
+        registry.inventory_operations.inc(search_labels)
+        registry.inventory_lookups.inc(miss_labels if result is None else hit_labels)
+        registry.inventory_latency.observe(search_labels, elapsed / 1e9)
+        registry.inventory_probe_length.observe(search_labels, probes)
+        registry.hot_keys.add(key)
+        return result
+
+    @functools.wraps(insert)
+    def instrumented_insert(self, key, value):
+        start = clock()
+        # insert returns how far along its chain / probe sequence the key ended up
+        probes = insert(self, key, value)
+        elapsed = clock() - start
+        registry.inventory_operations.inc(insert_labels)
+        registry.inventory_latency.observe(insert_labels, elapsed / 1e9)
+        registry.inventory_probe_length.observe(insert_labels, probes)
+        return probes
+
+    return instrumented_search, instrumented_insert
+
+
+def _wrap_graph_call(registry, op, function, scanned):
+    """Wraps a graph function; scanned(result) returns how many edges it read."""
+    clock = time.perf_counter_ns
+    labels = (op,)
+
+    @functools.wraps(function)
+    def instrumented(*args, **kwargs):
+        start = clock()
+        result = function(*args, **kwargs)
+        elapsed = clock() - start
+        registry.graph_operations.inc(labels)
+        registry.graph_latency.observe(labels, elapsed / 1e9)
+        if scanned is not None:
+            registry.graph_edges_scanned.observe(labels, scanned(result))
+        return result
+
+    return instrumented
+
+
+def _replacements(registry):
+    """Returns [(owner, attribute name, wrapper)] for everything that gets instrumented."""
+    import graph_queries
+    import inventory
+    import social_media
+
+    replacements = []
+    for structure, table_class in (("chaining", inventory.HashTable),
+                                   ("open_addressing", inventory.OpenAddressingHashTable)):
+        search, insert = _wrap_table(registry, structure, table_class.search, table_class.insert)
+        replacements += [(table_class, "search", search), (table_class, "insert", insert)]
+
+    replacements.append((social_media.Graph, "add_edge",
+                         _wrap_graph_call(registry, "add_edge", social_media.Graph.add_edge, None)))
+    # find_followers reads every incoming edge of the user once
+    replacements.append((social_media, "find_followers",
+                         _wrap_graph_call(registry, "find_followers", social_media.find_followers, len)))
+    for op in ("followers", "following", "mutuals"):
+        replacements.append((graph_queries, op,
+                             _wrap_graph_call(registry, op, getattr(graph_queries, op),
+                                              lambda page: page.scanned)))
+    return replacements
+
+
+def enable(registry=None):
+    """
+    Turns instrumentation on, recording into 'registry' (default: REGISTRY).
+    Calls nest: each enable() needs a matching disable().
+
+    Returns:
+        MetricsRegistry: The registry being recorded into.
+    """
+    global _active_registry, _depth
+    registry = registry if registry is not None else REGISTRY
+    with _state_lock:
+        if _depth:
+            if registry is not _active_registry:
+                raise RuntimeError("Instrumentation is already on with a different registry.")
+        else:
+            for owner, name, wrapper in _replacements(registry):
+                _originals.append((owner, name, getattr(owner, name)))
+                setattr(owner, name, wrapper)
+            _active_registry = registry
+        _depth += 1
+    return registry
+
+
+def disable():
+    """Undoes one enable(); the originals come back after the outermost one."""
+    global _active_registry, _depth
+    with _state_lock:
+        if not _depth:
+            return
+        _depth -= 1
+        if _depth:
+            return
+        while _originals:
+            owner, name, original = _originals.pop()
+            setattr(owner, name, original)
+        _active_registry = None
+
+
+def is_enabled():
+    return _depth > 0
+
+
+def active_registry():
+    """The registry being recorded into, or None when instrumentation is off."""
+    return _active_registry
+
+
+class instrumented(contextlib.ContextDecorator):
+    """
+    Turns instrumentation on for a block of code or a function call:
+
+        with instrumented() as registry:
+            table.search("D101")
+        print(registry.to_prometheus())
+
+        @instrumented()
+        def handle_request(...):
+            ...
+
+    Only calls made through the classes and modules are measured: a name
+    bound earlier with `from graph_queries import followers` keeps pointing at
+    the uninstrumented function (see Step 3).
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else REGISTRY
+
+    def __enter__(self):
+        return enable(self.registry)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        disable()
+        return False
+
+
+def to_prometheus(registry=None):
+    """The Prometheus text for 'registry' (default: REGISTRY)."""
+    return (registry if registry is not None else REGISTRY).to_prometheus()
@@ -0,0 +1,352 @@
+import argparse  # Command-line options for the server
+import asyncio  # One event loop serves every connection
+import json  # Requests and responses are one JSON object per line
+import math  # isfinite() to reject inf / nan arguments
+
+import graph_queries  # Paginated, privacy-aware follower / following lists
+import metrics  # Optional hot-path instrumentation (--metrics)
+from inventory import HashTable, Product
+from social_media import Graph, Person
+
+# --- Step 1: The Protocol ---
+#
+# Clients open a TCP connection and send one JSON object per line:
+#
+#   {"id": 7, "op": "inventory.search", "args": {"product_id": "D101"}}
+#
+# and get one line back per request, in the same order:
+#
+#   {"id": 7, "ok": true, "result": {"product_id": "D101", ...}}
+#   {"id": 8, "ok": false, "error": "Unknown operation 'foo'."}
+#
+# A client may send many requests without waiting for the answers
+# (pipelining); that is what lets the server batch them.
+#
+# Operations:
+#   inventory.search       product_id                       -> product or null
+#   inventory.search_many  product_ids                      -> list of product or null
+#   inventory.insert       product_id, name, price, quantity
+#   graph.add_user         name, gender, biography, privacy
+#   graph.follow           follower, followee               -> true if the edge is new
+#   graph.unfollow         follower, followee               -> true if the edge existed
+#   graph.followers        user, viewer, cursor, page_size  -> {"users": [...], "next_cursor": ...}
+#   graph.following        (as graph.followers)
+#   stats                                                   -> counters
+#   metrics                                                 -> Prometheus text (with --metrics)
+
+DEFAULT_PORT = 8765
+MAX_LINE_BYTES = 1 << 20  # Longest request line accepted
+
+
+class RequestError(Exception):
+    """A request that cannot be carried out; its message is sent back to the client."""
+
+
+def _product_to_json(product):
+    if product is None:
+        return None
+    return {"product_id": product.product_id, "name": product.name,
+            "price": product.price, "quantity": product.quantity}
+
+
+# --- Step 2: Running Operations ---
+
+def _finite(value, name):
+    """Returns 'value' as a float, rejecting inf and nan."""
+    number = float(value)
+    if not math.isfinite(number):
+        raise RequestError(f"{name} must be a finite number.")
+    return number
+
+
+def _whole_number(value, name):
+    """Returns 'value' as an int, rejecting fractions (e.g. 1.5), inf and nan."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    number = _finite(value, name)
+    if not number.is_integer():
+        raise RequestError(f"{name} must be a whole number.")
+    return int(number)
+
+
+class ServiceState:
+    """
+    The data structures behind the service and the code that runs each
+    operation on them.
+
+    Only the service's single worker task calls execute(), one request at
+    a time, so the structures need no locks.
+    """
+
+    def __init__(self, inventory=None, graph=None):
+        self.inventory = inventory if inventory is not None else HashTable(size=1024, verbose=False)
+        self.graph = graph if graph is not None else Graph()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._operations = {
+            "inventory.search": self._inventory_search,
+            "inventory.search_many": self._inventory_search_many,
+            "inventory.insert": self._inventory_insert,
+            "graph.add_user": self._graph_add_user,
+            "graph.follow": self._graph_follow,
+            "graph.unfollow": self._graph_unfollow,
+            "graph.followers": self._graph_followers,
+            "graph.following": self._graph_following,
+            "stats": self._stats,
+            "metrics": self._metrics,
+        }
+
+    def execute(self, request):
+        """
+        Runs one decoded request.
+
+        Returns:
+            dict: The response object to send back.
+        """
+        self.requests += 1
+        request_id = request.get("id")
+        try:
+            operation = self._operations.get(request.get("op"))
+            if operation is None:
+                raise RequestError(f"Unknown operation {request.get('op')!r}.")
+            args = request.get("args") or {}
+            if not isinstance(args, dict):
+                raise RequestError("'args' must be an object.")
+            return {"id": request_id, "ok": True, "result": operation(**args)}
+        except (RequestError, PermissionError) as error:
+            message = str(error)
+        except (TypeError, ValueError, KeyError) as error:
+            message = f"Bad request: {error}"
+        except Exception as error:
+            # Any other failure is still reported to the client; it must
+            # never reach the worker loop, which serves every connection
+            message = f"Internal error: {type(error).__name__}: {error}"
+        self.errors += 1
+        return {"id": request_id, "ok": False, "error": message}
+
+    def _user(self, name):
+        user = self.graph.registry.by_name(name)
+        if user is None:
+            raise RequestError(f"No user named {name!r}.")
+        return user
+
+    def _inventory_search(self, product_id):
+        return _product_to_json(self.inventory.search(product_id))
+
+    def _inventory_search_many(self, product_ids):
+        return [_product_to_json(product) for product in self.inventory.search_many(product_ids)]
+
+    def _inventory_insert(self, product_id, name, price, quantity):
+        product = Product(str(product_id), str(name), _finite(price, "price"),
+                          _whole_number(quantity, "quantity"))
+        self.inventory.insert(product.product_id, product)
+        return True
+
+    def _graph_add_user(self, name, gender="", biography="", privacy="public"):
+        if privacy not in ("public", "private"):
+            raise RequestError("privacy must be 'public' or 'private'.")
+        if self.graph.registry.by_name(name) is not None:
+            raise RequestError(f"A user named {name!r} already exists.")
+        self.graph.add_vertex(Person(str(name), str(gender), str(biography), privacy))
+        return True
+
+    def _graph_follow(self, follower, followee):
+        vertex_from, vertex_to = self._user(follower), self._user(followee)
+        if vertex_from is vertex_to:
+            raise RequestError("Users cannot follow themselves.")
+        if self.graph.has_edge(vertex_from, vertex_to):
+            return False
+        self.graph.add_edge(vertex_from, vertex_to)
+        return True
+
+    def _graph_unfollow(self, follower, followee):
+        return self.graph.remove_edge(self._user(follower), self._user(followee))
+
+    def _graph_list(self, query, user, viewer=None, cursor=None,
+                    page_size=graph_queries.DEFAULT_PAGE_SIZE):
+        page = query(self.graph, self._user(user),
+                     viewer=None if viewer is None else self._user(viewer),
+                     cursor=cursor, page_size=int(page_size))
+        return {"users": [person.get_name() for person in page], "next_cursor": page.next_cursor}
+
+    def _graph_followers(self, **args):
+        return self._graph_list(graph_queries.followers, **args)
+
+    def _graph_following(self, **args):
+        return self._graph_list(graph_queries.following, **args)
+
+    def _stats(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "products": len(self.inventory),
+            "users": self.graph.vertex_count,
+            "follows": self.graph.edge_count,
+        }
+
+    def _metrics(self):
+        registry = metrics.active_registry()
+        if registry is None:
+            raise RequestError("Instrumentation is off; start the service with --metrics.")
+        return registry.to_prometheus()
+
+
+# --- Step 3: The asyncio Server ---
+#
+# Each connection has a reader task (this coroutine) and a writer task.
+# Requests from every connection go into one bounded queue, and a single
+# worker takes them off in batches of up to 'max_batch', runs the whole
+# batch and hands each result back through a future. One wake-up of the
+# worker therefore serves many requests.
+#
+# Backpressure comes from the bounded queues: a connection may only have
+# 'max_in_flight' requests waiting for an answer, and the shared queue only
+# holds 'queue_size' requests. When either is full the reader stops reading
+# from the socket, so a fast client is slowed down by TCP instead of the
+# server buffering without limit.
+
+class InventoryGraphService:
+    """
+    The newline-JSON server. Use start() / close(), or serve_forever().
+    """
+
+    def __init__(self, state=None, host="127.0.0.1", port=DEFAULT_PORT,
+                 max_batch=64, queue_size=1024, max_in_flight=128):
+        self.state = state if state is not None else ServiceState()
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight
+        self._queue = None
+        self._server = None
+        self._worker = None
+
+    async def start(self):
+        """Starts listening. With port=0 the chosen port is stored in self.port."""
+        self._queue = asyncio.Queue(self.queue_size)
+        self._worker = asyncio.create_task(self._run_worker())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_LINE_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stops accepting connections and stops the worker."""
+        self._server.close()
+        await self._server.wait_closed()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving on {self.host}:{self.port} (newline-delimited JSON)")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _run_worker(self):
+        queue = self._queue
+        state = self.state
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            state.batches += 1
+            state.largest_batch = max(state.largest_batch, len(batch))
+            for request, future in batch:
+                if future.cancelled():
+                    continue
+                try:
+                    response = state.execute(request)
+                except Exception as error:
+                    # execute() reports its own errors; this only guards the loop
+                    # so that one request can never stop the worker
+                    response = {"id": request.get("id"), "ok": False,
+                                "error": f"Internal error: {type(error).__name__}: {error}"}
+                future.set_result(response)
+
+    async def _handle_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Queue(self.max_in_flight)  # futures in request order
+        writer_task = asyncio.create_task(self._write_responses(pending, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await pending.put(_finished(loop, {"id": None, "ok": False,
+                                                       "error": "Request line too long."}))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    await pending.put(_finished(loop, {"id": None, "ok": False,
+                                                       "error": "Request is not a JSON object."}))
+                    continue
+                future = loop.create_future()
+                await pending.put(future)  # Waits if this client has too much in flight
+                await self._queue.put((request, future))  # Waits if the server is busy
+        finally:
+            await pending.put(None)
+            await writer_task
+            writer.close()
+
+    async def _write_responses(self, pending, writer):
+        try:
+            while True:
+                future = await pending.get()
+                if future is None:
+                    break
+                writer.write((json.dumps(await future) + "\n").encode("utf-8"))
+                # Flush once there is nothing else ready to send
+                if pending.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def _finished(loop, response):
+    """Returns a future that already holds 'response'."""
+    future = loop.create_future()
+    future.set_result(response)
+    return future
+
+
+def main():
+    """Runs the service from the command line."""
+    parser = argparse.ArgumentParser(description="Serve the inventory and social graph over newline-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=64, help="Most requests run per worker wake-up.")
+    parser.add_argument("--queue-size", type=int, default=1024, help="Requests queued before clients are slowed down.")
+    parser.add_argument("--max-in-flight", type=int, default=128, help="Unanswered requests allowed per connection.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record operation counts, latencies and probe lengths (see the 'metrics' operation).")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+
+    service = InventoryGraphService(host=args.host, port=args.port, max_batch=args.max_batch,
+                                    queue_size=args.queue_size, max_in_flight=args.max_in_flight)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import argparse  # Command-line options for the load generator
+import asyncio  # Many concurrent client connections in one process
+import json  # Newline-delimited JSON requests / responses
+import random  # Picks the operation mix and the keys
+import time  # perf_counter_ns for request latency
+
+from benchmark import summarize
+from service import DEFAULT_PORT, InventoryGraphService
+
+# --- Step 1: A Pipelining Client ---
+
+class ServiceClient:
+    """
+    A client for service.py that can have many requests in flight on one
+    connection. Responses come back in request order, so each one is
+    matched to the oldest unanswered request.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = asyncio.Queue()  # futures for sent requests, oldest first
+        self._next_id = 0
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def call(self, op, **args):
+        """
+        Sends one request and waits for its response.
+
+        Returns:
+            dict: The response ({"id", "ok", "result" or "error"}).
+        """
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.put_nowait(future)
+        self._writer.write((json.dumps({"id": self._next_id, "op": op, "args": args}) + "\n").encode("utf-8"))
+        await self._writer.drain()
+        return await future
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            self._waiting.get_nowait().set_result(json.loads(line))
+        while not self._waiting.empty():
+            self._waiting.get_nowait().set_exception(ConnectionError("Connection closed by the service."))
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+
+
+# --- Step 2: Test Data and the Operation Mix ---
+
+# Share of requests for each operation (must add up to 1)
+DEFAULT_MIX = {
+    "inventory.search": 0.60,
+    "inventory.insert": 0.10,
+    "graph.followers": 0.20,
+    "graph.follow": 0.10,
+}
+
+
+def pick_followee(rng, users, follower, popular=False):
+    """
+    Picks a user number for user 'follower' to follow, never 'follower'
+    itself (the service refuses self-follows, which would skew the mix).
+
+    Args:
+        popular (bool): Favour low user numbers, so a few accounts get most follows.
+    """
+    if users < 2:
+        raise ValueError("Follows need at least 2 users.")
+    while True:
+        followee = int(users * rng.random() ** 2) if popular else rng.randrange(users)
+        if followee != follower:
+            return followee
+
+
+async def populate(client, products, users, follows_per_user, rng):
+    """Fills the service with test products, users and follows, many requests at a time."""
+    calls = [client.call("inventory.insert", product_id=f"P{i}", name=f"Product {i}",
+                         price=round(rng.uniform(1, 50), 2), quantity=rng.randint(0, 500))
+             for i in range(products)]
+    calls += [client.call("graph.add_user", name=f"user{i}",
+                          privacy="private" if rng.random() < 0.2 else "public")
+              for i in range(users)]
+    await asyncio.gather(*calls)
+    await asyncio.gather(*(client.call("graph.follow", follower=f"user{i}",
+                                       followee=f"user{pick_followee(rng, users, i, popular=True)}")
+                           for i in range(users) for _ in range(follows_per_user)))
+
+
+def make_request(op, rng, products, users):
+    """Returns (op, args) for one random request of type 'op'."""
+    if op == "inventory.search":
+        # About 1 in 10 searches is for a product that does not exist
+        return op, {"product_id": f"P{rng.randrange(int(products * 1.1) + 1)}"}
+    if op == "inventory.insert":
+        return op, {"product_id": f"P{rng.randrange(products)}", "name": "Restocked",
+                    "price": 9.99, "quantity": rng.randint(0, 500)}
+    if op == "graph.followers":
+        return op, {"user": f"user{int(users * rng.random() ** 2)}",
+                    "viewer": f"user{rng.randrange(users)}", "page_size": 20}
+    if op == "graph.follow":
+        follower = rng.randrange(users)
+        return op, {"follower": f"user{follower}", "followee": f"user{pick_followee(rng, users, follower)}"}
+    raise ValueError(f"No request generator for {op!r}.")
+
+
+# --- Step 3: The Load Test ---
+
+async def _run_connection(client, requests, in_flight, mix, rng, products, users, latencies, errors):
+    """Sends 'requests' requests on one connection, keeping up to 'in_flight' outstanding."""
+    ops, weights = list(mix), list(mix.values())
+    clock = time.perf_counter_ns
+
+    async def one_request():
+        op, args = make_request(rng.choices(ops, weights)[0], rng, products, users)
+        start = clock()
+        response = await client.call(op, **args)
+        latencies[op].append(clock() - start)
+        if not response["ok"]:
+            errors[op] = errors.get(op, 0) + 1
+
+    async def lane(count):
+        for _ in range(count):
+            await one_request()
+
+    # 'in_flight' lanes each send one request at a time
+    share, extra = divmod(requests, in_flight)
+    await asyncio.gather(*(lane(share + (lane_index < extra)) for lane_index in range(in_flight)))
+
+
+async def run_load(host="127.0.0.1", port=DEFAULT_PORT, connections=8, in_flight=8, requests=20000,
+                   products=10000, users=2000, follows_per_user=10, mix=None, seed=1, spawn_server=False):
+    """
+    Drives the service with concurrent pipelined clients.
+
+    Args:
+        host, port: Where the service listens (ignored with spawn_server).
+        connections (int): Number of client connections.
+        in_flight (int): Requests each connection keeps outstanding.
+        requests (int): Total requests to send (after populating).
+        products, users, follows_per_user (int): Size of the test data loaded first.
+        mix (dict): Operation name -> share of requests (defaults to DEFAULT_MIX).
+        seed (int): Random seed.
+        spawn_server (bool): Start a service in this process on a free port
+                             instead of connecting to a running one.
+
+    Returns:
+        dict: Requests per second, latency summaries per operation (ns) and the service's stats.
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    service = None
+    if spawn_server:
+        service = InventoryGraphService(host="127.0.0.1", port=0)
+        await service.start()
+        host, port = service.host, service.port
+
+    clients = [await ServiceClient.connect(host, port) for _ in range(connections)]
+    try:
+        await populate(clients[0], products, users, follows_per_user, rng)
+
+        latencies = {op: [] for op in mix}
+        errors = {}
+        share, extra = divmod(requests, connections)
+        start = time.perf_counter_ns()
+        await asyncio.gather(*(
+            _run_connection(client, share + (index < extra), in_flight, mix,
+                            random.Random(seed + index + 1), products, users, latencies, errors)
+            for index, client in enumerate(clients)))
+        elapsed_s = (time.perf_counter_ns() - start) / 1e9
+
+        stats = (await clients[0].call("stats"))["result"]
+    finally:
+        for client in clients:
+            await client.close()
+        if service is not None:
+            await service.close()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "params": {"connections": connections, "in_flight": in_flight, "requests": requests,
+                   "products": products, "users": users, "follows_per_user": follows_per_user,
+                   "mix": mix, "seed": seed},
+        "requests_per_second": requests / elapsed_s if elapsed_s else 0.0,
+        "elapsed_s": elapsed_s,
+        "latency": {"all": summarize(all_latencies),
+                    **{op: summarize(values) for op, values in latencies.items() if values}},
+        "errors": errors,
+        "service": stats,
+    }
+
+
+def print_load_report(report):
+    """Prints the results of run_load()."""
+    print(f"\n{report['params']['requests']} requests in {report['elapsed_s']:.2f} s: "
+          f"{report['requests_per_second']:.0f} requests/s")
+    print(f"\n{'operation':<20} {'count':>7} {'median':>9} {'p95':>9} {'p99':>9}   (ms)")
+    for op, summary in report["latency"].items():
+        print(f"{op:<20} {summary['count']:>7} {summary['median'] / 1e6:>9.2f} "
+              f"{summary['p95'] / 1e6:>9.2f} {summary['p99'] / 1e6:>9.2f}")
+    service = report["service"]
+    print(f"\nService: {service['batches']} batches (largest {service['largest_batch']}), "
+          f"{service['errors']} errors")
+
+
+def main():
+    """Runs the load generator from the command line."""
+    parser = argparse.ArgumentParser(description="Load test the inventory / social graph service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="Run the service inside this process instead of connecting to one.")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--in-flight", type=int, default=8, help="Outstanding requests per connection.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(host=args.host, port=args.port, connections=args.connections,
+                                  in_flight=args.in_flight, requests=args.requests,
+                                  products=args.products, users=args.users, seed=args.seed,
+                                  spawn_server=args.spawn_server))
+    print_load_report(report)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
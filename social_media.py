@@ -12,6 +12,9 @@ class Person:
         privacy (str): 'public' or 'private' to control profile visibility.
     """
 
+    # No per-instance __dict__: saves memory when there are millions of users
+    __slots__ = ("name", "gender", "biography", "privacy")
+
     def __init__(self, name, gender, biography, privacy="public"):
         self.name = name
         self.gender = gender
@@ -30,6 +33,197 @@ class Person:
         return self.name
 
 
+# --- Step 1b: Registry of Users and Their Integer IDs ---
+
+from collections.abc import Set  # Base class for the set-like neighbour views
+from types import MappingProxyType  # Read-only views returned by Graph.adj_list
+
+
+class PersonRegistry:
+    """
+    Gives every user a stable, dense integer id (0, 1, 2, ...) and finds
+    users by id or by name in O(1).
+
+    Ids are handed out in the order users are registered and are never
+    reused, so an id stays valid for as long as its user exists. The id is
+    what identifies a user: display names do not have to be unique, and
+    the name index keeps every id registered under a name.
+    """
+
+    def __init__(self):
+        self._vertices = []  # id -> vertex (None once the vertex is removed)
+        self._ids = {}  # vertex -> id
+        self._names = {}  # name -> {id: None, ...} in registration order
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, vertex):
+        return vertex in self._ids
+
+    def __iter__(self):
+        """Yields the registered vertices in id order."""
+        return iter(self._ids)
+
+    @property
+    def id_limit(self):
+        """One more than the largest id ever handed out (ids of removed users included)."""
+        return len(self._vertices)
+
+    def register(self, vertex):
+        """
+        Registers a vertex, or returns its id if it is already registered.
+
+        Returns:
+            int: The vertex's id.
+        """
+        vertex_id = self._ids.get(vertex)
+        if vertex_id is not None:
+            return vertex_id
+        vertex_id = len(self._vertices)
+        self._vertices.append(vertex)
+        self._ids[vertex] = vertex_id
+        name = getattr(vertex, "name", None)
+        if name is not None:
+            self._names.setdefault(name, {})[vertex_id] = None
+        return vertex_id
+
+    def unregister(self, vertex):
+        """Removes a vertex. Its id is not given to anyone else."""
+        vertex_id = self._ids.pop(vertex)
+        self._vertices[vertex_id] = None
+        name = getattr(vertex, "name", None)
+        if name is not None:
+            same_name = self._names[name]
+            del same_name[vertex_id]
+            if not same_name:
+                del self._names[name]
+        return vertex_id
+
+    def id_of(self, vertex):
+        """Returns the id of a vertex (KeyError if it is not registered)."""
+        return self._ids[vertex]
+
+    def vertex(self, vertex_id):
+        """Returns the vertex with this id (KeyError if there is none)."""
+        vertex = self._vertices[vertex_id] if 0 <= vertex_id < len(self._vertices) else None
+        if vertex is None:
+            raise KeyError(vertex_id)
+        return vertex
+
+    def by_name(self, name):
+        """
+        Returns the vertex with this name, or None. If several users share
+        the name, the one registered first is returned (see all_by_name()).
+        """
+        same_name = self._names.get(name)
+        return None if not same_name else self._vertices[next(iter(same_name))]
+
+    def all_by_name(self, name):
+        """Returns every vertex with this name, in registration order."""
+        return [self._vertices[vertex_id] for vertex_id in self._names.get(name, ())]
+
+    def items(self):
+        """Yields (id, vertex) pairs in id order."""
+        for vertex, vertex_id in self._ids.items():
+            yield vertex_id, vertex
+
+
+class NeighbourIds:
+    """
+    The ids of one vertex's neighbours: an insertion-ordered set that can
+    also be read from a position, so a page of followers can resume right
+    after the last one shown instead of counting from the start.
+
+    Ids are kept in a list in the order they were added, and a dict maps
+    each id to its slot in that list. A removed id leaves a hole (None);
+    once there are more holes than ids the list is packed again, so holes
+    never cost more than the ids themselves.
+    """
+
+    __slots__ = ("_slots", "_index")
+
+    MIN_HOLES_TO_PACK = 32
+
+    def __init__(self, ids=()):
+        self._slots = list(ids)
+        self._index = dict(zip(self._slots, range(len(self._slots))))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, vertex_id):
+        return vertex_id in self._index
+
+    def __iter__(self):
+        # The dict keeps insertion order, which is also slot order
+        return iter(self._index)
+
+    def add(self, vertex_id):
+        """Appends an id. Returns False if it was already there."""
+        if vertex_id in self._index:
+            return False
+        self._index[vertex_id] = len(self._slots)
+        self._slots.append(vertex_id)
+        return True
+
+    def remove(self, vertex_id):
+        """Removes an id (KeyError if it is not there)."""
+        slots = self._slots
+        slots[self._index.pop(vertex_id)] = None
+        # Holes at the end are simply dropped, so slot_limit stays tight
+        while slots and slots[-1] is None:
+            slots.pop()
+        holes = len(slots) - len(self._index)
+        if holes >= self.MIN_HOLES_TO_PACK and holes > len(self._index):
+            self._slots = list(self._index)
+            self._index = dict(zip(self._slots, range(len(self._slots))))
+
+    @property
+    def slot_limit(self):
+        """One more than the last slot in use."""
+        return len(self._slots)
+
+    def slot_of(self, vertex_id):
+        """Returns the slot holding an id, or None if it is not there."""
+        return self._index.get(vertex_id)
+
+    def iter_from(self, slot):
+        """Yields (slot, id) for every id at 'slot' or later, in order."""
+        slots = self._slots
+        for position in range(slot, len(slots)):
+            vertex_id = slots[position]
+            if vertex_id is not None:
+                yield position, vertex_id
+
+
+class NeighbourView(Set):
+    """
+    A read-only, set-like view of one vertex's neighbours.
+
+    The graph stores neighbours as integer ids (NeighbourIds); this view
+    turns them back into vertex objects on the fly, without copying them
+    into a list.
+    Membership tests ('x in view') are O(1).
+    """
+
+    __slots__ = ("_ids", "_registry")
+
+    def __init__(self, neighbour_ids, registry):
+        self._ids = neighbour_ids
+        self._registry = registry
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return map(self._registry._vertices.__getitem__, self._ids)
+
+    def __contains__(self, vertex):
+        vertex_id = self._registry._ids.get(vertex)
+        return vertex_id is not None and vertex_id in self._ids
+
+
 # --- Step 2: Construct the Graph Data Structure (Q2.1) ---
 
 class Graph:
@@ -39,11 +233,78 @@ class Graph:
     """
 
     def __init__(self):
-        # self.adj_list is our adjacency list
-        # It's a dictionary where:
-        # Key = vertex
-        # Value = list of adjacent vertices (outgoing edges)
-        self.adj_list = {}
+        # self.registry maps every vertex to a small integer id and back.
+        # Internally the graph only stores these ids, so each edge costs one
+        # int key in a dict instead of a reference to the vertex's own hash
+        # entry, and snapshots / files can use the ids directly.
+        self.registry = PersonRegistry()
+
+        # self._out is our adjacency list, indexed by vertex id
+        # Each entry is a NeighbourIds holding the ids of the adjacent vertices
+        # (outgoing edges), or None if that vertex was removed.
+        # Like _in below, it is an insertion-ordered set: membership checks,
+        # adds and removals are O(1) on average, the neighbours come out in
+        # the order the edges were added, and a list can be read from any
+        # position (used to resume paginated queries).
+        self._out = []
+
+        # self._in is the reverse index (incoming edges), indexed the same way.
+        # Each entry holds the ids of the vertices with an edge *to* this vertex.
+        # Keeping this up to date in add_edge means we never have to scan the
+        # whole graph to find someone's followers.
+        self._in = []
+
+        self._edge_count = 0
+
+        # Functions called as listener(id_from, id_to) after an edge is added
+        # or removed (e.g. to invalidate cached query results). See
+        # add_edge_listener().
+        self._edge_listeners = []
+
+    @property
+    def vertex_count(self):
+        return len(self.registry)
+
+    @property
+    def edge_count(self):
+        return self._edge_count
+
+    def adjacency(self):
+        """
+        Returns a snapshot of the adjacency list as {vertex: {neighbour: None, ...}}.
+
+        The dicts are new on every call (O(V + E)) and are not updated when
+        the graph changes, so the caller may modify them freely.
+        """
+        vertex_at = self.registry._vertices.__getitem__
+        return {vertex: dict.fromkeys(map(vertex_at, self._out[vertex_id]))
+                for vertex_id, vertex in self.registry.items()}
+
+    def in_adjacency(self):
+        """Returns a snapshot of the reverse index as {vertex: {follower: None, ...}}, like adjacency()."""
+        vertex_at = self.registry._vertices.__getitem__
+        return {vertex: dict.fromkeys(map(vertex_at, self._in[vertex_id]))
+                for vertex_id, vertex in self.registry.items()}
+
+    @property
+    def adj_list(self):
+        """
+        A read-only view of adjacency(), kept for code written against older
+        versions of Graph, which stored the adjacency list in this attribute.
+
+        Every access builds a new O(V + E) snapshot, so read it once rather
+        than in a loop, and use iter_outgoing() or successors() to look at
+        one vertex. Assigning to it, or to any of its inner mappings, raises
+        TypeError; call adjacency() for a copy that can be changed.
+        """
+        return MappingProxyType({vertex: MappingProxyType(neighbours)
+                                 for vertex, neighbours in self.adjacency().items()})
+
+    @property
+    def in_adj_list(self):
+        """A read-only view of in_adjacency(). Each access builds a new snapshot, like adj_list."""
+        return MappingProxyType({vertex: MappingProxyType(followers)
+                                 for vertex, followers in self.in_adjacency().items()})
 
     def add_vertex(self, vertex):
         """
@@ -53,9 +314,11 @@ class Graph:
             vertex: The vertex object to be added.
         """
         # Check if the vertex is not already in the graph
-        if vertex not in self.adj_list:
-            # Add it to the dictionary with an empty list as its value
-            self.adj_list[vertex] = []
+        if vertex not in self.registry:
+            self.registry.register(vertex)
+            # Give it empty neighbour sets at its new id
+            self._out.append(NeighbourIds())
+            self._in.append(NeighbourIds())
             # print(f"Added vertex: {vertex.get_name()}")
 
     def add_edge(self, vertex_from, vertex_to):
@@ -66,16 +329,169 @@ class Graph:
             vertex_from: The vertex where the edge starts.
             vertex_to: The vertex where the edge ends.
         """
+        ids = self.registry._ids
+        id_from = ids.get(vertex_from)
+        id_to = ids.get(vertex_to)
         # Check that both vertices exist in the graph first
-        if vertex_from in self.adj_list and vertex_to in self.adj_list:
-            # Add vertex_to to the list of vertex_from
+        if id_from is not None and id_to is not None:
+            # Add vertex_to to the neighbours of vertex_from
             # This represents the "follows" relationship
-            if vertex_to not in self.adj_list[vertex_from]:
-                self.adj_list[vertex_from].append(vertex_to)
+            if self._out[id_from].add(id_to):
+                # Record the same edge in the reverse index
+                self._in[id_to].add(id_from)
+                self._edge_count += 1
+                self._edge_changed(id_from, id_to)
                 # print(f"Added edge: {vertex_from.get_name()} -> {vertex_to.get_name()}")
         else:
             print("Error: One or both vertices not found in graph.")
 
+    def add_vertices(self, vertices):
+        """
+        Adds many vertices in one call (vertices already in the graph are skipped).
+
+        Returns:
+            int: The number of new vertices added.
+        """
+        registry = self.registry
+        out_lists = self._out
+        in_lists = self._in
+        added = 0
+        for vertex in vertices:
+            if vertex not in registry:
+                registry.register(vertex)
+                out_lists.append(NeighbourIds())
+                in_lists.append(NeighbourIds())
+                added += 1
+        return added
+
+    def add_edges(self, edges):
+        """
+        Adds many directed edges in one call.
+
+        Edges that already exist are skipped. Edges with an unknown vertex are
+        skipped too, and reported with a single error message at the end.
+
+        Args:
+            edges: An iterable of (vertex_from, vertex_to) pairs.
+
+        Returns:
+            int: The number of new edges added.
+        """
+        ids = self.registry._ids
+        out_lists = self._out
+        in_lists = self._in
+        listeners = self._edge_listeners
+        added = 0
+        missing = 0
+        for vertex_from, vertex_to in edges:
+            id_from = ids.get(vertex_from)
+            id_to = ids.get(vertex_to)
+            if id_from is None or id_to is None:
+                missing += 1
+                continue
+            # NeighbourIds.add() written out inline: this loop runs once per edge
+            following = out_lists[id_from]._index
+            if id_to not in following:
+                out_slots = out_lists[id_from]._slots
+                following[id_to] = len(out_slots)
+                out_slots.append(id_to)
+                followers = in_lists[id_to]
+                in_slots = followers._slots
+                followers._index[id_from] = len(in_slots)
+                in_slots.append(id_from)
+                added += 1
+                if listeners:
+                    self._edge_changed(id_from, id_to)
+        self._edge_count += added
+        if missing:
+            print(f"Error: {missing} edge(s) skipped because a vertex was not found in graph.")
+        return added
+
+    def add_edge_listener(self, listener):
+        """
+        Registers a function to be called as listener(id_from, id_to) after
+        every edge that is added or removed, including the edges removed
+        by remove_vertex(). The ids are the registry's integer ids.
+        """
+        self._edge_listeners.append(listener)
+
+    def remove_edge_listener(self, listener):
+        """Stops calling a function registered with add_edge_listener()."""
+        self._edge_listeners.remove(listener)
+
+    def _edge_changed(self, id_from, id_to):
+        for listener in self._edge_listeners:
+            listener(id_from, id_to)
+
+    def has_edge(self, vertex_from, vertex_to):
+        """
+        Checks whether the directed edge (from -> to) exists, in O(1).
+
+        Returns:
+            bool: True if vertex_from has an edge to vertex_to.
+        """
+        ids = self.registry._ids
+        id_from = ids.get(vertex_from)
+        id_to = ids.get(vertex_to)
+        return id_from is not None and id_to is not None and id_to in self._out[id_from]
+
+    def remove_edge(self, vertex_from, vertex_to):
+        """
+        Removes the directed edge (from -> to), e.g. an "unfollow".
+
+        Args:
+            vertex_from: The vertex where the edge starts.
+            vertex_to: The vertex where the edge ends.
+
+        Returns:
+            bool: True if the edge existed and was removed, otherwise False.
+        """
+        ids = self.registry._ids
+        id_from = ids.get(vertex_from)
+        id_to = ids.get(vertex_to)
+        if id_from is None or id_to is None:
+            print("Error: One or both vertices not found in graph.")
+            return False
+        if id_to not in self._out[id_from]:
+            return False
+        # Remove the edge from both the adjacency list and the reverse index
+        self._out[id_from].remove(id_to)
+        self._in[id_to].remove(id_from)
+        self._edge_count -= 1
+        self._edge_changed(id_from, id_to)
+        return True
+
+    def remove_vertex(self, vertex):
+        """
+        Removes a vertex and every edge into or out of it.
+
+        The cost is proportional to the vertex's own degree, not the graph size.
+
+        Returns:
+            bool: True if the vertex existed and was removed, otherwise False.
+        """
+        if vertex not in self.registry:
+            return False
+        vertex_id = self.registry.unregister(vertex)
+        following = self._out[vertex_id]
+        followers = self._in[vertex_id]
+        # A self-follow is in both sets but is only one edge
+        self._edge_count -= len(following) + len(followers) - (vertex_id in following)
+        # Drop the outgoing edges from the reverse index of each neighbour
+        for id_to in following:
+            self._in[id_to].remove(vertex_id)
+        # Drop the incoming edges from the adjacency list of each follower
+        for id_from in followers:
+            self._out[id_from].remove(vertex_id)
+        self._out[vertex_id] = None
+        self._in[vertex_id] = None
+        if self._edge_listeners:
+            for id_to in following:
+                self._edge_changed(vertex_id, id_to)
+            for id_from in followers:
+                self._edge_changed(id_from, vertex_id)
+        return True
+
     def list_outgoing_adjacent_vertex(self, vertex):
         """
         Lists all vertices that have an outgoing edge from the given vertex.
@@ -86,32 +502,249 @@ class Graph:
         Returns:
             list: A list of adjacent vertices, or an empty list if none.
         """
-        if vertex in self.adj_list:
-            # This is simple: just return the list of adjacent vertices
-            return self.adj_list[vertex]
+        if vertex in self.registry:
+            # This is simple: just return the adjacent vertices (in the order they were added)
+            return list(self.iter_outgoing(vertex))
         else:
             print("Error: Vertex not found.")
             return []
 
+    def list_incoming_adjacent_vertex(self, vertex):
+        """
+        Lists all vertices that have an edge pointing *to* the given vertex
+        (for a social graph: the vertex's followers).
+
+        Uses the reverse index, so the cost depends only on the number of
+        followers, not on the size of the graph.
+
+        Args:
+            vertex: The vertex to check.
+
+        Returns:
+            list: A list of vertices with an edge to 'vertex', or an empty list if none.
+        """
+        if vertex in self.registry:
+            return list(self.iter_incoming(vertex))
+        else:
+            print("Error: Vertex not found.")
+            return []
+
+    def iter_outgoing(self, vertex):
+        """
+        Returns a read-only, set-like view of the vertices 'vertex' has an
+        edge to, without copying them into a list. Empty if the vertex is unknown.
+        """
+        vertex_id = self.registry._ids.get(vertex)
+        return NeighbourView(() if vertex_id is None else self._out[vertex_id], self.registry)
+
+    def iter_incoming(self, vertex):
+        """
+        Returns a read-only, set-like view of the vertices with an edge to
+        'vertex', without copying them into a list. Empty if the vertex is unknown.
+        """
+        vertex_id = self.registry._ids.get(vertex)
+        return NeighbourView(() if vertex_id is None else self._in[vertex_id], self.registry)
+
+    def in_degree(self, vertex):
+        """Returns the number of incoming edges (followers) of a vertex in O(1)."""
+        vertex_id = self.registry._ids.get(vertex)
+        return 0 if vertex_id is None else len(self._in[vertex_id])
+
+    def out_degree(self, vertex):
+        """Returns the number of outgoing edges (following) of a vertex in O(1)."""
+        vertex_id = self.registry._ids.get(vertex)
+        return 0 if vertex_id is None else len(self._out[vertex_id])
+
+    # The id-level methods below match CSRGraph's, so code written against
+    # them (like graph_traversal) works on a Graph and on a snapshot alike.
+
+    def id_of(self, vertex):
+        """Returns the integer id of a vertex (KeyError if it is not in the graph)."""
+        return self.registry.id_of(vertex)
+
+    def vertex(self, vertex_id):
+        """Returns the vertex object with this id."""
+        return self.registry.vertex(vertex_id)
+
+    def successors(self, vertex_id):
+        """Returns the NeighbourIds of the ids that vertex_id has an edge to (do not modify it)."""
+        return self._out[vertex_id]
+
+    def predecessors(self, vertex_id):
+        """Returns the NeighbourIds of the ids with an edge to vertex_id (its followers; do not modify it)."""
+        return self._in[vertex_id]
+
     def get_all_vertices(self):
         """
         A helper method to get all vertices in the graph.
 
         Returns:
-            list: A list of all vertex objects.
+            list: A list of all vertex objects, in the order they were added.
+        """
+        # The registry holds every vertex, in id order
+        return list(self.registry)
+
+    def freeze(self):
         """
-        # The keys of our dictionary are all the vertices
-        return list(self.adj_list.keys())
+        Takes an immutable CSR (compressed sparse row) snapshot of the graph.
+
+        Analytics can walk the snapshot's contiguous integer arrays while
+        this Graph keeps accepting changes.
+
+        Returns:
+            CSRGraph: The snapshot.
+        """
+        return freeze(self)
+
+    @classmethod
+    def from_csr(cls, csr):
+        """
+        Builds a new, mutable Graph from a CSRGraph snapshot (the reverse of
+        freeze()). Vertex ids are kept, so each neighbour set is built in one
+        call straight from the snapshot's arrays.
+        """
+        graph = cls()
+        graph.add_vertices(csr.vertices)
+        if len(graph.registry) != csr.vertex_count:
+            raise ValueError("The snapshot's vertices are not unique.")
+        graph._out = [NeighbourIds(csr.successors(vertex_id)) for vertex_id in range(csr.vertex_count)]
+        graph._in = [NeighbourIds(csr.predecessors(vertex_id)) for vertex_id in range(csr.vertex_count)]
+        graph._edge_count = csr.edge_count
+        return graph
+
+
+# --- Step 2b: Frozen CSR Snapshot for Analytics ---
+
+import operator  # operator.sub lets map() work out degrees without a Python loop
+from array import array  # Compact, contiguous integer storage
+
+try:
+    import numpy  # Optional: zero-copy NumPy views of the snapshot arrays
+except ImportError:
+    numpy = None
+
+
+class CSRGraph:
+    """
+    An immutable Compressed Sparse Row (CSR) snapshot of a Graph.
+
+    Every vertex gets an integer id 0..n-1. The neighbours of vertex i are
+    neighbours[offsets[i]:offsets[i + 1]], so the whole edge list sits in
+    one contiguous array('q') instead of one Python container per vertex.
+    The same layout is kept for incoming edges (in_offsets / in_neighbours).
+
+    Created with Graph.freeze(); later changes to the Graph do not affect it.
+    """
+
+    def __init__(self, vertices, offsets, neighbours, in_offsets, in_neighbours):
+        self.vertices = vertices  # id -> vertex object
+        self.ids = {vertex: i for i, vertex in enumerate(vertices)}  # vertex -> id
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.in_offsets = in_offsets
+        self.in_neighbours = in_neighbours
+
+    @property
+    def vertex_count(self):
+        return len(self.vertices)
+
+    @property
+    def edge_count(self):
+        return len(self.neighbours)
+
+    def id_of(self, vertex):
+        """Returns the integer id of a vertex (KeyError if it was not in the graph)."""
+        return self.ids[vertex]
+
+    def vertex(self, vertex_id):
+        """Returns the vertex object with this id."""
+        return self.vertices[vertex_id]
+
+    def successors(self, vertex_id):
+        """Returns the ids that vertex_id has an edge to, as a zero-copy memoryview."""
+        return memoryview(self.neighbours)[self.offsets[vertex_id]:self.offsets[vertex_id + 1]]
+
+    def predecessors(self, vertex_id):
+        """Returns the ids with an edge to vertex_id (its followers), as a zero-copy memoryview."""
+        return memoryview(self.in_neighbours)[self.in_offsets[vertex_id]:self.in_offsets[vertex_id + 1]]
+
+    def out_degree(self, vertex_id):
+        return self.offsets[vertex_id + 1] - self.offsets[vertex_id]
+
+    def in_degree(self, vertex_id):
+        return self.in_offsets[vertex_id + 1] - self.in_offsets[vertex_id]
+
+    def out_degrees(self):
+        """Returns every vertex's out-degree as an array('q'), indexed by id."""
+        offsets = self.offsets
+        return array('q', map(operator.sub, offsets[1:], offsets[:-1]))
+
+    def in_degrees(self):
+        """Returns every vertex's in-degree as an array('q'), indexed by id."""
+        in_offsets = self.in_offsets
+        return array('q', map(operator.sub, in_offsets[1:], in_offsets[:-1]))
+
+    def edges(self):
+        """Yields every edge as a (from id, to id) pair."""
+        offsets = self.offsets
+        neighbours = self.neighbours
+        for vertex_id in range(len(self.vertices)):
+            for index in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                yield vertex_id, neighbours[index]
+
+    def as_numpy(self):
+        """
+        Returns (offsets, neighbours, in_offsets, in_neighbours) as NumPy int64
+        arrays that share memory with the snapshot. Requires NumPy.
+        """
+        if numpy is None:
+            raise RuntimeError("NumPy is not installed.")
+        return tuple(numpy.frombuffer(arr, dtype=numpy.int64)
+                     for arr in (self.offsets, self.neighbours, self.in_offsets, self.in_neighbours))
+
+
+def _build_csr(rows, new_ids):
+    """
+    Packs rows of neighbour ids into CSR offsets/neighbours arrays.
+
+    Removed vertices (None rows) are skipped. If 'new_ids' is given, every
+    id is translated through it so the snapshot's ids are 0..n-1 with no gaps.
+    """
+    offsets = array('q', [0])
+    neighbours = array('q')
+    for row in rows:
+        if row is None:
+            continue
+        neighbours.extend(row if new_ids is None else map(new_ids.__getitem__, row))
+        offsets.append(len(neighbours))
+    return offsets, neighbours
+
+
+def freeze(graph):
+    """
+    Builds a CSRGraph snapshot of 'graph'. See Graph.freeze().
+    """
+    vertices = graph.get_all_vertices()
+    new_ids = None
+    if len(vertices) != graph.registry.id_limit:
+        # Some vertices were removed: close the gaps they left in the ids
+        new_ids = {old_id: new_id for new_id, (old_id, _) in enumerate(graph.registry.items())}
+    offsets, neighbours = _build_csr(graph._out, new_ids)
+    in_offsets, in_neighbours = _build_csr(graph._in, new_ids)
+    return CSRGraph(vertices, offsets, neighbours, in_offsets, in_neighbours)
 
 
 # --- Step 3: Create the Social Media App & CLI (Q2.3, Q2.4, Q2.5) ---
 
+import graph_traversal  # BFS, degrees of separation, mutual follows and suggestions
+
 def find_followers(graph, user_to_find):
     """
     Helper function to find all followers of a specific user.
     This is for the mandatory feature Q2.5.d.
 
-    We have to check every single vertex and see who *they* follow.
+    The graph keeps a reverse (incoming-edge) index, so we read the
+    followers directly instead of checking who every vertex follows.
 
     Args:
         graph (Graph): The graph object.
@@ -120,21 +753,43 @@ def find_followers(graph, user_to_find):
     Returns:
         list: A list of Person objects who follow 'user_to_find'.
     """
-    followers = []
+    return graph.list_incoming_adjacent_vertex(user_to_find)
 
-    # Get a list of all users in the graph
-    all_users = graph.get_all_vertices()
 
-    for user in all_users:
-        # Get the list of people this 'user' follows
-        following_list = graph.list_outgoing_adjacent_vertex(user)
+def print_users(graph):
+    """Prints every user's name next to the number used to pick them (their id + 1)."""
+    for user_id, user in graph.registry.items():
+        print(f"{user_id + 1}.) {user.get_name()}")
 
-        # Check if 'user_to_find' is in that list
-        if user_to_find in following_list:
-            # If yes, then 'user' is a follower
-            followers.append(user)
 
-    return followers
+def select_user(graph, prompt):
+    """
+    Prints a numbered list of all users and asks the user to pick one, either
+    by number or by name. Both lookups go through the graph's registry in O(1).
+
+    Args:
+        graph (Graph): The graph object.
+        prompt (str): The question to ask, e.g. "Select user".
+
+    Returns:
+        Person: The chosen Person, or None if the choice was invalid.
+    """
+    print_users(graph)
+    answer = input(f"{prompt} (number or name): ").strip()
+
+    same_name = graph.registry.all_by_name(answer)
+    if len(same_name) == 1:
+        return same_name[0]
+    if same_name:
+        print(f"{len(same_name)} users are named '{answer}'. Please enter their number instead.")
+        return None
+    try:
+        return graph.registry.vertex(int(answer) - 1)
+    except ValueError:
+        print("Invalid input. Please enter a number or a user's name.")
+    except KeyError:
+        print("Invalid selection.")
+    return None
 
 
 def main_social_media():
@@ -184,93 +839,124 @@ def main_social_media():
         print("2. View a user's profile details")
         print("3. View who a user follows (Following)")
         print("4. View a user's followers")
-        print("5. Exit")
-        choice = input("Enter your choice (1-5): ")
+        print("5. Follow a user")
+        print("6. Unfollow a user")
+        print("7. Mutual follows & people you may know")
+        print("8. Degrees of separation between two users")
+        print("9. Exit")
+        choice = input("Enter your choice (1-9): ")
 
         if choice == '1':
             # --- Q2.5.a: Display a list of all the users’ names ---
             print("\n--- All User Names ---")
-            all_users = social_graph.get_all_vertices()
-            for i, user in enumerate(all_users):
-                print(f"{i + 1}.) {user.get_name()}")
+            print_users(social_graph)
 
         elif choice == '2':
             # --- Q2.5.b: View the profile of any one person in detail ---
             print("\n--- View Profile Details ---")
-            all_users = social_graph.get_all_vertices()
-            for i, user in enumerate(all_users):
-                print(f"{i + 1}.) {user.get_name()}")
-
-            try:
-                user_idx = int(input(f"Select whose profile to view (1-{len(all_users)}): ")) - 1
-                if 0 <= user_idx < len(all_users):
-                    user_to_view = all_users[user_idx]
-                    print(f"\n--- Profile for {user_to_view.get_name()} ---")
-                    # We just use the __str__ method of the Person object
-                    print(user_to_view)
-                else:
-                    print("Invalid selection.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+            user_to_view = select_user(social_graph, "Select whose profile to view")
+            if user_to_view is not None:
+                print(f"\n--- Profile for {user_to_view.get_name()} ---")
+                # We just use the __str__ method of the Person object
+                print(user_to_view)
 
         elif choice == '3':
             # --- Q2.5.c: View the list of followed accounts (Following) ---
             print("\n--- View Followed Accounts (Following) ---")
-            all_users = social_graph.get_all_vertices()
-            for i, user in enumerate(all_users):
-                print(f"{i + 1}.) {user.get_name()}")
-
-            try:
-                user_idx = int(input(f"Select user (1-{len(all_users)}): ")) - 1
-                if 0 <= user_idx < len(all_users):
-                    user_to_check = all_users[user_idx]
-                    print(f"\n--- {user_to_check.get_name()} is Following: ---")
+            user_to_check = select_user(social_graph, "Select user")
+            if user_to_check is not None:
+                print(f"\n--- {user_to_check.get_name()} is Following: ---")
 
-                    # This uses the mandatory graph method
-                    following_list = social_graph.list_outgoing_adjacent_vertex(user_to_check)
+                # This uses the mandatory graph method
+                following_list = social_graph.list_outgoing_adjacent_vertex(user_to_check)
 
-                    if not following_list:
-                        print(f"{user_to_check.get_name()} is not following anyone.")
-                    else:
-                        for person in following_list:
-                            print(f" - {person.get_name()}")
+                if not following_list:
+                    print(f"{user_to_check.get_name()} is not following anyone.")
                 else:
-                    print("Invalid selection.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+                    for person in following_list:
+                        print(f" - {person.get_name()}")
 
         elif choice == '4':
             # --- Q2.5.d: View the list of followers ---
             print("\n--- View Followers ---")
-            all_users = social_graph.get_all_vertices()
-            for i, user in enumerate(all_users):
-                print(f"{i + 1}.) {user.get_name()}")
-
-            try:
-                user_idx = int(input(f"Select user (1-{len(all_users)}): ")) - 1
-                if 0 <= user_idx < len(all_users):
-                    user_to_find = all_users[user_idx]
-                    print(f"\n--- Followers of {user_to_find.get_name()}: ---")
+            user_to_find = select_user(social_graph, "Select user")
+            if user_to_find is not None:
+                print(f"\n--- Followers of {user_to_find.get_name()}: ---")
 
-                    # Use our helper function
-                    followers_list = find_followers(social_graph, user_to_find)
+                # Use our helper function
+                followers_list = find_followers(social_graph, user_to_find)
 
-                    if not followers_list:
-                        print(f"{user_to_find.get_name()} has no followers.")
+                if not followers_list:
+                    print(f"{user_to_find.get_name()} has no followers.")
+                else:
+                    for person in followers_list:
+                        print(f" - {person.get_name()}")
+
+        elif choice in ('5', '6'):
+            # --- Follow / Unfollow (adds or removes an edge) ---
+            following = choice == '5'
+            print("\n--- Follow a User ---" if following else "\n--- Unfollow a User ---")
+            follower = select_user(social_graph, "Select who you are")
+            if follower is not None:
+                print()
+                target = select_user(social_graph, "Select who to follow" if following
+                                     else "Select who to unfollow")
+                if target is None:
+                    pass
+                elif target is follower:
+                    print("Users cannot follow themselves.")
+                elif following:
+                    if social_graph.has_edge(follower, target):
+                        print(f"{follower.get_name()} already follows {target.get_name()}.")
                     else:
-                        for person in followers_list:
-                            print(f" - {person.get_name()}")
+                        social_graph.add_edge(follower, target)
+                        print(f"{follower.get_name()} now follows {target.get_name()}.")
+                elif social_graph.remove_edge(follower, target):
+                    print(f"{follower.get_name()} unfollowed {target.get_name()}.")
+                else:
+                    print(f"{follower.get_name()} does not follow {target.get_name()}.")
+
+        elif choice == '7':
+            # --- Mutual follows and friend-of-friend suggestions ---
+            print("\n--- Mutual Follows & People You May Know ---")
+            user = select_user(social_graph, "Select user")
+            if user is not None:
+                mutuals = graph_traversal.mutual_follows(social_graph, user)
+                print(f"\n{user.get_name()} and these users follow each other:")
+                if not mutuals:
+                    print(" (nobody yet)")
+                for person in mutuals:
+                    print(f" - {person.get_name()}")
+
+                suggestions = graph_traversal.suggest_follows(social_graph, user, k=3)
+                print(f"\nPeople {user.get_name()} may know:")
+                if not suggestions:
+                    print(" (no suggestions)")
+                for person, count in suggestions:
+                    print(f" - {person.get_name()} (followed by {count} of the people {user.get_name()} follows)")
+
+        elif choice == '8':
+            # --- Degrees of separation (bidirectional BFS) ---
+            print("\n--- Degrees of Separation ---")
+            source = select_user(social_graph, "Select the first user")
+            target = None
+            if source is not None:
+                print()
+                target = select_user(social_graph, "Select the second user")
+            if source is not None and target is not None:
+                path = graph_traversal.shortest_path(social_graph, source, target)
+                if path is None:
+                    print(f"\n{source.get_name()} cannot reach {target.get_name()} by following people.")
                 else:
-                    print("Invalid selection.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+                    names = " -> ".join(person.get_name() for person in path)
+                    print(f"\n{len(path) - 1} step(s): {names}")
 
-        elif choice == '5':
+        elif choice == '9':
             print("\nExiting SlowGram. Goodbye!")
             break
 
         else:
-            print("\nInvalid choice. Please enter 1-5.")
+            print("\nInvalid choice. Please enter 1-9.")
 
         input("\nPress Enter to continue...")
 
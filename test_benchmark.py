@@ -0,0 +1,24 @@
+import unittest
+
+from benchmark import Case, run_case
+
+
+class RunCaseTest(unittest.TestCase):
+    """max_time_s caps the number of samples unless it is None."""
+
+    def setUp(self):
+        self.case = Case("sum", lambda numbers: sum(numbers), lambda: list(range(100)))
+
+    def test_time_budget_cuts_samples(self):
+        result = run_case(self.case, samples=50, warmup=0, min_sample_ns=100_000, max_time_s=0.0,
+                          track_memory=False)
+        self.assertEqual(result["stats"]["count"], 3)
+
+    def test_no_budget_takes_every_sample(self):
+        result = run_case(self.case, samples=50, warmup=0, min_sample_ns=100_000, max_time_s=None,
+                          track_memory=False)
+        self.assertEqual(result["stats"]["count"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from graph_cache import CachedGraphQueries, LRUCache
+from social_media import Graph, Person
+
+
+class LRUCacheTest(unittest.TestCase):
+    """Eviction order, expiry and tag invalidation."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = LRUCache(max_entries=2, ttl=10.0, clock=lambda: self.now)
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)  # "b" is now the oldest
+        self.cache.put("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual((self.cache.get("a"), self.cache.get("c")), (1, 3))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_entries_expire(self):
+        self.cache.put("a", 1)
+        self.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.now = 10.0
+        self.assertEqual(self.cache.get("a", "gone"), "gone")
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_invalidate_tag_drops_only_tagged_entries(self):
+        self.cache.put("a", 1, tags=(7,))
+        self.cache.put("b", 2, tags=(8,))
+        self.assertEqual(self.cache.invalidate_tag(7), 1)
+        self.assertEqual(self.cache.invalidate_tag(7), 0)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+
+
+class CachedGraphQueriesTest(unittest.TestCase):
+    """Edge changes invalidate exactly the cached results that depend on them."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.a, self.b, self.c, self.d = (Person(name, "", "") for name in "abcd")
+        self.graph.add_vertices([self.a, self.b, self.c, self.d])
+        self.graph.add_edge(self.a, self.b)
+        self.graph.add_edge(self.b, self.c)
+        self.queries = CachedGraphQueries(self.graph, ttl=None)
+
+    def tearDown(self):
+        self.queries.close()
+
+    def test_results_are_cached(self):
+        self.assertEqual(self.queries.followers(self.b), (self.a,))
+        self.assertEqual(self.queries.followers(self.b), (self.a,))
+        self.assertEqual(self.queries.stats()["hits"], 1)
+
+    def test_edge_changes_refresh_results(self):
+        self.assertEqual(self.queries.following(self.a), (self.b,))
+        self.assertEqual(self.queries.mutuals(self.a), ())
+        self.graph.add_edge(self.b, self.a)
+        self.assertEqual(self.queries.mutuals(self.a), (self.b,))
+        self.graph.remove_edge(self.a, self.b)
+        self.assertEqual(self.queries.following(self.a), ())
+
+    def test_suggestions_follow_friends_of_friends(self):
+        self.assertEqual(self.queries.suggestions(self.a), ((self.c, 1),))
+        cached_d = self.queries.followers(self.d)
+        # b follows someone new: a's suggestions depend on b's edges
+        self.graph.add_edge(self.b, self.d)
+        self.assertEqual(self.queries.suggestions(self.a), ((self.c, 1), (self.d, 1)))
+        self.assertEqual(cached_d, ())
+        self.assertEqual(self.queries.followers(self.d), (self.b,))
+
+    def test_unrelated_results_stay_cached(self):
+        self.queries.followers(self.c)
+        self.graph.add_edge(self.a, self.d)
+        hits = self.queries.stats()["hits"]
+        self.queries.followers(self.c)
+        self.assertEqual(self.queries.stats()["hits"], hits + 1)
+
+    def test_close_stops_invalidation(self):
+        self.queries.followers(self.b)
+        self.queries.close()
+        self.assertEqual(len(self.queries.cache), 0)
+        self.graph.add_edge(self.c, self.b)  # Must not call into the closed cache
+
+
+if __name__ == "__main__":
+    unittest.main()
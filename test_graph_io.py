@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import graph_io
+from social_media import Graph, Person
+
+
+class GraphRoundTripTest(unittest.TestCase):
+    """Text exports and the binary format give back the same people and edges."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.graph = Graph()
+        self.people = [Person("Ann", "F", "Likes \"quotes\", commas", "private"),
+                       Person("Bo", "M", "Ünïcode bio"),
+                       Person("Cy", "", ""),
+                       Person("Di", "F", "line\nbreak")]
+        self.graph.add_vertices(self.people)
+        for a, b in ((0, 1), (1, 0), (1, 2), (2, 3), (3, 3)):
+            self.graph.add_edge(self.people[a], self.people[b])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def assertSameGraph(self, copy):
+        self.assertEqual([(p.name, p.gender, p.biography, p.privacy) for p in copy.get_all_vertices()],
+                         [(p.name, p.gender, p.biography, p.privacy) for p in self.people])
+        self.assertEqual(sorted(graph_io._edge_names(copy)), sorted(graph_io._edge_names(self.graph)))
+
+    def test_csv_and_jsonl(self):
+        for extension, export_people, export_edges in (
+                (".csv", graph_io.export_people_csv, graph_io.export_edges_csv),
+                (".jsonl", graph_io.export_people_jsonl, graph_io.export_edges_jsonl)):
+            export_people(self.graph, self.path("people" + extension))
+            export_edges(self.graph, self.path("edges" + extension))
+            copy = graph_io.import_graph(graph_io.read_people(self.path("people" + extension)),
+                                         graph_io.read_edges(self.path("edges" + extension)),
+                                         batch_size=2)
+            self.assertSameGraph(copy)
+
+    def test_binary_save_load_and_map(self):
+        path = self.path("graph.bin")
+        self.assertEqual(graph_io.save_graph(self.graph, path), (4, 5))
+        self.assertSameGraph(graph_io.load_graph(path))
+        frozen = self.graph.freeze()
+        with graph_io.open_graph(path) as mapped:
+            self.assertEqual(list(mapped.edges()), list(frozen.edges()))
+            self.assertEqual(list(mapped.in_degrees()), list(frozen.in_degrees()))
+
+    def test_not_a_graph_file(self):
+        path = self.path("junk.bin")
+        with open(path, "wb") as file:
+            file.write(b"x" * 200)
+        with self.assertRaises(ValueError):
+            graph_io.open_graph(path)
+
+    def test_unknown_names_are_skipped(self):
+        graph = graph_io.import_graph([Person("Ann", "", "")], [("Ann", "Nobody")])
+        self.assertEqual(graph.edge_count, 0)
+
+    def test_batched(self):
+        self.assertEqual(list(graph_io.batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+import graph_io
+from graph_pagerank import pagerank
+from social_media import Graph, Person
+
+
+class PageRankTest(unittest.TestCase):
+    """Serial and parallel PageRank agree, on a Graph and on a memory-mapped file."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.people = [Person(f"u{i}", "", "") for i in range(40)]
+        self.graph.add_vertices(self.people)
+        for i, person in enumerate(self.people):
+            # Everyone follows u0, and a few others
+            for target in (0, (i * 7 + 1) % 40, (i + 3) % 40):
+                if target != i:
+                    self.graph.add_edge(person, self.people[target])
+
+    def test_scores_sum_to_one_and_rank_the_hub_first(self):
+        result = pagerank(self.graph, use_numpy=False)
+        self.assertTrue(result.converged)
+        self.assertAlmostEqual(sum(result.scores.values()), 1.0, places=6)
+        self.assertIs(result.top(1)[0][0], self.people[0])
+
+    def test_parallel_on_mapped_graph(self):
+        serial = pagerank(self.graph, use_numpy=False).scores
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.bin")
+            graph_io.save_graph(self.graph, path)
+            with graph_io.open_graph(path) as mapped:
+                parallel = pagerank(mapped, workers=2, use_numpy=False).scores
+        self.assertEqual([person.get_name() for person in parallel], [p.get_name() for p in serial])
+        for (_, expected), actual in zip(serial.items(), parallel.values()):
+            self.assertAlmostEqual(actual, expected, places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+
+import graph_queries
+from social_media import Graph, Person
+
+
+class FollowerPaginationTest(unittest.TestCase):
+    """Cursors keep working while the follower list changes between pages."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.people = [Person(f"u{i}", "", "") for i in range(10)]
+        self.graph.add_vertices(self.people)
+        # u1 .. u9 follow u0, in that order
+        for person in self.people[1:]:
+            self.graph.add_edge(person, self.people[0])
+
+    def names(self, page):
+        return [person.get_name() for person in page]
+
+    def test_pages_cover_every_follower_once(self):
+        names = [person.get_name() for person in
+                 graph_queries.paginate(graph_queries.followers, self.graph, self.people[0], page_size=4)]
+        self.assertEqual(names, [f"u{i}" for i in range(1, 10)])
+
+    def test_last_id_unfollows_and_follows_again(self):
+        first = graph_queries.followers(self.graph, self.people[0], page_size=3)
+        self.assertEqual(self.names(first), ["u1", "u2", "u3"])
+        self.graph.remove_edge(self.people[3], self.people[0])
+        self.graph.add_edge(self.people[3], self.people[0])
+
+        second = graph_queries.followers(self.graph, self.people[0], cursor=first.next_cursor, page_size=3)
+        self.assertEqual(self.names(second), ["u4", "u5", "u6"])
+        rest = graph_queries.followers(self.graph, self.people[0], cursor=second.next_cursor, page_size=10)
+        # u3 followed again, so it now comes last
+        self.assertEqual(self.names(rest), ["u7", "u8", "u9", "u3"])
+        self.assertIsNone(rest.next_cursor)
+
+    def test_last_id_removed(self):
+        first = graph_queries.followers(self.graph, self.people[0], page_size=3)
+        self.graph.remove_edge(self.people[3], self.people[0])
+        second = graph_queries.followers(self.graph, self.people[0], cursor=first.next_cursor, page_size=3)
+        self.assertEqual(self.names(second), ["u4", "u5", "u6"])
+
+    def test_new_followers_show_up_on_later_pages(self):
+        first = graph_queries.followers(self.graph, self.people[0], page_size=5)
+        newcomer = Person("new", "", "")
+        self.graph.add_vertex(newcomer)
+        self.graph.add_edge(newcomer, self.people[0])
+        second = graph_queries.followers(self.graph, self.people[0], cursor=first.next_cursor, page_size=10)
+        self.assertEqual(self.names(second), ["u6", "u7", "u8", "u9", "new"])
+
+    def test_invalid_cursor(self):
+        for cursor in ("junk", "0:1", "1"):
+            with self.assertRaises(ValueError):
+                graph_queries.followers(self.graph, self.people[0], cursor=cursor)
+
+
+class PrivacyTest(unittest.TestCase):
+    """Private users only show up for themselves and their followers."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.owner = Person("owner", "", "")
+        self.secret = Person("secret", "", "", "private")
+        self.friend = Person("friend", "", "")
+        self.stranger = Person("stranger", "", "")
+        self.graph.add_vertices([self.owner, self.secret, self.friend, self.stranger])
+        self.graph.add_edge(self.secret, self.owner)
+        self.graph.add_edge(self.friend, self.owner)
+        self.graph.add_edge(self.friend, self.secret)
+
+    def test_private_follower_hidden_from_strangers(self):
+        for graph in (self.graph, self.graph.freeze()):
+            for viewer, expected in ((None, ["friend"]), (self.stranger, ["friend"]),
+                                     (self.friend, ["secret", "friend"]),
+                                     (self.secret, ["secret", "friend"])):
+                page = graph_queries.followers(graph, self.owner, viewer=viewer)
+                self.assertEqual([person.get_name() for person in page], expected)
+
+    def test_private_profile_raises(self):
+        with self.assertRaises(PermissionError):
+            graph_queries.following(self.graph, self.secret, viewer=self.stranger)
+        self.assertFalse(graph_queries.can_view(self.graph, None, self.secret))
+        self.assertTrue(graph_queries.can_view(self.graph, self.friend, self.secret))
+
+
+class FrozenGraphQueryTest(unittest.TestCase):
+    """followers, following and mutuals give the same pages on a Graph and its CSR snapshot."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.people = [Person(f"u{i}", "", "", "private" if i % 3 == 2 else "public") for i in range(30)]
+        self.graph.add_vertices(self.people)
+        for i, person in enumerate(self.people):
+            for step in (1, 2, 5, 7):
+                self.graph.add_edge(person, self.people[(i * step + 3) % 30])
+        for person in self.people[1:]:
+            self.graph.add_edge(self.people[0], person)
+
+    def test_queries_match_on_snapshot(self):
+        frozen = self.graph.freeze()
+        owner = self.people[0]
+        for query in (graph_queries.followers, graph_queries.following, graph_queries.mutuals):
+            for viewer in (owner, self.people[1], None):
+                expected = [person.get_name() for person in
+                            graph_queries.paginate(query, self.graph, owner, viewer=viewer, page_size=3)]
+                actual = [person.get_name() for person in
+                          graph_queries.paginate(query, frozen, owner, viewer=viewer, page_size=3)]
+                self.assertEqual(actual, expected, (query.__name__, viewer))
+
+    def test_mutuals_on_snapshot(self):
+        owner = self.people[0]
+        frozen = self.graph.freeze()
+        page = graph_queries.mutuals(frozen, owner, viewer=owner, page_size=100)
+        expected = [person for person in self.graph.iter_outgoing(owner)
+                    if self.graph.has_edge(person, owner)]
+        self.assertEqual(page.items, expected)
+        self.assertTrue(expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
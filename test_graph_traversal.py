@@ -0,0 +1,73 @@
+import unittest
+
+import graph_traversal
+from social_media import Graph, Person
+
+
+class TraversalTest(unittest.TestCase):
+    """BFS / DFS, shortest paths, mutual follows and suggestions, on a Graph and its snapshot."""
+
+    def setUp(self):
+        #  a -> b -> c -> d,  a -> e -> d,  b <-> a,  f is on its own
+        self.graph = Graph()
+        self.people = {name: Person(name, "", "") for name in "abcdef"}
+        self.graph.add_vertices(self.people.values())
+        for edge in ("ab", "bc", "cd", "ae", "ed", "ba"):
+            self.graph.add_edge(self.people[edge[0]], self.people[edge[1]])
+        self.graphs = (self.graph, self.graph.freeze())
+
+    def names(self, vertices):
+        return "".join(vertex.get_name() for vertex in vertices)
+
+    def test_bfs_and_dfs_order(self):
+        a = self.people["a"]
+        for graph in self.graphs:
+            self.assertEqual([(v.get_name(), depth) for v, depth in graph_traversal.bfs(graph, a)],
+                             [("a", 0), ("b", 1), ("e", 1), ("c", 2), ("d", 2)])
+            self.assertEqual(self.names(v for v, _ in graph_traversal.dfs(graph, a)), "abcde")
+            self.assertEqual(self.names(v for v, _ in graph_traversal.bfs(graph, a, max_depth=1)), "abe")
+            self.assertEqual(self.names(v for v, _ in graph_traversal.bfs(graph, self.people["d"],
+                                                                          direction="in")), "dceba")
+
+    def test_shortest_path(self):
+        a, d, f = self.people["a"], self.people["d"], self.people["f"]
+        for graph in self.graphs:
+            path = graph_traversal.shortest_path(graph, a, d)
+            self.assertEqual(len(path), 3)
+            self.assertIs(path[0], a)
+            self.assertIs(path[-1], d)
+            for step_from, step_to in zip(path, path[1:]):
+                self.assertTrue(self.graph.has_edge(step_from, step_to))
+            self.assertIsNone(graph_traversal.shortest_path(graph, d, a))
+            self.assertIsNone(graph_traversal.shortest_path(graph, a, f))
+            self.assertIsNone(graph_traversal.shortest_path(graph, a, d, max_depth=1))
+            self.assertEqual(graph_traversal.degrees_of_separation(graph, a, self.people["c"]), 2)
+            self.assertEqual(graph_traversal.shortest_path(graph, a, a), [a])
+
+    def test_unknown_vertex(self):
+        stranger = Person("stranger", "", "")
+        self.assertEqual(list(graph_traversal.bfs(self.graph, stranger)), [(stranger, 0)])
+        self.assertIsNone(graph_traversal.shortest_path(self.graph, stranger, self.people["a"]))
+        self.assertEqual(graph_traversal.suggest_follows(self.graph, stranger), [])
+        with self.assertRaises(ValueError):
+            list(graph_traversal.bfs(self.graph, self.people["a"], direction="up"))
+
+    def test_mutual_follows(self):
+        a, b, c = self.people["a"], self.people["b"], self.people["c"]
+        for graph in self.graphs:
+            self.assertEqual(graph_traversal.mutual_follows(graph, a), [b])
+            self.assertTrue(graph_traversal.is_mutual(graph, a, b))
+            self.assertFalse(graph_traversal.is_mutual(graph, b, c))
+
+    def test_suggest_follows(self):
+        # a follows b (-> c) and e (-> d); ties keep the order they were first seen
+        for graph in self.graphs:
+            suggestions = graph_traversal.suggest_follows(graph, self.people["a"], k=5)
+            self.assertEqual([(v.get_name(), count) for v, count in suggestions], [("c", 1), ("d", 1)])
+        self.graph.add_edge(self.people["b"], self.people["d"])
+        suggestions = graph_traversal.suggest_follows(self.graph, self.people["a"], k=1)
+        self.assertEqual([(v.get_name(), count) for v, count in suggestions], [("d", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
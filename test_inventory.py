@@ -0,0 +1,96 @@
+import unittest
+
+from inventory import ConcurrentHashTable, HashTable, OpenAddressingHashTable, Product, ProductTable
+
+
+class HashTableResizeTest(unittest.TestCase):
+    """Inserting and searching while an incremental resize is still running."""
+
+    def test_insert_then_search_during_rehash(self):
+        table = HashTable(size=8, verbose=False)
+        inserted = []
+        saw_resize = False
+        for i in range(200):
+            key = f"P{i}"
+            table.insert(key, Product(key, f"Product {i}", 1.0, i))
+            inserted.append(key)
+            if table._old_buckets is not None:
+                saw_resize = True
+                # Every key so far must be found, including the one just inserted
+                for existing in inserted:
+                    self.assertIsNotNone(table.search(existing), existing)
+        self.assertTrue(saw_resize)
+        self.assertEqual(len(table), 200)
+
+    def test_update_during_rehash_keeps_count(self):
+        table = HashTable(size=4, verbose=False)
+        for i in range(4):
+            table.insert(f"P{i}", i)
+        self.assertIsNotNone(table._old_buckets)
+        table.insert("P0", "updated")
+        self.assertEqual(table.search("P0"), "updated")
+        self.assertEqual(len(table), 4)
+
+
+class OpenAddressingTombstoneTest(unittest.TestCase):
+    """Deleted slots keep probe sequences intact and are reused or cleared."""
+
+    def setUp(self):
+        # Every key hashes to the same slot, so they all share one probe sequence
+        self.table = OpenAddressingHashTable(16, verbose=False, hash_function=lambda key: 0)
+        for i in range(6):
+            self.table.insert(f"P{i}", i)
+
+    def test_keys_after_a_tombstone_are_still_found(self):
+        self.assertTrue(self.table.delete("P2"))
+        self.assertFalse(self.table.delete("P2"))
+        self.assertIsNone(self.table.search("P2"))
+        for i in (0, 1, 3, 4, 5):
+            self.assertEqual(self.table.search(f"P{i}"), i)
+        self.assertEqual(len(self.table), 5)
+        self.assertEqual(self.table.stats()["tombstones"], 1)
+
+    def test_insert_reuses_tombstone_without_duplicating(self):
+        self.table.delete("P1")
+        self.table.insert("P4", "updated")  # Already present after the tombstone
+        self.assertEqual(sorted(key for key, _ in self.table.items()), ["P0", "P2", "P3", "P4", "P5"])
+        self.table.insert("NEW", "new")
+        self.assertEqual(self.table.stats()["tombstones"], 0)
+        self.assertEqual(self.table.search("NEW"), "new")
+        self.assertEqual(len(self.table), 6)
+
+    def test_rebuild_clears_tombstones(self):
+        table = OpenAddressingHashTable(8, verbose=False)
+        for round_number in range(20):
+            for i in range(4):
+                table.insert(f"R{round_number}-{i}", i)
+            for i in range(4):
+                self.assertTrue(table.delete(f"R{round_number}-{i}"))
+        stats = table.stats()
+        self.assertEqual(len(table), 0)
+        # Tombstones count towards the load factor, so they never fill the table
+        self.assertLessEqual(stats["tombstones"], table.max_load_factor * stats["buckets"])
+        self.assertGreater(stats["resize_count"], 0)
+        self.assertIsNone(table.search("R0-0"))
+
+
+class ConcurrentHashTableTest(unittest.TestCase):
+    """The concurrent table takes the same constructor arguments as the other tables."""
+
+    def test_usable_as_product_table_index(self):
+        products = ProductTable(index_class=ConcurrentHashTable)
+        products.add_product(Product("D101", "Diapers", 12.5, 40))
+        self.assertEqual(products.search("D101").name, "Diapers")
+        self.assertIsNone(products.search("W201"))
+
+    def test_hash_function_is_used(self):
+        table = ConcurrentHashTable(4, verbose=False, hash_function="fnv1a")
+        table.insert_many((f"P{i}", i) for i in range(50))
+        self.assertEqual(table.search_many(["P0", "P49", "missing"]), [0, 49, None])
+        self.assertTrue(table.delete("P0"))
+        self.assertEqual(len(table), 49)
+        self.assertEqual(table.hash_name, "fnv1a")
+
+
+if __name__ == "__main__":
+    unittest.main()
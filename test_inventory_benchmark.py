@@ -0,0 +1,19 @@
+import unittest
+
+from inventory_benchmark import run_benchmarks
+
+
+class RunBenchmarksTest(unittest.TestCase):
+    """Every requested sample is taken, even when it overruns run_case()'s time budget."""
+
+    def test_sample_counts(self):
+        report = run_benchmarks(catalog_size=200, table_size=8, repetitions=60, warmup=1,
+                                batch_size=50, array_batch_size=5)
+        for name, operations in report["results"].items():
+            self.assertEqual(operations["search"]["count"], 60, name)
+            if "insert" in operations:
+                self.assertEqual(operations["insert"]["count"], 3, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from inventory import Product
+from inventory_indexes import IndexedInventory, tokenize
+
+
+class IndexedInventoryTest(unittest.TestCase):
+    """The secondary indexes follow every insert, replace, delete and stock change."""
+
+    def setUp(self):
+        self.inventory = IndexedInventory()
+        for product in (Product("D101", "Baby Diapers (Size 1)", 12.5, 40),
+                        Product("D102", "Baby Diapers (Size 2)", 13.0, 3),
+                        Product("W201", "Baby Wipes", 4.0, 8),
+                        Product("F301", "Infant Formula", 25.0, 1)):
+            self.inventory.insert(product)
+
+    def ids(self, products):
+        return [product.product_id for product in products]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Baby Wipes (Pack of 5)"), ["baby", "wipes", "pack", "of", "5"])
+
+    def test_queries(self):
+        self.assertEqual(self.ids(self.inventory.find_by_name("baby diapers")), ["D101", "D102"])
+        self.assertEqual(self.ids(self.inventory.price_range(4.0, 13.0)), ["W201", "D101", "D102"])
+        self.assertEqual(self.ids(self.inventory.cheapest(2)), ["W201", "D101"])
+        self.assertEqual(self.ids(self.inventory.cheapest(1, keyword="diapers")), ["D101"])
+        self.assertEqual(self.ids(self.inventory.needs_reorder(5)), ["F301", "D102"])
+
+    def test_replace_updates_every_index(self):
+        self.inventory.insert(Product("D101", "Toddler Pants", 30.0, 0))
+        self.assertEqual(self.ids(self.inventory.find_by_name("diapers")), ["D102"])
+        self.assertEqual(self.ids(self.inventory.find_by_name("toddler")), ["D101"])
+        self.assertEqual(self.ids(self.inventory.price_range(12.0, 13.0)), ["D102"])
+        self.assertEqual(self.ids(self.inventory.needs_reorder(2)), ["D101", "F301"])
+        self.assertEqual(len(self.inventory), 4)
+
+    def test_delete_removes_from_every_index(self):
+        self.assertTrue(self.inventory.delete("W201"))
+        self.assertFalse(self.inventory.delete("W201"))
+        self.assertEqual(self.inventory.find_by_name("wipes"), [])
+        self.assertEqual(self.ids(self.inventory.cheapest(1)), ["D101"])
+        self.assertEqual(self.ids(self.inventory.needs_reorder(10)), ["F301", "D102"])
+
+    def test_stock_changes_reach_low_stock_index(self):
+        self.assertEqual(self.inventory.update_quantity("D101", -38), 2)
+        self.assertTrue(self.inventory.set_quantity("D102", 50))
+        self.assertFalse(self.inventory.set_quantity("MISSING", 1))
+        self.assertIsNone(self.inventory.update_quantity("MISSING", 1))
+        self.assertEqual(self.ids(self.inventory.needs_reorder(5)), ["F301", "D101"])
+        # Many changes leave stale heap entries; they must never show up
+        for quantity in range(100):
+            self.inventory.set_quantity("W201", quantity)
+        self.assertEqual(self.ids(self.inventory.needs_reorder(5)), ["F301", "D101"])
+
+
+if __name__ == "__main__":
+    unittest.main()
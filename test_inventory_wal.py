@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from inventory import Product
+from inventory_wal import DurableInventory, LOG_NAME, read_log
+
+
+class DurableInventoryTest(unittest.TestCase):
+    """Changes survive reopening, torn log tails are cut off, compaction keeps the data."""
+
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = self.temporary.name
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def open(self, **options):
+        return DurableInventory(self.directory, background=False, **options)
+
+    def contents(self, inventory):
+        return {key: (product.name, product.price, product.quantity) for key, product in inventory.items()}
+
+    def newest_log(self):
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith("wal-"))
+        return os.path.join(self.directory, names[-1])
+
+    def test_reopen_replays_the_log(self):
+        with self.open() as inventory:
+            inventory.insert("D101", Product("D101", "Diapers", 12.5, 40))
+            inventory.insert("W201", Product("W201", "Wipes", 4.0, 8))
+            inventory.insert("D101", Product("D101", "Diapers", 11.0, 39))
+            self.assertTrue(inventory.delete("W201"))
+            self.assertFalse(inventory.delete("W201"))
+        with self.open() as inventory:
+            self.assertEqual(self.contents(inventory), {"D101": ("Diapers", 11.0, 39)})
+            self.assertEqual(inventory.stats()["recovered_records"], 4)
+
+    def test_torn_tail_is_truncated(self):
+        with self.open() as inventory:
+            inventory.insert("A", Product("A", "Kept", 1.0, 1))
+            inventory.insert("B", Product("B", "Torn", 2.0, 2))
+        path = self.newest_log()
+        size = os.path.getsize(path)
+        with open(path, "r+b") as file:
+            file.truncate(size - 3)  # The last record was only partly written
+
+        with self.open() as inventory:
+            self.assertEqual(self.contents(inventory), {"A": ("Kept", 1.0, 1)})
+            self.assertEqual(len(read_log(path)[0]), 1)
+            self.assertEqual(os.path.getsize(path), read_log(path)[1])
+            # New changes go after the last good record and are read back too
+            inventory.insert("C", Product("C", "After", 3.0, 3))
+        with self.open() as inventory:
+            self.assertEqual(sorted(self.contents(inventory)), ["A", "C"])
+
+    def test_corrupt_record_stops_replay(self):
+        with self.open() as inventory:
+            inventory.insert("A", Product("A", "First", 1.0, 1))
+            inventory.insert("B", Product("B", "Second", 2.0, 2))
+        path = self.newest_log()
+        with open(path, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))  # Fails the checksum
+        with self.open() as inventory:
+            self.assertEqual(sorted(self.contents(inventory)), ["A"])
+
+    def test_compaction_keeps_everything_and_removes_old_files(self):
+        with self.open() as inventory:
+            for i in range(50):
+                inventory.insert(f"P{i}", Product(f"P{i}", "Product", 1.0, i))
+            self.assertEqual(inventory.compact(), 50)
+            inventory.delete("P0")
+            inventory.insert("P1", Product("P1", "Changed", 9.0, 9))
+            expected = self.contents(inventory)
+        names = sorted(os.listdir(self.directory))
+        self.assertEqual(names, ["snapshot-000002.inv", LOG_NAME.format(2)])
+        with self.open() as inventory:
+            self.assertEqual(self.contents(inventory), expected)
+            self.assertEqual(inventory.stats()["recovered_records"], 2)
+
+    def test_batch_syncs_once(self):
+        with self.open() as inventory:
+            with inventory.batch():
+                for i in range(20):
+                    inventory.insert(f"P{i}", Product(f"P{i}", "Product", 1.0, i))
+            self.assertEqual(inventory.stats()["fsyncs"], 1)
+
+    def test_concurrent_writers(self):
+        with self.open() as inventory:
+            def writer(thread_index):
+                for i in range(50):
+                    key = f"T{thread_index}-{i}"
+                    inventory.insert(key, Product(key, "Product", 1.0, i))
+
+            threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertLessEqual(inventory.stats()["fsyncs"], 200)
+        with self.open() as inventory:
+            self.assertEqual(len(inventory), 200)
+
+    def test_failed_write_stops_the_log(self):
+        inventory = self.open()
+        inventory.insert("A", Product("A", "Synced", 1.0, 1))
+        original_log = inventory._log
+
+        class BrokenLog:
+            def write(self, data):
+                raise OSError("disk full")
+
+            def __getattr__(self, name):
+                return getattr(original_log, name)
+
+        inventory._log = BrokenLog()
+        with self.assertRaises(OSError):
+            inventory.insert("B", Product("B", "Lost", 2.0, 2))
+        with self.assertRaises(OSError):
+            inventory.insert("C", Product("C", "Refused", 3.0, 3))
+        inventory._log = original_log
+        inventory.close()
+        with self.open() as reopened:
+            self.assertEqual(sorted(self.contents(reopened)), ["A"])
+
+    def test_closed_inventory_refuses_changes(self):
+        inventory = self.open()
+        inventory.close()
+        inventory.close()
+        with self.assertRaises(ValueError):
+            inventory.insert("A", Product("A", "Late", 1.0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
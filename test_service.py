@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from service import ServiceState
+from service_loadgen import make_request, pick_followee
+
+
+class ServiceStateTest(unittest.TestCase):
+    """Requests are validated and every failure comes back as ok: false."""
+
+    def setUp(self):
+        self.state = ServiceState()
+
+    def insert(self, **args):
+        request = {"id": 1, "op": "inventory.insert",
+                   "args": {"product_id": "D101", "name": "Diapers", "price": 12.5, "quantity": 40, **args}}
+        return self.state.execute(request)
+
+    def test_insert_and_search(self):
+        self.assertTrue(self.insert(quantity=40.0)["ok"])
+        response = self.state.execute({"id": 2, "op": "inventory.search", "args": {"product_id": "D101"}})
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["result"]["quantity"], 40)
+
+    def test_bad_numbers_are_rejected(self):
+        for args in ({"quantity": 1.5}, {"quantity": 1e400}, {"quantity": "lots"},
+                     {"price": float("nan")}, {"price": 1e400}):
+            response = self.insert(**args)
+            self.assertFalse(response["ok"], args)
+        self.assertIsNone(self.state.inventory.search("D101"))
+        self.assertEqual(self.state.errors, 5)
+
+    def test_unknown_operation(self):
+        response = self.state.execute({"id": 3, "op": "nope"})
+        self.assertEqual((response["id"], response["ok"]), (3, False))
+
+
+class LoadGeneratorTest(unittest.TestCase):
+    """The generated workload never asks a user to follow themselves."""
+
+    def test_no_self_follows(self):
+        rng = random.Random(3)
+        for _ in range(2000):
+            _, args = make_request("graph.follow", rng, products=10, users=3)
+            self.assertNotEqual(args["follower"], args["followee"])
+        for follower in range(3):
+            for _ in range(200):
+                self.assertNotEqual(pick_followee(rng, 3, follower, popular=True), follower)
+        with self.assertRaises(ValueError):
+            pick_followee(rng, 1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
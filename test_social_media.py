@@ -0,0 +1,111 @@
+import unittest
+
+from social_media import CSRGraph, Graph, NeighbourIds, Person
+
+
+class NeighbourIdsTest(unittest.TestCase):
+    """The insertion-ordered id set behind each adjacency list."""
+
+    def test_order_holes_and_packing(self):
+        ids = NeighbourIds(range(100))
+        for vertex_id in range(0, 90, 2):
+            ids.remove(vertex_id)
+        self.assertEqual(list(ids), list(range(1, 90, 2)) + list(range(90, 100)))
+        self.assertFalse(ids.add(91))
+        self.assertTrue(ids.add(0))
+        self.assertEqual(list(ids)[-1], 0)
+        # Whatever packing happened, slots still point at their ids
+        self.assertEqual([vertex_id for _, vertex_id in ids.iter_from(0)], list(ids))
+        for slot, vertex_id in ids.iter_from(0):
+            self.assertEqual(ids.slot_of(vertex_id), slot)
+
+
+class AdjacencyTest(unittest.TestCase):
+    """adjacency() returns editable snapshots; adj_list is a read-only view of one."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.a, self.b, self.c = (Person(name, "", "") for name in "abc")
+        self.graph.add_vertices([self.a, self.b, self.c])
+        self.graph.add_edge(self.a, self.b)
+        self.graph.add_edge(self.a, self.c)
+        self.graph.add_edge(self.c, self.a)
+
+    def test_snapshots(self):
+        expected = {self.a: {self.b: None, self.c: None}, self.b: {}, self.c: {self.a: None}}
+        snapshot = self.graph.adjacency()
+        self.assertEqual(snapshot, expected)
+        self.assertEqual(self.graph.in_adjacency(),
+                         {self.a: {self.c: None}, self.b: {self.a: None}, self.c: {self.a: None}})
+        snapshot[self.b][self.c] = None  # Only the copy changes
+        self.assertFalse(self.graph.has_edge(self.b, self.c))
+        self.graph.remove_edge(self.a, self.b)
+        self.assertIn(self.b, snapshot[self.a])
+
+    def test_adj_list_is_read_only(self):
+        self.assertEqual(self.graph.adj_list, self.graph.adjacency())
+        self.assertEqual(self.graph.in_adj_list, self.graph.in_adjacency())
+        with self.assertRaises(TypeError):
+            self.graph.adj_list[self.b] = {}
+        with self.assertRaises(TypeError):
+            self.graph.adj_list[self.b][self.c] = None
+        with self.assertRaises(TypeError):
+            self.graph.in_adj_list[self.a][self.b] = None
+        self.assertFalse(self.graph.has_edge(self.b, self.c))
+
+
+class FreezeTest(unittest.TestCase):
+    """Graph.freeze() gives an immutable CSR snapshot with the same edges."""
+
+    def setUp(self):
+        self.graph = Graph()
+        self.people = [Person(f"u{i}", "", "") for i in range(6)]
+        self.graph.add_vertices(self.people)
+        for a, b in ((0, 1), (0, 2), (1, 2), (2, 0), (3, 0), (4, 4), (5, 3)):
+            self.graph.add_edge(self.people[a], self.people[b])
+
+    def edges_by_name(self, csr):
+        return sorted((csr.vertex(a).get_name(), csr.vertex(b).get_name()) for a, b in csr.edges())
+
+    def test_snapshot_matches_graph(self):
+        csr = self.graph.freeze()
+        self.assertIsInstance(csr, CSRGraph)
+        self.assertEqual((csr.vertex_count, csr.edge_count), (6, 7))
+        for person in self.people:
+            vertex_id = csr.id_of(person)
+            self.assertEqual([csr.vertex(i) for i in csr.successors(vertex_id)],
+                             list(self.graph.iter_outgoing(person)))
+            self.assertEqual([csr.vertex(i) for i in csr.predecessors(vertex_id)],
+                             list(self.graph.iter_incoming(person)))
+            self.assertEqual(csr.out_degrees()[vertex_id], self.graph.out_degree(person))
+            self.assertEqual(csr.in_degrees()[vertex_id], self.graph.in_degree(person))
+
+    def test_snapshot_ignores_later_changes(self):
+        csr = self.graph.freeze()
+        before = self.edges_by_name(csr)
+        self.graph.add_edge(self.people[1], self.people[5])
+        self.graph.remove_edge(self.people[0], self.people[1])
+        self.assertEqual(self.edges_by_name(csr), before)
+
+    def test_removed_vertices_leave_no_gaps(self):
+        self.graph.remove_vertex(self.people[2])
+        csr = self.graph.freeze()
+        self.assertEqual(csr.vertex_count, 5)
+        self.assertEqual(sorted(csr.id_of(person) for person in csr.vertices), list(range(5)))
+        self.assertEqual(self.edges_by_name(csr),
+                         [("u0", "u1"), ("u3", "u0"), ("u4", "u4"), ("u5", "u3")])
+        self.assertEqual(csr.edge_count, self.graph.edge_count)
+
+    def test_from_csr_round_trip(self):
+        copy = Graph.from_csr(self.graph.freeze())
+        self.assertEqual(copy.get_all_vertices(), self.people)
+        self.assertEqual(copy.edge_count, self.graph.edge_count)
+        for person in self.people:
+            self.assertEqual(list(copy.iter_outgoing(person)), list(self.graph.iter_outgoing(person)))
+        # The copy is independent and mutable
+        copy.add_edge(self.people[5], self.people[0])
+        self.assertFalse(self.graph.has_edge(self.people[5], self.people[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()